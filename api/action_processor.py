@@ -6,6 +6,7 @@ Handles all game actions and events in a modular way
 import random
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,14 +16,46 @@ from ship_system import ShipManager, SHIP_TYPES
 from inventory_system import InventoryManager, ITEM_TYPES
 from pod_system import PodManager, POD_AUGMENTATIONS
 from regions import get_region_visual_config
-from combat_system import CombatManager, COMBAT_ACTIONS
+from navigation_system import web_navigation
+from combat_system import COMBAT_ACTIONS
+from sampling import get_drop_table
+from metrics import ACTION_SECONDS, AUTOSAVE_BYTES, AUTOSAVE_SECONDS
+from tracing import span
+
+# What salvage can turn up; each entry is rolled independently
+SALVAGE_TABLE = [
+    {"item": "scrap_metal", "weight": 0.4, "quantity": (3, 8)},
+    {"item": "electronic_components", "weight": 0.3, "quantity": (2, 5)},
+    {"item": "fuel_cells", "weight": 0.2, "quantity": (1, 3)},
+    {"item": "data_cores", "weight": 0.08, "quantity": (1, 2)},
+    {"item": "fusion_core", "weight": 0.02, "quantity": (1, 1)}
+]
+SALVAGE_CHANCES = tuple(entry["weight"] for entry in SALVAGE_TABLE)
+
+# Round cap for auto-resolved combat, and the most a request may ask for
+AUTO_COMBAT_ROUNDS = 20
+MAX_AUTO_COMBAT_ROUNDS = 50
+
+# Most actions one batch request may run
+MAX_BATCH_ACTIONS = 50
+
+# Actions that take a game turn and trigger an auto-save
+TURN_ACTIONS = ("navigate", "mine", "salvage", "distress_signal")
+
+# Choices offered while drifting in the escape pod
+POD_CHOICES = ["Navigate to nearest planet/outpost", "Try to send distress signal"]
+
+# Event choices that map onto regular actions
+CHOICE_ACTIONS = {
+    "Navigate to nearest planet/outpost": ("navigate", {"destination": "nearest_safe_harbor"}),
+    "Try to send distress signal": ("distress_signal", {})
+}
 
 
 class ActionProcessor:
     """Processes game actions and returns results"""
     
     def __init__(self):
-        self.combat_manager = CombatManager()
         self.action_handlers = {
             "navigate": self.handle_navigate,
             "event": self.handle_random_event,
@@ -43,11 +76,22 @@ class ActionProcessor:
             "combat": self.handle_combat,
             "combat_action": self.handle_combat_action,
             "flee": self.handle_flee,
-            "negotiate": self.handle_negotiate
+            "negotiate": self.handle_negotiate,
+            "combat_auto": self.handle_combat_auto,
+            "distress_signal": self.handle_distress_signal,
+            "choice": self.handle_choice
         }
     
-    def process_action(self, session, action, data=None):
+    def process_action(self, session, action, data=None, autosave=True):
         """Main entry point for processing actions"""
+        started = time.perf_counter()
+        result = self._process_action(session, action, data, autosave)
+        ACTION_SECONDS.observe(time.perf_counter() - started,
+                               action if action in self.action_handlers else "unknown",
+                               self.get_action_outcome(result))
+        return result
+    
+    def _process_action(self, session, action, data, autosave):
         result = {
             "success": False,
             "event": None,
@@ -59,9 +103,18 @@ class ActionProcessor:
         if self.check_game_over(session, result):
             return result
         
+        # A pod activation's event and choices must outlive this action's result
+        pod_alert = dict(result) if result["event"] else None
+        if pod_alert:
+            session.available_choices = pod_alert["choices"]
+        
         # Update activity
         session.update_activity()
         
+        # Resolve event choices that map onto regular actions
+        if action == "choice":
+            action, data = self.resolve_choice(session, data or {})
+        
         # Get handler for action
         handler = self.action_handlers.get(action)
         if not handler:
@@ -71,34 +124,108 @@ class ActionProcessor:
         
         # Process the action
         try:
-            result = handler(session, data or {})
+            session.player_stats.pop_dirty()
+            with span(handler.__name__, action=action):
+                result = handler(session, data or {})
+            if pod_alert:
+                self.merge_pod_alert(result, pod_alert)
             result["success"] = True
+            session.available_choices = result.get("choices", [])
             
             # Process turn effects if this was a turn-consuming action
-            if action in ["navigate", "mine", "salvage"]:
+            if action in TURN_ACTIONS:
                 turn_message = session.process_turn_effects()
                 if turn_message:
                     result["event"] += f"\n{turn_message}"
                 
                 # Auto-save after turn-consuming actions
-                try:
-                    from save_manager import save_game_to_slot, get_current_location_name
-                    location_name = get_current_location_name(
-                        session.star_map,
-                        session.current_region_id,
-                        session.current_node_id
-                    )
-                    save_game_to_slot(session.to_save_dict(), 0, location_name)  # Slot 0 is auto-save
-                except Exception:
-                    pass  # Silently fail auto-save to not interrupt gameplay
+                if autosave:
+                    self.autosave(session)
             
         except Exception as e:
             result["event"] = f"Error processing action: {str(e)}"
             result["event_type"] = "error"
             result["success"] = False
         
+        # Stats this action may have changed, for clients applying deltas
+        result["changed_stats"] = sorted(session.player_stats.pop_dirty())
+        
         return result
     
+    def autosave(self, session):
+        """Save the session to the auto-save slot"""
+        started = time.perf_counter()
+        with span("autosave") as save_span:
+            try:
+                from save_manager import save_game_to_slot, get_save_filename
+                location_name = session.get_location_name()
+                save_game_to_slot(session.to_save_dict(), 0, location_name)  # Slot 0 is auto-save
+                saved_bytes = os.path.getsize(get_save_filename(0))
+            except Exception:
+                AUTOSAVE_SECONDS.observe(time.perf_counter() - started, "error")
+                save_span.set_attribute("error", True)
+                return  # Silently fail auto-save to not interrupt gameplay
+            save_span.set_attribute("bytes", saved_bytes)
+        AUTOSAVE_SECONDS.observe(time.perf_counter() - started, "ok")
+        AUTOSAVE_BYTES.observe(saved_bytes)
+    
+    def process_actions(self, session, actions, atomic=False):
+        """
+        Run a list of {"action": ..., **data} entries in order.
+        
+        An action fails if it errors or reports an "error" event. Atomic
+        batches stop at the first failure and undo everything before it;
+        other batches run every action. Auto-save happens once at the end.
+        """
+        checkpoint = session.create_checkpoint() if atomic else None
+        turn_count = session.turn_count
+        results = []
+        rolled_back = False
+        for entry in actions:
+            result = self.process_action(session, entry.get("action"), entry, autosave=False)
+            results.append(result)
+            if atomic and not self.is_action_successful(result):
+                session.restore_checkpoint(checkpoint)
+                rolled_back = True
+                break
+        
+        if atomic and not rolled_back:
+            session.release_checkpoint()
+        if session.turn_count != turn_count:
+            self.autosave(session)
+        
+        return {
+            "success": all(self.is_action_successful(result) for result in results),
+            "rolled_back": rolled_back,
+            "results": results
+        }
+    
+    @staticmethod
+    def is_action_successful(result):
+        """Check whether an action ran and did what was asked"""
+        return result.get("success", False) and result.get("event_type") != "error"
+    
+    @staticmethod
+    def merge_pod_alert(result, pod_alert):
+        """Put a pod activation's event and choices ahead of an action's own"""
+        if result.get("event"):
+            result["event"] = f"{pod_alert['event']}\n{result['event']}"
+        else:
+            result["event"] = pod_alert["event"]
+        result["event_type"] = pod_alert["event_type"]
+        result["choices"] = pod_alert["choices"] + [
+            choice for choice in result.get("choices", []) if choice not in pod_alert["choices"]
+        ]
+    
+    @staticmethod
+    def get_action_outcome(result):
+        """Get the metrics label for how an action ended"""
+        if result.get("event_type") == "game_over":
+            return "game_over"
+        if not result.get("success", False):
+            return "error"
+        return "failed" if result.get("event_type") == "error" else "success"
+    
     def check_game_over(self, session, result):
         """Check and handle game over conditions"""
         # Health depleted
@@ -116,7 +243,7 @@ class ActionProcessor:
                 if success:
                     result["event"] = message
                     result["event_type"] = "pod_activated"
-                    result["choices"] = ["Navigate to nearest planet/outpost", "Try to send distress signal"]
+                    result["choices"] = list(POD_CHOICES)
                     session.statistics["pod_uses"] += 1
                     return False  # Not game over yet
             else:
@@ -156,20 +283,62 @@ class ActionProcessor:
         
         return False
     
+    def resolve_choice(self, session, data):
+        """Map a picked event choice onto the action it stands for"""
+        choice = data.get("choice")
+        
+        # The client sends the 1-based position of the picked choice
+        if isinstance(choice, int) and 1 <= choice <= len(session.available_choices):
+            choice = session.available_choices[choice - 1]
+        
+        if choice in CHOICE_ACTIONS:
+            action, action_data = CHOICE_ACTIONS[choice]
+            return action, dict(action_data)
+        
+        return "choice", {"choice": choice}
+    
+    def handle_choice(self, session, data):
+        """Handle event choices that have no action of their own"""
+        return {
+            "event": "You hold your position and wait.",
+            "event_type": "info",
+            "choices": []
+        }
+    
+    def find_safe_harbor_hop(self, session):
+        """Find the next node towards the nearest planet or station with repairs"""
+        map_index = session.get_map_index()
+        if not map_index or session.current_node_id not in map_index.node_rows:
+            return None, None
+        
+        harbor_id = map_index.find_nearest_safe_harbor(session.current_node_id)
+        if not harbor_id:
+            return None, None
+        
+        return harbor_id, map_index.find_next_hop(session.current_node_id, harbor_id)
+    
     def handle_navigate(self, session, data):
         """Handle navigation action"""
+        target_node_id = data.get("target_node_id")
+        target_region_id = data.get("target_region_id")
+        
+        # Head for the nearest planet or station with repairs
+        if data.get("destination") == "nearest_safe_harbor":
+            harbor_id, target_node_id = self.find_safe_harbor_hop(session)
+            if harbor_id and harbor_id == session.current_node_id:
+                location = session.get_current_location()
+                return {
+                    "event": f"Already docked at {location['node'].name}.",
+                    "event_type": "info",
+                    "choices": []
+                }
+        
         session.turn_count += 1
         
         # Reset just bought pod flag
         if "just_bought_pod" in session.player_stats:
             session.player_stats["just_bought_pod"] = False
         
-        target_node_id = data.get("target_node_id")
-        target_region_id = data.get("target_region_id")
-        
-        # Import navigation function
-        from api.app import web_navigation
-        
         # Pod mode navigation
         if session.player_stats["in_pod_mode"]:
             session.at_repair_location, nav_message, event_type = web_navigation(
@@ -212,13 +381,13 @@ class ActionProcessor:
             if not session.player_stats.get("in_combat", False) and random.random() < 0.25:  # 25% chance
                 location = session.get_current_location()
                 danger_level = 0.5
-                if location and location["node"]:
-                    danger_level = location["node"].get("danger_level", 0.5)
+                if location:
+                    danger_level = location["node"].danger_level
                 
                 # Higher chance in dangerous areas
                 if random.random() < danger_level:
                     # Start combat
-                    combat_result = self.combat_manager.start_combat(
+                    combat_result = session.combat_manager.start_combat(
                         session.player_stats,
                         danger_level=danger_level
                     )
@@ -233,6 +402,39 @@ class ActionProcessor:
         
         return result
     
+    def handle_distress_signal(self, session, data):
+        """Handle a distress signal sent from the escape pod"""
+        if not session.player_stats["in_pod_mode"]:
+            return {
+                "event": "Distress signals can only be sent from an escape pod.",
+                "event_type": "error",
+                "choices": []
+            }
+        
+        session.turn_count += 1
+        
+        harbor_id, _ = self.find_safe_harbor_hop(session)
+        if not harbor_id or not PodManager.roll_distress_rescue(session.player_stats):
+            return {
+                "event": "Your distress signal goes unanswered.",
+                "event_type": "warning",
+                "choices": list(POD_CHOICES)
+            }
+        
+        # A passing ship tows the pod to the nearest harbor
+        harbor = session.star_map.get_node(harbor_id)
+        session.current_region_id = harbor.region_id
+        session.current_node_id = harbor_id
+        session.discover_node(harbor, visited=True)
+        session.at_repair_location = harbor.has_repair
+        session.player_stats["pod_animation_state"] = "active"
+        
+        return {
+            "event": f"Your distress signal is answered! A passing freighter tows your pod to {harbor.name}.",
+            "event_type": "success",
+            "choices": ["Buy new ship (400+ wealth)", "Wait and conserve resources"]
+        }
+    
     def handle_random_event(self, session, data):
         """Handle random events"""
         effective_stats = session.get_effective_stats()
@@ -450,12 +652,12 @@ class ActionProcessor:
         location = session.get_current_location()
         price_modifier = 1.0
         
-        if location and location["node"]:
+        if location:
             # Trading posts offer better prices
-            if location["node"]["type"] == "trading_post":
+            if location["node"].type == "trading_post":
                 price_modifier = 1.2
             # Some systems have different demand
-            elif location["region"]["type"] == "industrial":
+            elif location["region"].type == "industrial":
                 if ITEM_TYPES.get(item_id, {}).get("category") == "component":
                     price_modifier = 1.3
         
@@ -590,7 +792,7 @@ class ActionProcessor:
         
         # Check location
         location = session.get_current_location()
-        if not location or location["node"]["type"] != "asteroid_field":
+        if not location or location["node"].type != "asteroid_field":
             return {
                 "event": "Must be in an asteroid field to mine. Look for asteroid fields on the star map.",
                 "event_type": "error",
@@ -702,7 +904,7 @@ class ActionProcessor:
         
         # Check if we just had combat
         has_recent_combat = session.statistics.get("ships_destroyed", 0) > session.statistics.get("last_salvage_count", 0)
-        is_salvageable_location = location and location["node"]["type"] in salvageable_locations
+        is_salvageable_location = location and location["node"].type in salvageable_locations
         
         if not has_recent_combat and not is_salvageable_location:
             return {
@@ -727,44 +929,35 @@ class ActionProcessor:
         
         # Salvage success rate
         if random.random() < 0.8:  # 80% success rate
-            # Generate salvage
-            salvage_table = [
-                {"item": "scrap_metal", "weight": 0.4, "quantity": (3, 8)},
-                {"item": "electronic_components", "weight": 0.3, "quantity": (2, 5)},
-                {"item": "fuel_cells", "weight": 0.2, "quantity": (1, 3)},
-                {"item": "data_cores", "weight": 0.08, "quantity": (1, 2)},
-                {"item": "fusion_core", "weight": 0.02, "quantity": (1, 1)}
-            ]
-            
-            # Determine what was salvaged
+            # Determine what was salvaged; one draw picks every entry found
             salvaged_items = []
             total_weight = 0
             effective_stats = session.get_effective_stats()
             
-            for item_data in salvage_table:
-                if random.random() < item_data["weight"] * salvage_efficiency:
-                    qty_min, qty_max = item_data["quantity"]
-                    quantity = random.randint(qty_min, qty_max)
-                    
-                    # Check cargo space
-                    can_add, reason = InventoryManager.can_add_item(
+            for index in get_drop_table(SALVAGE_CHANCES, salvage_efficiency).sample():
+                item_data = SALVAGE_TABLE[index]
+                qty_min, qty_max = item_data["quantity"]
+                quantity = random.randint(qty_min, qty_max)
+                
+                # Check cargo space
+                can_add, reason = InventoryManager.can_add_item(
+                    session.player_stats["inventory"],
+                    effective_stats["cargo_capacity"],
+                    item_data["item"],
+                    quantity
+                )
+                
+                if can_add:
+                    InventoryManager.add_item(
                         session.player_stats["inventory"],
-                        effective_stats["cargo_capacity"],
                         item_data["item"],
                         quantity
                     )
-                    
-                    if can_add:
-                        InventoryManager.add_item(
-                            session.player_stats["inventory"],
-                            item_data["item"],
-                            quantity
-                        )
-                        salvaged_items.append(f"{quantity}x {ITEM_TYPES[item_data['item']]['name']}")
-                        session.statistics["items_collected"] += quantity
-                        total_weight += ITEM_TYPES[item_data['item']]["weight"] * quantity
-                    else:
-                        break  # Cargo full
+                    salvaged_items.append(f"{quantity}x {ITEM_TYPES[item_data['item']]['name']}")
+                    session.statistics["items_collected"] += quantity
+                    total_weight += ITEM_TYPES[item_data['item']]["weight"] * quantity
+                else:
+                    break  # Cargo full
             
             if salvaged_items:
                 return {
@@ -829,11 +1022,11 @@ class ActionProcessor:
         danger_level = 0.5
         location_type = None
         
-        if location and location["node"]:
-            danger_level = location["node"].get("danger_level", 0.5)
-            location_type = location["node"].get("type")
+        if location:
+            danger_level = location["node"].danger_level
+            location_type = location["node"].type
         
-        combat_result = self.combat_manager.start_combat(
+        combat_result = session.combat_manager.start_combat(
             session.player_stats,
             danger_level=danger_level
         )
@@ -860,7 +1053,7 @@ class ActionProcessor:
         action = data.get("combat_action", "attack")
         
         # Process combat action
-        result = self.combat_manager.process_combat_action(action, session.player_stats)
+        result = session.combat_manager.process_combat_action(action, session.player_stats)
         
         if result.get("combat_ongoing", False):
             # Combat continues
@@ -900,7 +1093,7 @@ class ActionProcessor:
                 "choices": []
             }
         
-        result = self.combat_manager.attempt_flee(session.player_stats)
+        result = session.combat_manager.attempt_flee(session.player_stats)
         
         if result.get("fled", False):
             # Successfully fled
@@ -940,7 +1133,7 @@ class ActionProcessor:
                 "choices": []
             }
         
-        result = self.combat_manager.negotiate(session.player_stats)
+        result = session.combat_manager.negotiate(session.player_stats)
         
         if result.get("success", False) and not result.get("combat_ongoing", True):
             # Successfully negotiated
@@ -961,3 +1154,88 @@ class ActionProcessor:
                 "choices": ["Attack", "Flee", "Negotiate"],
                 "combat_state": result.get("combat_state")
             }
+    
+    def choose_auto_combat_move(self, session, policy):
+        """Pick the next auto-combat move under a policy: negotiate, flee or a combat action"""
+        combat = session.combat_manager.current_combat
+        
+        if policy.get("negotiate"):
+            cost = session.combat_manager.get_negotiation_cost()
+            if cost is not None and session.player_stats["wealth"] >= cost:
+                return "negotiate"
+        
+        flee_below = policy.get("flee_below")
+        if flee_below is not None:
+            if combat["player"]["hp"] / combat["player"]["max_hp"] < flee_below:
+                return "flee"
+        
+        return policy.get("action", "attack")
+    
+    @staticmethod
+    def get_auto_combat_settings(data):
+        """Get a combat_auto request's policy and round cap, raising ValueError if malformed"""
+        policy = data.get("policy", {})
+        if not isinstance(policy, dict):
+            raise ValueError("policy must be an object")
+        
+        action = policy.get("action", "attack")
+        if action not in COMBAT_ACTIONS:
+            raise ValueError(f"Unknown combat action: {action}")
+        
+        flee_below = policy.get("flee_below")
+        if flee_below is not None and (isinstance(flee_below, bool)
+                                       or not isinstance(flee_below, (int, float))):
+            raise ValueError("flee_below must be a number")
+        
+        try:
+            max_rounds = int(data.get("max_rounds", AUTO_COMBAT_ROUNDS))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("max_rounds must be an integer")
+        
+        return policy, max(1, min(max_rounds, MAX_AUTO_COMBAT_ROUNDS))
+    
+    def handle_combat_auto(self, session, data):
+        """Resolve combat server-side, one round per loop, until it ends or the round cap"""
+        if not session.player_stats.get("in_combat", False):
+            return {
+                "event": "Not in combat!",
+                "event_type": "error",
+                "choices": []
+            }
+        
+        try:
+            policy, max_rounds = self.get_auto_combat_settings(data)
+        except ValueError as e:
+            return {
+                "event": str(e),
+                "event_type": "error",
+                "choices": []
+            }
+        
+        rounds = []
+        result = None
+        for round_number in range(1, max_rounds + 1):
+            move = self.choose_auto_combat_move(session, policy)
+            if move == "negotiate":
+                result = self.handle_negotiate(session, data)
+            elif move == "flee":
+                result = self.handle_flee(session, data)
+            else:
+                result = self.handle_combat_action(session, {"combat_action": move})
+            
+            rounds.append({
+                "round": round_number,
+                "move": move,
+                "event_type": result["event_type"],
+                "event": result["event"]
+            })
+            
+            if not session.player_stats.get("in_combat", False):
+                break
+        
+        # Report the last round's outcome, with the compact log of every round
+        result["rounds"] = rounds
+        if session.player_stats.get("in_combat", False):
+            noun = "round" if len(rounds) == 1 else "rounds"
+            result["event"] = f"Combat continues after {len(rounds)} {noun}."
+        return result
@@ -5,139 +5,190 @@ Provides REST endpoints and WebSocket support for the graphical frontend
 Refactored to use modular system components
 """
 
-from flask import Flask, jsonify, request, render_template, send_from_directory
+from flask import (Flask, Response, g, has_request_context, jsonify, request, render_template,
+                   send_from_directory)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room
+import atexit
+import hmac
+import math
 import os
 import sys
 import threading
+import time
 
 # Add parent directory to path to import game modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import config
-from ship_system import SHIP_TYPES, SHIP_MODS, ShipManager
+from regions import NodeType
+from ship_system import SHIP_TYPES, SHIP_MODS
 from inventory_system import ITEM_TYPES, InventoryManager
 from pod_system import POD_AUGMENTATIONS, PodManager
+from navigation_system import NavigationManager
+from map_tiles import DETAIL_ZOOM_LEVEL
+from map_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from combat_system import ENEMY_TYPES
+from combat_estimator import estimate_combat
+from catalog import get_available_mods_for_loadout
+from loadout_optimizer import optimize_loadout
+from cargo_planner import get_cargo_advice
 from session_manager import SessionManager
-from action_processor import ActionProcessor
+from traffic_recorder import TrafficRecorder
+from instrumented_lock import InstrumentedLock, REPORT_SORT_KEYS
+from tracing import SpanExporter, clear_trace, finish_trace, span, start_trace
+from profiler import (DEFAULT_SAMPLE_INTERVAL, MAX_PROFILE_SECONDS, RequestProfiles,
+                      StackSampler, start_request_profile)
+from loadout_memo import get_memo_stats
+from metrics import (HTTP_REQUEST_SECONDS, HTTP_RESPONSE_BYTES, JSON_ENCODE_SECONDS,
+                     render_metrics, get_metrics_summary)
+from action_processor import ActionProcessor, MAX_BATCH_ACTIONS
 from save_manager import (save_game_to_slot, load_game_from_slot, list_all_saves,
-                         delete_save_slot, get_save_info, get_current_location_name)
+                         delete_save_slot, get_save_info)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing how long each response body takes to encode"""
+    
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        with span("json.encode"):
+            text = super().dumps(obj, **kwargs)
+        if has_request_context():
+            JSON_ENCODE_SECONDS.observe(time.perf_counter() - started,
+                                        request.endpoint or "unmatched")
+        return text
+
 
 # Initialize Flask app
 app = Flask(__name__, template_folder='../templates', static_folder='../static')
+app.json = TimedJSONProvider(app)
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize managers
 session_manager = SessionManager()
 action_processor = ActionProcessor()
-game_lock = threading.Lock()
 
 
-# Navigation function for web interface
-def web_navigation(session, target_node_id=None, target_region_id=None):
-    """Navigation function for web interface that uses the region system"""
-    import random
-    
-    if not session.star_map:
-        # Fallback if no star map
-        at_repair_location = random.choice([True, False])
-        message = "Navigation system offline. Moving through unknown space."
-        return at_repair_location, message, None
-    
-    current_region = session.star_map['regions'][session.current_region_id]
-    current_node = None
-    for node in current_region['nodes']:
-        if node['id'] == session.current_node_id:
-            current_node = node
-            break
-    
-    if not current_node:
-        return False, "Navigation error: Current location unknown.", None
-    
-    # Get ship stats for fuel calculation
-    effective_stats = session.get_effective_stats()
-    base_fuel = config.FUEL_CONSUMPTION_RATE
-    fuel_efficiency = effective_stats.get("fuel_efficiency", 1.0)
-    
-    # Navigation within region
-    if target_node_id and not target_region_id:
-        # Find target node
-        target_node = None
-        for node in current_region['nodes']:
-            if node['id'] == target_node_id:
-                target_node = node
-                break
-        
-        if not target_node or target_node_id not in current_node['connections']:
-            return False, "Cannot navigate to that location.", None
-        
-        fuel_cost = int(base_fuel * fuel_efficiency)
-        if session.player_stats['fuel'] < fuel_cost:
-            return False, "Insufficient fuel.", None
-        
-        session.player_stats['fuel'] -= fuel_cost
-        session.current_node_id = target_node_id
-        
-        # Random events during travel
-        if random.random() < target_node['danger_level']:
-            damage = random.randint(5, 15)
-            session.player_stats['ship_condition'] -= damage
-            message = f"Danger encountered! Ship damaged (-{damage} HP). Arrived at {target_node['name']}."
-            event_type = "danger"
-        else:
-            message = f"Traveled safely to {target_node['name']}."
-            event_type = "navigation"
-        
-        # Mark as visited
-        target_node['discovered'] = True
-        target_node['visited'] = True
-        
-        return target_node['has_repair'], message, event_type
-    
-    # Region jump
-    elif target_region_id:
-        if target_region_id not in current_region['connections']:
-            return False, "Cannot jump to that region from here.", None
-        
-        fuel_cost = 20 if current_node['type'] == 'wormhole' else 50
-        if session.player_stats['fuel'] < fuel_cost:
-            return False, "Insufficient fuel for region jump.", None
-        
-        session.player_stats['fuel'] -= fuel_cost
-        target_region = session.star_map['regions'][target_region_id]
-        
-        # Find entry node
-        entry_node = None
-        for node in target_region['nodes']:
-            if node['discovered']:
-                entry_node = node
-                break
-        
-        if not entry_node:
-            entry_node = random.choice(target_region['nodes'])
-            entry_node['discovered'] = True
-            session.player_stats['wealth'] += 100
-            message = f"Discovered new region: {target_region['name']}! (+100 wealth) Arrived at {entry_node['name']}."
-        else:
-            message = f"Jumped to {target_region['name']}. Arrived at {entry_node['name']}."
-        
-        session.current_region_id = target_region_id
-        session.current_node_id = entry_node['id']
-        
-        return entry_node['has_repair'], message, "navigation"
+def get_lock_site():
+    """Name what is taking the game lock: the route, plus the action for single actions"""
+    if not has_request_context():
+        return None
+    if request.endpoint == 'perform_action':
+        data = request.get_json(silent=True)
+        action = data.get('action') if isinstance(data, dict) else None
+        if not isinstance(action, str) or action not in action_processor.action_handlers:
+            action = "unknown"
+        return f"perform_action:{action}"
+    return request.endpoint
+
+
+game_lock = InstrumentedLock("game_lock", get_site=get_lock_site,
+                             sample_every=config.LOCK_STATS_SAMPLE_EVERY)
+started_at = time.time()
+
+# Opt-in request capture for tools/replay_traffic.py
+traffic_recorder = None
+if config.TRAFFIC_TRACE_PATH:
+    traffic_recorder = TrafficRecorder(config.TRAFFIC_TRACE_PATH)
+    atexit.register(traffic_recorder.close)
+
+# Opt-in request span tracing
+span_exporter = None
+if config.TRACE_SPANS_PATH:
+    span_exporter = SpanExporter(config.TRACE_SPANS_PATH, config.TRACE_SLOW_MS)
+    atexit.register(span_exporter.close)
+
+# Profiling for admins: one whole-process profile at a time, and recent request profiles
+profile_lock = threading.Lock()
+request_profiles = RequestProfiles()
+
+
+def is_admin_request():
+    """Check the request carries the configured admin token"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(config.ADMIN_TOKEN) and hmac.compare_digest(token, config.ADMIN_TOKEN)
+
+
+@app.before_request
+def start_request_timer():
+    """Note when the request started, for metrics and the traffic recorder, and start tracing"""
+    g.request_start = time.perf_counter()
+    if span_exporter:
+        route = request.url_rule.rule if request.url_rule else None
+        g.trace_root = start_trace(
+            f"{request.method} {route}" if route else request.method,
+            **{"http.request.method": request.method, "http.route": route or "",
+               "url.path": request.path}
+        )
+
+
+@app.after_request
+def record_request(response):
+    """Record request metrics, and append API requests to the traffic trace when recording"""
+    if 'request_start' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    endpoint = request.endpoint or "unmatched"
+    HTTP_REQUEST_SECONDS.observe(elapsed, endpoint, request.method, str(response.status_code))
+    if response.content_length is not None:
+        HTTP_RESPONSE_BYTES.observe(response.content_length, endpoint)
     
-    # Auto-navigation (random choice)
-    else:
-        # Get available options
-        connected_nodes = [n for n in current_region['nodes'] if n['id'] in current_node['connections']]
-        
-        if connected_nodes:
-            target = random.choice(connected_nodes)
-            return web_navigation(session, target_node_id=target['id'])
-        else:
-            return current_node['has_repair'], "No available destinations.", "info"
+    if traffic_recorder and request.path.startswith('/api/'):
+        # New and loaded games name their session in the body
+        session_id = (request.view_args or {}).get('session_id')
+        if session_id is None and request.is_json:
+            body = request.get_json(silent=True)
+            session_id = body.get('session_id') if isinstance(body, dict) else None
+        traffic_recorder.record(
+            session_id,
+            request.endpoint,
+            request.method,
+            request.full_path.rstrip('?'),
+            request.get_data() or None,
+            response.status_code,
+            elapsed
+        )
+    return response
+
+
+@app.after_request
+def export_request_trace(response):
+    """Finish the request's trace and hand it to the span exporter"""
+    root = g.pop('trace_root', None)
+    if root:
+        root.set_attribute("http.response.status_code", response.status_code)
+        error = f"HTTP {response.status_code}" if response.status_code >= 500 else None
+        span_exporter.export(finish_trace(root, error))
+    return response
+
+
+@app.before_request
+def start_request_profile_if_asked():
+    """Profile this request with cProfile when an admin sends X-Profile: 1"""
+    if request.headers.get('X-Profile') == '1' and is_admin_request():
+        profile = start_request_profile()
+        if profile:
+            g.request_profile = profile
+
+
+@app.after_request
+def store_request_profile(response):
+    """Stop the request's profile and tell the client where to fetch it"""
+    profile = g.pop('request_profile', None)
+    if profile:
+        profile.disable()
+        label = f"{request.method} {request.full_path.rstrip('?')} -> {response.status_code}"
+        response.headers['X-Profile-Id'] = request_profiles.add(profile, label)
+    return response
+
+
+@app.teardown_request
+def end_request_trace(exception):
+    """Stop tracing on this thread even if the request never finished its trace"""
+    clear_trace()
 
 
 @app.route('/')
@@ -216,6 +267,51 @@ def get_game_state(session_id):
         return jsonify(session.to_dict())
 
 
+def build_ship_info(session, effective_stats):
+    """Get detailed ship information from precomputed effective stats"""
+    ship_type = session.player_stats["ship_type"]
+    ship_info = SHIP_TYPES[ship_type].copy()
+    
+    # Add equipped mods info
+    ship_info["equipped_mods"] = {}
+    for slot_type, mods in session.player_stats["ship_mods"].items():
+        ship_info["equipped_mods"][slot_type] = [
+            SHIP_MODS[mod_id] for mod_id in mods if mod_id in SHIP_MODS
+        ]
+    
+    # Add effective stats
+    ship_info["effective_stats"] = {
+        "max_hp": effective_stats["max_ship_condition"],
+        "cargo_capacity": effective_stats["cargo_capacity"],
+        "used_cargo_space": effective_stats["used_cargo_space"],
+        "fuel_efficiency": effective_stats.get("fuel_efficiency", 1.0),
+        "speed": effective_stats.get("speed", 1.0),
+        "combat_power": effective_stats.get("combat_power", 0)
+    }
+    
+    return ship_info
+
+
+def build_inventory_info(session, effective_stats):
+    """Get detailed inventory information from precomputed effective stats"""
+    # Get inventory with item details
+    inventory_details = []
+    for item in session.player_stats["inventory"]:
+        if item["item_id"] in ITEM_TYPES:
+            item_info = ITEM_TYPES[item["item_id"]].copy()
+            item_info["quantity"] = item["quantity"]
+            item_info["total_weight"] = item_info["weight"] * item["quantity"]
+            item_info["total_value"] = item_info["base_value"] * item["quantity"]
+            inventory_details.append(item_info)
+    
+    return {
+        "inventory": inventory_details,
+        "cargo_capacity": effective_stats["cargo_capacity"],
+        "used_space": effective_stats["used_cargo_space"],
+        "total_value": InventoryManager.get_inventory_value(session.player_stats["inventory"])
+    }
+
+
 @app.route('/api/game/ship_info/<session_id>', methods=['GET'])
 def get_ship_info(session_id):
     """Get detailed ship information"""
@@ -224,28 +320,7 @@ def get_ship_info(session_id):
         if not session:
             return jsonify({"error": "Session not found"}), 404
         
-        ship_type = session.player_stats["ship_type"]
-        ship_info = SHIP_TYPES[ship_type].copy()
-        
-        # Add equipped mods info
-        ship_info["equipped_mods"] = {}
-        for slot_type, mods in session.player_stats["ship_mods"].items():
-            ship_info["equipped_mods"][slot_type] = [
-                SHIP_MODS[mod_id] for mod_id in mods if mod_id in SHIP_MODS
-            ]
-        
-        # Add effective stats
-        effective_stats = session.get_effective_stats()
-        ship_info["effective_stats"] = {
-            "max_hp": effective_stats["max_ship_condition"],
-            "cargo_capacity": effective_stats["cargo_capacity"],
-            "used_cargo_space": effective_stats["used_cargo_space"],
-            "fuel_efficiency": effective_stats.get("fuel_efficiency", 1.0),
-            "speed": effective_stats.get("speed", 1.0),
-            "combat_power": effective_stats.get("combat_power", 0)
-        }
-        
-        return jsonify(ship_info)
+        return jsonify(build_ship_info(session, session.get_effective_stats()))
 
 
 @app.route('/api/game/inventory/<session_id>', methods=['GET'])
@@ -256,87 +331,269 @@ def get_inventory(session_id):
         if not session:
             return jsonify({"error": "Session not found"}), 404
         
-        # Get inventory with item details
-        inventory_details = []
-        for item in session.player_stats["inventory"]:
-            if item["item_id"] in ITEM_TYPES:
-                item_info = ITEM_TYPES[item["item_id"]].copy()
-                item_info["quantity"] = item["quantity"]
-                item_info["total_weight"] = item_info["weight"] * item["quantity"]
-                item_info["total_value"] = item_info["base_value"] * item["quantity"]
-                inventory_details.append(item_info)
+        return jsonify(build_inventory_info(session, session.get_effective_stats()))
+
+
+BUNDLE_PARTS = ("state", "nav", "inventory", "ship", "mods")
+
+
+@app.route('/api/game/bundle/<session_id>', methods=['GET'])
+def get_bundle(session_id):
+    """Get several views of the game at once from one set of effective stats"""
+    include = request.args.get('include')
+    parts = [part.strip() for part in include.split(',')] if include else BUNDLE_PARTS
+    unknown = [part for part in parts if part not in BUNDLE_PARTS]
+    if unknown:
+        return jsonify({"error": f"Unknown bundle parts: {', '.join(unknown)}"}), 400
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        effective_stats = session.get_effective_stats()
+        bundle = {}
+        if "state" in parts:
+            bundle["state"] = session.to_dict(effective_stats)
+        if "nav" in parts:
+            bundle["nav"] = build_navigation_options(session, effective_stats)
+        if "inventory" in parts:
+            bundle["inventory"] = build_inventory_info(session, effective_stats)
+        if "ship" in parts:
+            bundle["ship"] = build_ship_info(session, effective_stats)
+        if "mods" in parts:
+            bundle["mods"] = get_available_mods_for_loadout(
+                session.player_stats.ship_type, session.player_stats.ship_mods
+            )
+        
+        return jsonify(bundle)
+
+
+@app.route('/api/game/cargo_advice/<session_id>', methods=['GET'])
+def get_cargo_advice_for_session(session_id):
+    """Get the least valuable cargo to sell or jettison to free up space"""
+    free_space = request.args.get('free_space', 0, type=int)
+    if free_space < 0:
+        return jsonify({"error": "free_space cannot be negative"}), 400
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
         
         effective_stats = session.get_effective_stats()
+        advice = get_cargo_advice(
+            session.player_stats["inventory"], effective_stats["cargo_capacity"], free_space
+        )
         
-        return jsonify({
-            "inventory": inventory_details,
-            "cargo_capacity": effective_stats["cargo_capacity"],
-            "used_space": effective_stats["used_cargo_space"],
-            "total_value": InventoryManager.get_inventory_value(session.player_stats["inventory"])
+        # Cargo can only be sold where selling is allowed
+        advice["action"] = "sell" if session.at_repair_location else "jettison"
+        advice["used_space"] = effective_stats["used_cargo_space"]
+        
+        return jsonify(advice)
+
+
+def build_navigation_options(session, effective_stats):
+    """Get the nodes and regions reachable in one move from precomputed effective stats"""
+    if not session.star_map:
+        return {"options": []}
+    
+    options = []
+    location = session.get_current_location()
+    if not location:
+        return {"options": []}
+    
+    current_region = location['region']
+    current_node = location['node']
+    
+    travel_cost = NavigationManager.get_travel_fuel_cost(
+        effective_stats.get("fuel_efficiency", 1.0)
+    )
+    
+    # Add connected nodes
+    for node in current_node.connections:
+        options.append({
+            "type": "node",
+            "id": node.id,
+            "name": node.name,
+            "node_type": node.type,
+            "visited": node.visited,
+            "has_repair": node.has_repair,
+            "has_trade": node.has_trade,
+            "danger_level": node.danger_level,
+            "fuel_cost": travel_cost
         })
+    
+    # Add region jumps if available
+    if current_node.type == 'wormhole' or session.player_stats['fuel'] >= 50:
+        fuel_cost = NavigationManager.get_jump_fuel_cost(current_node.type)
+        for other_region in current_region.connections:
+            options.append({
+                "type": "region",
+                "id": other_region.id,
+                "name": other_region.name,
+                "region_type": other_region.type,
+                "fuel_cost": fuel_cost
+            })
+    
+    return {
+        "options": options,
+        "current_location": {
+            "region": current_region.name,
+            "node": current_node.name,
+            "type": current_node.type
+        }
+    }
 
 
 @app.route('/api/game/navigation_options/<session_id>', methods=['GET'])
 def get_navigation_options(session_id):
     """Get available navigation options"""
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        return jsonify(build_navigation_options(session, session.get_effective_stats()))
+
+
+@app.route('/api/game/map/<session_id>/reachable', methods=['GET'])
+def get_reachable_locations(session_id):
+    """Get every node and region reachable with the current fuel"""
     with game_lock:
         session = session_manager.get_session(session_id)
         if not session:
             return jsonify({"error": "Session not found"}), 404
         
         if not session.star_map:
-            return jsonify({"options": []})
-        
-        options = []
-        current_region = session.star_map['regions'][session.current_region_id]
-        current_node = None
-        
-        for node in current_region['nodes']:
-            if node['id'] == session.current_node_id:
-                current_node = node
-                break
-        
-        if not current_node:
-            return jsonify({"options": []})
-        
-        # Add connected nodes
-        for node_id in current_node['connections']:
-            for node in current_region['nodes']:
-                if node['id'] == node_id:
-                    options.append({
-                        "type": "node",
-                        "id": node['id'],
-                        "name": node['name'],
-                        "node_type": node['type'],
-                        "visited": node['visited'],
-                        "has_repair": node['has_repair'],
-                        "has_trade": node['has_trade'],
-                        "danger_level": node['danger_level'],
-                        "fuel_cost": config.FUEL_CONSUMPTION_RATE
-                    })
-                    break
-        
-        # Add region jumps if available
-        if current_node['type'] == 'wormhole' or session.player_stats['fuel'] >= 50:
-            for region_id in current_region['connections']:
-                if region_id in session.star_map['regions']:
-                    other_region = session.star_map['regions'][region_id]
-                    fuel_cost = 20 if current_node['type'] == 'wormhole' else 50
-                    options.append({
-                        "type": "region",
-                        "id": region_id,
-                        "name": other_region['name'],
-                        "region_type": other_region['type'],
-                        "fuel_cost": fuel_cost
-                    })
+            return jsonify({"nodes": [], "regions": []})
+        
+        fuel = session.player_stats["fuel"]
+        effective_stats = session.get_effective_stats()
+        travel_cost = NavigationManager.get_travel_fuel_cost(
+            effective_stats.get("fuel_efficiency", 1.0)
+        )
+        
+        reachable = session.reachability_cache.get_reachable(
+            session.star_map,
+            session.map_version,
+            session.current_region_id,
+            session.current_node_id,
+            fuel,
+            travel_cost
+        )
+        
+        nodes = []
+        regions = []
+        for region_id, fuel_cost in reachable["regions"].items():
+            region = session.star_map.get_region(region_id)
+            regions.append({
+                "id": region_id,
+                "name": region.name,
+                "region_type": region.type,
+                "fuel_cost": fuel_cost,
+                "entry_known": region_id not in reachable["unknown_entry"]
+            })
+        
+        for node_id, fuel_cost in reachable["nodes"].items():
+            node = session.star_map.get_node(node_id)
+            nodes.append({
+                "id": node_id,
+                "name": node.name,
+                "region_id": node.region_id,
+                "node_type": node.type,
+                "has_repair": node.has_repair,
+                "has_trade": node.has_trade,
+                "fuel_cost": fuel_cost
+            })
+        
+        nodes.sort(key=lambda n: n["fuel_cost"])
+        regions.sort(key=lambda r: r["fuel_cost"])
         
         return jsonify({
-            "options": options,
-            "current_location": {
-                "region": current_region['name'],
-                "node": current_node['name'],
-                "type": current_node['type']
-            }
+            "fuel": fuel,
+            "travel_cost": travel_cost,
+            "origin": {
+                "region_id": session.current_region_id,
+                "node_id": session.current_node_id
+            },
+            "nodes": nodes,
+            "regions": regions
+        })
+
+
+@app.route('/api/game/map/<session_id>/tiles', methods=['GET'])
+def get_map_tiles(session_id):
+    """Get the regions and nodes inside a viewport"""
+    bbox = request.args.get('bbox')
+    if bbox is not None:
+        try:
+            bbox = [float(value) for value in bbox.split(',')]
+        except ValueError:
+            bbox = []
+        if len(bbox) != 4 or not all(math.isfinite(value) for value in bbox) \
+                or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            return jsonify({"error": "bbox must be min_x,min_y,max_x,max_y"}), 400
+    
+    zoom = request.args.get('zoom', DETAIL_ZOOM_LEVEL, type=int)
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        if not session.star_map:
+            return jsonify({"regions": [], "nodes": []})
+        
+        tiles = session.get_map_tiles()
+        tile = tiles.get_tile(bbox, zoom)
+        tile["map_bounds"] = tiles.get_bounds()
+        return jsonify(tile)
+
+
+@app.route('/api/game/map/<session_id>/search', methods=['GET'])
+def search_map(session_id):
+    """Search map nodes by name and/or node type"""
+    query = request.args.get('q', '')
+    node_types = request.args.get('type')
+    if node_types is not None:
+        node_types = [t for t in node_types.split(',') if t]
+        unknown = [t for t in node_types if t not in NodeType.get_all_types()]
+        if unknown:
+            return jsonify({"error": f"Unknown node type: {', '.join(unknown)}"}), 400
+    
+    limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        map_search = session.get_map_search()
+        if not map_search:
+            return jsonify({"total": 0, "results": []})
+        
+        total, matches = map_search.search(query, node_types, limit)
+        
+        return jsonify({
+            "query": query,
+            "types": node_types,
+            "total": total,
+            "results": [
+                {
+                    "id": node.id,
+                    "name": node.name,
+                    "node_type": node.type,
+                    "region_id": node.region_id,
+                    "discovered": node.discovered,
+                    "visited": node.visited,
+                    "has_repair": node.has_repair,
+                    "has_trade": node.has_trade,
+                    "rank": rank
+                }
+                for rank, node in matches
+            ]
         })
 
 
@@ -348,31 +605,79 @@ def get_available_mods(session_id):
         if not session:
             return jsonify({"error": "Session not found"}), 404
         
-        ship_info = SHIP_TYPES[session.player_stats["ship_type"]]
-        available_mods = {}
-        
-        for slot_type in ["high", "mid", "low", "rig"]:
-            # Get mods for this slot type
-            slot_mods = ShipManager.get_available_mods_for_slot(slot_type)
-            
-            # Filter out already installed mods
-            installed = session.player_stats["ship_mods"].get(slot_type, [])
-            available = {
-                mod_id: mod_info
-                for mod_id, mod_info in slot_mods.items()
-                if mod_id not in installed
-            }
-            
-            # Add slot availability info
-            available_mods[slot_type] = {
-                "max_slots": ship_info["slots"][slot_type],
-                "used_slots": len(installed),
-                "available_mods": available
-            }
+        # Cached per (ship type, installed mods)
+        available_mods = get_available_mods_for_loadout(
+            session.player_stats.ship_type, session.player_stats.ship_mods
+        )
         
         return jsonify(available_mods)
 
 
+@app.route('/api/game/optimize_loadout/<session_id>', methods=['GET'])
+def get_optimized_loadout(session_id):
+    """Get the best mods for a ship type, budget and objective"""
+    objective = request.args.get('objective', 'combat_power')
+    ship_type = request.args.get('ship_type')
+    budget = request.args.get('budget')
+    if budget is not None:
+        try:
+            budget = int(budget)
+        except ValueError:
+            return jsonify({"error": f"Invalid budget: {budget}"}), 400
+        if budget < 0:
+            return jsonify({"error": "Budget cannot be negative"}), 400
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        # Default to the player's own ship and wealth
+        try:
+            result = optimize_loadout(
+                ship_type or session.player_stats.ship_type,
+                session.player_stats.wealth if budget is None else budget,
+                objective
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        return jsonify(result)
+
+
+def build_action_game_state(session, effective_stats=None):
+    """Get the game state sent after actions, with the catalogs the UI needs"""
+    game_state = session.to_dict(effective_stats)
+    game_state["pod_augmentations_info"] = {
+        aug_id: POD_AUGMENTATIONS[aug_id] 
+        for aug_id in session.player_stats.get('pod_augmentations', [])
+    }
+    game_state["ship_types"] = SHIP_TYPES
+    game_state["ship_mods"] = SHIP_MODS
+    game_state["item_types"] = ITEM_TYPES
+    return game_state
+
+
+def emit_action_result(session_id, game_state, result):
+    """Emit the updated game state, then the action's event if it has one"""
+    with span("socketio.emit", event="game_state"):
+        socketio.emit('game_state', game_state, room=session_id)
+    
+    if result.get('event'):
+        event_data = {
+            'type': result['event_type'],
+            'message': result['event']
+        }
+        
+        # Only include choices if they exist and are non-empty
+        choices = result.get('choices', [])
+        if choices and len(choices) > 0:
+            event_data['choices'] = choices
+        
+        with span("socketio.emit", event="game_event"):
+            socketio.emit('game_event', event_data, room=session_id)
+
+
 @app.route('/api/game/action/<session_id>', methods=['POST'])
 def perform_action(session_id):
     """Perform a game action"""
@@ -387,41 +692,82 @@ def perform_action(session_id):
         # Process action
         result = action_processor.process_action(session, action, data)
         
-        # Update game state based on action type and pod augmentations
-        # This ensures the UI updates properly
-        game_state = session.to_dict()
-        game_state["pod_augmentations_info"] = {
-            aug_id: POD_AUGMENTATIONS[aug_id] 
-            for aug_id in session.player_stats.get('pod_augmentations', [])
-        }
-        game_state["ship_types"] = SHIP_TYPES
-        game_state["ship_mods"] = SHIP_MODS
-        game_state["item_types"] = ITEM_TYPES
-        
-        # Emit updated game state via WebSocket
-        socketio.emit('game_state', game_state, room=session_id)
-        
-        # Emit event if present
-        if result.get('event'):
-            event_data = {
-                'type': result['event_type'],
-                'message': result['event']
-            }
-            
-            # Only include choices if they exist and are non-empty
-            choices = result.get('choices', [])
-            if choices and len(choices) > 0:
-                event_data['choices'] = choices
-            
-            socketio.emit('game_event', event_data, room=session_id)
+        # Share effective stats between the state and the next moves
+        effective_stats = session.get_effective_stats()
+        game_state = build_action_game_state(session, effective_stats)
+        emit_action_result(session_id, game_state, result)
         
         return jsonify({
             "success": result.get("success", False),
             "result": result,
-            "game_state": game_state
+            "game_state": game_state,
+            "navigation_options": build_navigation_options(session, effective_stats)
         })
 
 
+@app.route('/api/game/actions/<session_id>', methods=['POST'])
+def perform_actions(session_id):
+    """Perform a list of game actions in order, optionally all-or-nothing"""
+    data = request.json or {}
+    actions = data.get('actions')
+    if not isinstance(actions, list) or not actions:
+        return jsonify({"error": "actions must be a non-empty list"}), 400
+    if len(actions) > MAX_BATCH_ACTIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_ACTIONS} actions per batch"}), 400
+    if not all(isinstance(entry, dict) and entry.get('action') for entry in actions):
+        return jsonify({"error": "Each entry needs an action"}), 400
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        batch = action_processor.process_actions(
+            session, actions, atomic=bool(data.get('atomic', False))
+        )
+        
+        # One state update for the whole batch; the last result's event drives the UI
+        effective_stats = session.get_effective_stats()
+        game_state = build_action_game_state(session, effective_stats)
+        emit_action_result(session_id, game_state, batch["results"][-1])
+        
+        return jsonify(dict(
+            batch,
+            game_state=game_state,
+            navigation_options=build_navigation_options(session, effective_stats)
+        ))
+
+
+@app.route('/api/combat/estimate/<session_id>', methods=['GET'])
+def estimate_combat_outcomes(session_id):
+    """Estimate win, flee and death odds for each combat strategy"""
+    enemy_type = request.args.get('enemy')
+    if enemy_type is not None and enemy_type not in ENEMY_TYPES:
+        return jsonify({"error": f"Unknown enemy type: {enemy_type}"}), 400
+    
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        # Default to the fight in progress, from its current HP
+        combat = session.combat_manager.current_combat
+        if combat and enemy_type in (None, combat["enemy"]["type"]):
+            estimate = estimate_combat(
+                session.player_stats,
+                combat["enemy"]["type"],
+                player_hp=combat["player"]["hp"],
+                enemy_hp=combat["enemy"]["hp"],
+                enemy_max_hp=combat["enemy"]["max_hp"]
+            )
+        elif enemy_type:
+            estimate = estimate_combat(session.player_stats, enemy_type)
+        else:
+            return jsonify({"error": "Not in combat; pass an enemy type"}), 400
+        
+        return jsonify(dict(estimate, in_combat=combat is not None))
+
+
 @app.route('/api/game/statistics/<session_id>', methods=['GET'])
 def get_statistics(session_id):
     """Get game statistics"""
@@ -433,6 +779,143 @@ def get_statistics(session_id):
         return jsonify(session.statistics)
 
 
+@app.route('/api/game/memory/<session_id>', methods=['GET'])
+def get_session_memory(session_id):
+    """Get an estimate of the memory held by a session"""
+    with game_lock:
+        session = session_manager.get_session(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        
+        return jsonify(session_manager.get_session_memory(session))
+
+
+def get_metrics_gauges():
+    """Get the point-in-time values exported next to the histograms"""
+    gauges = [
+        ("cosmic_start_time_seconds", "Unix time the server started", "gauge", started_at),
+        ("cosmic_active_sessions", "Game sessions in memory", "gauge",
+         len(session_manager.sessions)),
+        ("cosmic_session_memory_bytes", "Estimated bytes held by sessions, as last measured",
+         "gauge", session_manager.get_estimated_memory()),
+        ("cosmic_hibernated_sessions", "Game sessions hibernated to disk", "gauge",
+         len(session_manager.hibernated)),
+        ("cosmic_session_hibernations_total", "Sessions hibernated to fit the memory budget",
+         "counter", session_manager.hibernations)
+    ]
+    for memo_name, stats in get_memo_stats().items():
+        gauges += [
+            (f"cosmic_{memo_name}_memo_hits_total", f"Lookups answered by the {memo_name} memo",
+             "counter", stats["hits"]),
+            (f"cosmic_{memo_name}_memo_misses_total", f"Lookups the {memo_name} memo computed",
+             "counter", stats["misses"])
+        ]
+    if traffic_recorder:
+        recorder_stats = traffic_recorder.get_stats()
+        gauges += [
+            ("cosmic_traffic_recorded_total", "Requests written to the traffic trace", "counter",
+             recorder_stats["recorded"]),
+            ("cosmic_traffic_dropped_total", "Requests the traffic trace had no room for",
+             "counter", recorder_stats["dropped"])
+        ]
+    return gauges
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Export metrics in Prometheus text format"""
+    return Response(render_metrics(get_metrics_gauges()),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics_summary_json():
+    """Get counts, means and p50/p95/p99 of every metric, for quick checks"""
+    return jsonify({
+        "gauges": {name: value for name, _, _, value in get_metrics_gauges()},
+        "histograms": get_metrics_summary()
+    })
+
+
+@app.route('/debug/locks', methods=['GET'])
+def get_lock_report():
+    """Get game lock wait and hold times for the holder sites that cost the most (admin only)"""
+    if not is_admin_request():
+        return jsonify({"error": "Admin token required"}), 403
+    sort = request.args.get('sort', 'hold')
+    if sort not in REPORT_SORT_KEYS:
+        return jsonify({"error": f"sort must be one of: {', '.join(REPORT_SORT_KEYS)}"}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    
+    return jsonify({"locks": [game_lock.get_report(sort, max(1, limit))]})
+
+
+@app.route('/debug/sessions', methods=['GET'])
+def get_session_report():
+    """Get per-session turn, wealth and memory stats with the memory budget (admin only)"""
+    if not is_admin_request():
+        return jsonify({"error": "Admin token required"}), 403
+    with game_lock:
+        return jsonify(session_manager.get_session_stats())
+
+
+@app.route('/debug/profile', methods=['GET'])
+def profile_process():
+    """Sample every thread's stack for some seconds and return collapsed stacks (admin only)"""
+    if not is_admin_request():
+        return jsonify({"error": "Admin token required"}), 403
+    try:
+        seconds = float(request.args.get('seconds', 5))
+        interval = float(request.args.get('interval_ms', DEFAULT_SAMPLE_INTERVAL * 1000)) / 1000
+    except ValueError:
+        return jsonify({"error": "seconds and interval_ms must be numbers"}), 400
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or not 0.001 <= interval <= 1:
+        return jsonify({
+            "error": f"seconds must be in (0, {MAX_PROFILE_SECONDS}] "
+                     "and interval_ms in [1, 1000]"
+        }), 400
+    if not profile_lock.acquire(blocking=False):
+        return jsonify({"error": "A profile is already running"}), 409
+    
+    try:
+        # Leave out this request's own thread, which only waits, unless it is the
+        # thread every green thread shares
+        waiting = [threading.get_ident()] if socketio.async_mode == 'threading' else []
+        sampler = StackSampler(interval, exclude_idents=waiting)
+        sampler.start()
+        socketio.sleep(seconds)
+        sampler.stop()
+    finally:
+        profile_lock.release()
+    
+    response = Response(sampler.get_collapsed(), content_type='text/plain; charset=utf-8')
+    response.headers['X-Profile-Samples'] = str(sampler.samples)
+    return response
+
+
+@app.route('/debug/profile/<profile_id>', methods=['GET'])
+def get_request_profile(profile_id):
+    """Get a request profile as a pstats report, or as a .pstats file (admin only)"""
+    if not is_admin_request():
+        return jsonify({"error": "Admin token required"}), 403
+    
+    if request.args.get('format') == 'pstats':
+        data = request_profiles.get_pstats(profile_id)
+        if data is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return Response(data, mimetype='application/octet-stream', headers={
+            'Content-Disposition': f'attachment; filename=request-{profile_id}.pstats'
+        })
+    
+    text = request_profiles.get_text(profile_id)
+    if text is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return Response(text, content_type='text/plain; charset=utf-8')
+
+
 @app.route('/api/saves', methods=['GET'])
 def list_saves():
     """List all save files with metadata"""
@@ -469,11 +952,7 @@ def save_to_slot(slot):
         
         try:
             # Get current location name
-            location_name = get_current_location_name(
-                session.star_map,
-                session.current_region_id,
-                session.current_node_id
-            )
+            location_name = session.get_location_name()
             
             # Save to slot
             metadata = save_game_to_slot(session.to_save_dict(), slot, location_name)
@@ -607,11 +1086,7 @@ def save_game_legacy(session_id):
         
         try:
             # Get current location name
-            location_name = get_current_location_name(
-                session.star_map,
-                session.current_region_id,
-                session.current_node_id
-            )
+            location_name = session.get_location_name()
             
             # Save to auto-save slot
             metadata = save_game_to_slot(session.to_save_dict(), config.AUTO_SAVE_SLOT, location_name)
@@ -671,11 +1146,11 @@ def internal_error(error):
 # Cleanup task
 def cleanup_sessions():
     """Periodic cleanup of old sessions"""
-    import time
     while True:
         time.sleep(300)  # Run every 5 minutes
         with game_lock:
             session_manager.cleanup_old_sessions()
+            session_manager.enforce_memory_budget(refresh=True)
 
 
 # Start cleanup thread
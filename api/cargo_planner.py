@@ -0,0 +1,136 @@
+"""
+Cargo Planner Module for Cosmic Explorer
+Picks the most valuable cargo that fits a weight limit
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_system import ITEM_TYPES
+
+
+def split_quantity(quantity):
+    """Split a quantity into chunks 1, 2, 4, ... whose subsets make every count up to it"""
+    chunks = []
+    size = 1
+    while quantity > 0:
+        chunk = min(size, quantity)
+        chunks.append(chunk)
+        quantity -= chunk
+        size *= 2
+    return chunks
+
+
+def get_kept_quantities(inventory, capacity):
+    """
+    Get how much of each stack to keep for the most base value within capacity.
+
+    A bounded knapsack over whole units: stacks of the same item are pooled
+    and split into power-of-two chunks, and a dynamic program over integer
+    weights up to `capacity` decides which chunks to keep. Weightless items
+    (quest items and unknown ids) are always kept. Returns (kept quantity
+    per stack, kept value, kept weight).
+    """
+    capacity = max(0, int(capacity))
+    totals = {}
+    for item in inventory:
+        totals[item["item_id"]] = totals.get(item["item_id"], 0) + item["quantity"]
+
+    kept_totals = {}
+    chunks = []
+    for item_id, quantity in totals.items():
+        item_info = ITEM_TYPES.get(item_id, {})
+        weight = item_info.get("weight", 0)
+        value = item_info.get("base_value", 0)
+        if weight <= 0:
+            kept_totals[item_id] = quantity
+        elif value > 0:
+            chunks.extend(
+                (item_id, count, weight * count, value * count)
+                for count in split_quantity(min(quantity, capacity // weight))
+            )
+
+    # best[c] is the most value within weight c; taken[j][c - chunk weight]
+    # records whether chunk j improved best[c] when it was added
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    taken = []
+    for _, _, weight, value in chunks:
+        with_chunk = best[:capacity + 1 - weight] + value
+        take = with_chunk > best[weight:]
+        best[weight:] = np.where(take, with_chunk, best[weight:])
+        taken.append(take)
+
+    remaining = capacity
+    for (item_id, count, weight, _), take in zip(reversed(chunks), reversed(taken)):
+        if remaining >= weight and take[remaining - weight]:
+            kept_totals[item_id] = kept_totals.get(item_id, 0) + count
+            remaining -= weight
+
+    # Hand each item's kept units back to its stacks in inventory order
+    kept = []
+    for item in inventory:
+        quantity = min(item["quantity"], kept_totals.get(item["item_id"], 0))
+        kept_totals[item["item_id"]] = kept_totals.get(item["item_id"], 0) - quantity
+        kept.append(quantity)
+
+    kept_value = sum(
+        ITEM_TYPES.get(item["item_id"], {}).get("base_value", 0) * quantity
+        for item, quantity in zip(inventory, kept)
+    )
+    return kept, kept_value, capacity - remaining
+
+
+def select_cargo(inventory, capacity):
+    """Get the stacks, possibly partial, worth the most within capacity, in inventory order"""
+    kept, _, _ = get_kept_quantities(inventory, capacity)
+    return [
+        {"item_id": item["item_id"], "quantity": quantity}
+        for item, quantity in zip(inventory, kept)
+        if quantity > 0
+    ]
+
+
+def get_cargo_advice(inventory, cargo_capacity, free_space=0):
+    """
+    Get the cheapest cargo to get rid of to fit cargo_capacity with free_space spare.
+
+    Keeps the most valuable cargo that fits and lists the rest, least
+    valuable first, with the weight and base value each removal gives up.
+    """
+    target_space = max(0, cargo_capacity - free_space)
+    kept, kept_value, kept_weight = get_kept_quantities(inventory, target_space)
+
+    remove = []
+    for item, kept_quantity in zip(inventory, kept):
+        quantity = item["quantity"] - kept_quantity
+        if quantity <= 0:
+            continue
+        item_info = ITEM_TYPES.get(item["item_id"], {})
+        remove.append({
+            "item_id": item["item_id"],
+            "name": item_info.get("name", item["item_id"]),
+            "quantity": quantity,
+            "weight": item_info.get("weight", 0) * quantity,
+            "value": item_info.get("base_value", 0) * quantity
+        })
+    remove.sort(key=lambda entry: entry["value"])
+
+    return {
+        "cargo_capacity": cargo_capacity,
+        "free_space": free_space,
+        "keep": [
+            {"item_id": item["item_id"], "quantity": quantity}
+            for item, quantity in zip(inventory, kept)
+            if quantity > 0
+        ],
+        "remove": remove,
+        "kept_value": kept_value,
+        "kept_weight": kept_weight,
+        "removed_value": sum(entry["value"] for entry in remove),
+        "removed_weight": sum(entry["weight"] for entry in remove)
+    }
@@ -0,0 +1,125 @@
+"""
+Catalog Module for Cosmic Explorer
+Lookup tables over the ship mod, item and pod augmentation catalogs
+"""
+
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ship_system import SHIP_TYPES, SHIP_MODS, MULTIPLICATIVE_MOD_EFFECTS
+from inventory_system import ITEM_TYPES
+from pod_system import POD_AUGMENTATIONS
+
+# Ship slot types, in display order
+SLOT_TYPES = ("high", "mid", "low", "rig")
+
+
+class CatalogIndex:
+    """
+    Tables derived from the static catalogs, built once at import.
+
+    The returned dicts are shared by every caller and must not be modified.
+    """
+
+    def __init__(self):
+        # Ship mods by slot, and each slot's mods from cheapest to dearest
+        self.mods_by_slot = {slot: {} for slot in SLOT_TYPES}
+        for mod_id, mod_info in SHIP_MODS.items():
+            self.mods_by_slot.setdefault(mod_info["slot"], {})[mod_id] = mod_info
+        self.mods_by_cost = {
+            slot: sorted(mods, key=lambda mod_id: SHIP_MODS[mod_id]["cost"])
+            for slot, mods in self.mods_by_slot.items()
+        }
+
+        # One row per mod, one column per effect; missing effects are neutral
+        self.mod_ids = tuple(SHIP_MODS)
+        self.mod_rows = {mod_id: row for row, mod_id in enumerate(self.mod_ids)}
+        self.effect_names = tuple(sorted({
+            effect for mod_info in SHIP_MODS.values() for effect in mod_info.get("effects", {})
+        }))
+        self.effect_columns = {effect: col for col, effect in enumerate(self.effect_names)}
+        self.effect_vectors = np.array([
+            [
+                mod_info.get("effects", {}).get(
+                    effect, 1.0 if effect in MULTIPLICATIVE_MOD_EFFECTS else 0.0
+                )
+                for effect in self.effect_names
+            ]
+            for mod_info in SHIP_MODS.values()
+        ], dtype=np.float64).reshape(len(self.mod_ids), len(self.effect_names))
+        self.mod_costs = np.array([SHIP_MODS[mod_id]["cost"] for mod_id in self.mod_ids])
+
+        # Items by category, and every item from cheapest to dearest
+        self.items_by_category = {}
+        for item_id, item_info in ITEM_TYPES.items():
+            self.items_by_category.setdefault(item_info["category"], {})[item_id] = item_info
+        self.items_by_value = sorted(
+            ITEM_TYPES, key=lambda item_id: ITEM_TYPES[item_id]["base_value"]
+        )
+        self.item_values = [ITEM_TYPES[item_id]["base_value"] for item_id in self.items_by_value]
+
+    def get_items_in_value_range(self, min_value, max_value):
+        """Get item ids whose base value is within [min_value, max_value], cheapest first"""
+        start = bisect_left(self.item_values, min_value)
+        end = bisect_right(self.item_values, max_value)
+        return self.items_by_value[start:end]
+
+
+CATALOG = CatalogIndex()
+
+
+def get_loadout_key(ship_mods):
+    """Get an order-insensitive, hashable signature for equipped mods"""
+    return tuple((slot, tuple(sorted(ship_mods.get(slot, ())))) for slot in SLOT_TYPES)
+
+
+@lru_cache(maxsize=512)
+def _get_available_mods(ship_type, loadout_key):
+    """Build the available_mods response for one ship type and loadout"""
+    ship_info = SHIP_TYPES[ship_type]
+    installed_mods = dict(loadout_key)
+    available_mods = {}
+    for slot_type in SLOT_TYPES:
+        installed = installed_mods[slot_type]
+        available_mods[slot_type] = {
+            "max_slots": ship_info["slots"][slot_type],
+            "used_slots": len(installed),
+            "available_mods": {
+                mod_id: mod_info
+                for mod_id, mod_info in CATALOG.mods_by_slot[slot_type].items()
+                if mod_id not in installed
+            }
+        }
+    return available_mods
+
+
+def get_available_mods_for_loadout(ship_type, ship_mods):
+    """
+    Get the mods that can still be bought for each slot, with slot usage.
+
+    Responses are cached per (ship type, installed mods) and shared, so
+    they must not be modified.
+    """
+    return _get_available_mods(ship_type, get_loadout_key(ship_mods))
+
+
+@lru_cache(maxsize=256)
+def get_available_augmentations(installed_augmentations):
+    """Get augmentations that fit a pod with the given frozenset of augmentations installed"""
+    installed_slots = {
+        POD_AUGMENTATIONS[aug_id].get("slot")
+        for aug_id in installed_augmentations
+        if aug_id in POD_AUGMENTATIONS
+    }
+    return {
+        aug_id: aug_info
+        for aug_id, aug_info in POD_AUGMENTATIONS.items()
+        if aug_id not in installed_augmentations and aug_info.get("slot") not in installed_slots
+    }
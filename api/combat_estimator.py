@@ -0,0 +1,285 @@
+"""
+Combat Estimator Module for Cosmic Explorer
+Outcome odds for every combat strategy, computed from the combat rules
+"""
+
+import math
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ship_system import ShipManager, SHIP_TYPES
+from combat_system import ENEMY_TYPES, COMBAT_ACTIONS, NON_NEGOTIABLE_ENEMIES
+
+# Fights still going after this many rounds are reported as unresolved
+MAX_ROUNDS = 200
+
+# Stop early once less than this much probability is still fighting
+RESOLVED_EPSILON = 1e-9
+
+OUTCOME_NAMES = ("win", "enemy_fled", "fled", "negotiated", "death", "unresolved")
+
+
+def get_player_profile(player_stats):
+    """
+    Get the combat numbers CombatManager derives from a loadout.
+
+    Mirrors the rules in process_combat_action and attempt_flee, and the
+    action list from get_available_actions.
+    """
+    ship_mods = player_stats.get("ship_mods", {})
+    accuracy = 0.7
+    speed = 1.0
+    has_targeting = False
+    weapon_count = 0
+    for mods in ship_mods.values():
+        if "targeting_computer" in mods:
+            accuracy += 0.2
+            has_targeting = True
+        if "afterburner" in mods:
+            speed += 0.3
+        weapon_count += sum(1 for mod in mods if mod in ["laser_cannon", "missile_launcher"])
+
+    actions = ["attack", "evasive"]
+    if has_targeting:
+        actions.append("precise_shot")
+    if weapon_count >= 2:
+        actions.append("barrage")
+
+    ship_info = SHIP_TYPES.get(player_stats.get("ship_type", "scout"))
+    return {
+        "combat_power": ShipManager.get_combat_power(ship_mods),
+        "accuracy": accuracy,
+        "speed": speed,
+        "flee_speed": speed * ship_info.get("speed", 1.0),
+        "available_actions": tuple(actions)
+    }
+
+
+def _damage_table(hit_chances, damages):
+    """
+    Get {damage: probability per action} for one shot.
+
+    `hit_chances` holds one hit chance per action and `damages` one row of
+    equally likely damage rolls per action; misses are left out.
+    """
+    table = {}
+    for row, (hit_chance, rolls) in enumerate(zip(hit_chances, damages)):
+        for damage in rolls:
+            weights = table.setdefault(int(damage), np.zeros(len(hit_chances)))
+            weights[row] += hit_chance / len(rolls)
+    return table
+
+
+def _transition_matrices(size, miss_chances, damage_table):
+    """
+    Get per-action matrices moving an HP distribution through one shot.
+
+    `matrix[a, i, j]` is the chance that a target with i + 1 HP is left
+    with j + 1 HP. Rows sum to less than 1 by the chance of being killed.
+    """
+    matrices = np.zeros((len(miss_chances), size, size))
+    diagonal = np.arange(size)
+    matrices[:, diagonal, diagonal] = miss_chances[:, None]
+    for damage, weights in damage_table.items():
+        if damage < size:
+            survivors = np.arange(size - damage)
+            matrices[:, survivors + damage, survivors] += weights[:, None]
+    return matrices
+
+
+def _take_hits(hp, matrices):
+    """
+    Apply one shot to per-action HP distributions.
+
+    `hp[a, i]` is the chance that the target has i + 1 HP left. Returns the
+    new distributions and the chance the shot killed the target.
+    """
+    after = np.matmul(hp[:, None, :], matrices)[:, 0, :]
+    return after, hp.sum(axis=1) - after.sum(axis=1)
+
+
+def _summarize(outcomes, rounds_total):
+    """Round outcome probabilities and turn the round total into a mean"""
+    resolved = 1.0 - outcomes["unresolved"]
+    return {
+        "outcomes": {name: round(float(outcomes.get(name, 0.0)), 4) for name in OUTCOME_NAMES},
+        "mean_rounds": round(float(rounds_total / resolved), 2) if resolved > 0 else None
+    }
+
+
+def _estimate_attacks(action_ids, profile, enemy_data, player_hp, enemy_hp, enemy_max_hp,
+                      max_rounds):
+    """
+    Get outcome odds for fighting with each attack action, in one batch.
+
+    Each round follows process_combat_action: the player shoots, then the
+    enemy shoots back, then a wounded enemy may flee. Damage to each side
+    does not depend on the other side's HP, so the enemy and player HP
+    distributions are tracked separately and combined per round.
+    """
+    count = len(action_ids)
+    actions = [COMBAT_ACTIONS[action_id] for action_id in action_ids]
+
+    # Player shot: hit if random() < accuracy, damage max(1, int(power + randint(-2, 2)))
+    player_hits = np.array([
+        min(1.0, profile["accuracy"] * a["accuracy_modifier"]) for a in actions
+    ])
+    player_rolls = [
+        [max(1, int(profile["combat_power"] * a["damage_modifier"] + k)) for k in range(-2, 3)]
+        for a in actions
+    ]
+    player_shot = _transition_matrices(
+        enemy_hp, 1.0 - player_hits, _damage_table(player_hits, player_rolls)
+    )
+
+    # Enemy shot: accuracy is divided by the player's defense for the action
+    enemy_hits = np.array([
+        min(1.0, enemy_data["accuracy"] / (profile["speed"] * a["defense_modifier"]))
+        for a in actions
+    ])
+    enemy_rolls = [max(1, enemy_data["combat_power"] + k) for k in range(-3, 4)]
+    enemy_shot = _transition_matrices(
+        player_hp, 1.0 - enemy_hits, _damage_table(enemy_hits, [enemy_rolls] * count)
+    )
+
+    enemy = np.zeros((count, enemy_hp))
+    enemy[:, enemy_hp - 1] = 1.0
+    player = np.zeros((count, player_hp))
+    player[:, player_hp - 1] = 1.0
+
+    # Enemy HP values at which the enemy may flee
+    may_flee = (np.arange(1, enemy_hp + 1) / enemy_max_hp) <= enemy_data["flee_threshold"]
+
+    win = np.zeros(count)
+    death = np.zeros(count)
+    enemy_fled = np.zeros(count)
+    rounds_total = np.zeros(count)
+
+    for turn in range(1, max_rounds + 1):
+        player_alive = player.sum(axis=1)
+
+        enemy, killed = _take_hits(enemy, player_shot)
+        won = killed * player_alive
+
+        player, shot_down = _take_hits(player, enemy_shot)
+        died = enemy.sum(axis=1) * shot_down
+
+        fleeing = 0.5 * enemy[:, may_flee].sum(axis=1)
+        enemy[:, may_flee] *= 0.5
+        fled = fleeing * player.sum(axis=1)
+
+        win += won
+        death += died
+        enemy_fled += fled
+        rounds_total += turn * (won + died + fled)
+
+        if (enemy.sum(axis=1) * player.sum(axis=1)).max() < RESOLVED_EPSILON:
+            break
+
+    unresolved = np.clip(1.0 - win - death - enemy_fled, 0.0, 1.0)
+    return {
+        action_id: _summarize(
+            {"win": win[i], "enemy_fled": enemy_fled[i], "death": death[i],
+             "unresolved": unresolved[i]},
+            rounds_total[i]
+        )
+        for i, action_id in enumerate(action_ids)
+    }
+
+
+def _estimate_retries(success_chance, max_rounds, success, failures_to_die=None):
+    """
+    Get outcome odds for repeating one action until it succeeds.
+
+    Used for fleeing and negotiating, whose per-round odds never change.
+    When each failure costs hull, `failures_to_die` failures end the fight.
+    """
+    last_round = max_rounds if failures_to_die is None else min(max_rounds, failures_to_die)
+    turns = np.arange(1, last_round + 1)
+    fail_chance = 1.0 - success_chance
+    succeeded = success_chance * fail_chance ** (turns - 1)
+    still_trying = fail_chance ** last_round
+
+    outcomes = {success: succeeded.sum(), "unresolved": 0.0}
+    rounds_total = (turns * succeeded).sum()
+    if failures_to_die is not None and failures_to_die <= max_rounds:
+        outcomes["death"] = still_trying
+        rounds_total += failures_to_die * still_trying
+    else:
+        outcomes["unresolved"] = still_trying
+    return _summarize(outcomes, rounds_total)
+
+
+@lru_cache(maxsize=256)
+def _estimate(ship_mods, ship_type, player_hp, wealth, enemy_type, enemy_hp, enemy_max_hp,
+              max_rounds):
+    """Run the estimate for hashable inputs; results are cached and must not be modified"""
+    profile = get_player_profile({"ship_mods": dict(ship_mods), "ship_type": ship_type})
+    enemy_data = ENEMY_TYPES[enemy_type]
+
+    action_ids = list(COMBAT_ACTIONS)
+    strategies = _estimate_attacks(
+        action_ids, profile, enemy_data, player_hp, enemy_hp, enemy_max_hp, max_rounds
+    )
+    for action_id in action_ids:
+        strategies[action_id]["available"] = action_id in profile["available_actions"]
+
+    # Fleeing: a failed attempt gives the enemy a free 1.5x hit
+    flee_chance = min(0.9, profile["flee_speed"] / (enemy_data["speed"] * 1.5))
+    flee_damage = max(1, int(enemy_data["combat_power"] * 1.5))
+    strategies["flee"] = _estimate_retries(
+        flee_chance, max_rounds, "fled", math.ceil(player_hp / flee_damage)
+    )
+    strategies["flee"]["available"] = True
+
+    # Negotiating: a rejected offer costs nothing, so it is repeated until accepted
+    hp_percent = enemy_hp / enemy_max_hp
+    cost = int(enemy_data["wealth_reward"][1] * hp_percent)
+    available = enemy_type not in NON_NEGOTIABLE_ENEMIES and wealth >= cost
+    if available:
+        strategies["negotiate"] = _estimate_retries(
+            0.3 + (1 - hp_percent) * 0.5, max_rounds, "negotiated"
+        )
+    else:
+        strategies["negotiate"] = _summarize({"unresolved": 1.0}, 0.0)
+    strategies["negotiate"].update(available=available, cost=cost)
+
+    return {
+        "enemy_type": enemy_type,
+        "enemy_hp": enemy_hp,
+        "enemy_max_hp": enemy_max_hp,
+        "player_hp": player_hp,
+        "max_rounds": max_rounds,
+        "strategies": strategies
+    }
+
+
+def estimate_combat(player_stats, enemy_type, player_hp=None, enemy_hp=None, enemy_max_hp=None,
+                    max_rounds=MAX_ROUNDS):
+    """
+    Get win, flee and death odds against an enemy for every strategy.
+
+    Player and enemy HP default to full health for a fresh encounter; pass
+    the values from an ongoing fight to estimate its remaining odds. The
+    result is shared between identical queries and must not be modified.
+    """
+    enemy_data = ENEMY_TYPES[enemy_type]
+    ship_mods = player_stats.get("ship_mods", {})
+    if player_hp is None:
+        player_hp = player_stats["ship_condition"]
+    return _estimate(
+        tuple((slot, tuple(mods)) for slot, mods in sorted(ship_mods.items())),
+        player_stats.get("ship_type", "scout"),
+        max(1, math.ceil(player_hp)),
+        player_stats.get("wealth", 0),
+        enemy_type,
+        max(1, math.ceil(enemy_hp if enemy_hp is not None else enemy_data["hp"])),
+        enemy_max_hp if enemy_max_hp is not None else enemy_data["max_hp"],
+        max_rounds
+    )
@@ -3,7 +3,15 @@ Combat System Module for Cosmic Explorer
 Handles space combat encounters, enemy types, and tactical decisions
 """
 
+import copy
+import os
 import random
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sampling import get_encounter_table, get_drop_table
 
 # Enemy type definitions
 ENEMY_TYPES = {
@@ -130,6 +138,15 @@ COMBAT_ACTIONS = {
     }
 }
 
+# Loot chances per enemy type, in loot table order, for drop table lookups
+ENEMY_LOOT_CHANCES = {
+    enemy_type: tuple(entry["chance"] for entry in enemy_info["loot_table"])
+    for enemy_type, enemy_info in ENEMY_TYPES.items()
+}
+
+# Enemies that cannot be negotiated with
+NON_NEGOTIABLE_ENEMIES = frozenset({"alien_drone", "rogue_ai_ship"})
+
 
 class CombatManager:
     """Manages combat encounters and resolution"""
@@ -140,38 +157,15 @@ class CombatManager:
     
     def generate_encounter(self, danger_level=0.5, location_type=None):
         """Generate a random combat encounter based on danger and location"""
-        # Weight enemies by danger level
-        enemy_weights = {
-            "pirate_scout": 1.0 - danger_level * 0.5,
-            "pirate_raider": danger_level,
-            "alien_drone": 0.3 if location_type == "ancient_ruins" else 0.1,
-            "space_kraken": danger_level * 0.3 if location_type == "nebula" else 0.05,
-            "rogue_ai_ship": danger_level * 0.4
-        }
-        
-        # Normalize weights
-        total_weight = sum(enemy_weights.values())
-        enemy_choices = []
-        for enemy_type, weight in enemy_weights.items():
-            enemy_choices.append((enemy_type, weight / total_weight))
-        
-        # Select enemy
-        roll = random.random()
-        cumulative = 0
-        for enemy_type, weight in enemy_choices:
-            cumulative += weight
-            if roll <= cumulative:
-                return self.create_enemy(enemy_type)
-        
-        # Fallback
-        return self.create_enemy("pirate_scout")
+        return self.create_enemy(get_encounter_table(danger_level, location_type).sample())
     
     def create_enemy(self, enemy_type):
         """Create an enemy instance"""
         if enemy_type not in ENEMY_TYPES:
             enemy_type = "pirate_scout"
         
-        enemy_data = ENEMY_TYPES[enemy_type].copy()
+        # "data" is the shared template; only hp changes during a fight
+        enemy_data = ENEMY_TYPES[enemy_type]
         return {
             "type": enemy_type,
             "hp": enemy_data["hp"],
@@ -218,7 +212,8 @@ class CombatManager:
             "enemy_hp": self.current_combat["enemy"]["hp"],
             "enemy_max_hp": self.current_combat["enemy"]["max_hp"],
             "enemy_type": self.current_combat["enemy"]["type"],
-            "enemy_data": self.current_combat["enemy"]["data"],
+            # A copy, so callers annotating it can't change the shared template
+            "enemy_data": copy.deepcopy(self.current_combat["enemy"]["data"]),
             "turn": self.current_combat["turn"],
             "available_actions": self.get_available_actions()
         }
@@ -380,6 +375,19 @@ class CombatManager:
                 "combat_ongoing": True
             }
     
+    def get_negotiation_cost(self):
+        """Get the credits the enemy wants for safe passage, or None if it won't negotiate"""
+        if not self.current_combat:
+            return None
+        
+        enemy = self.current_combat["enemy"]
+        if enemy["type"] in NON_NEGOTIABLE_ENEMIES:
+            return None
+        
+        # Max reward as base, scaled by the enemy's remaining HP
+        base_cost = enemy["data"]["wealth_reward"][1]
+        return int(base_cost * enemy["hp"] / enemy["max_hp"])
+    
     def negotiate(self, player_stats):
         """Attempt to negotiate with enemy"""
         if not self.current_combat:
@@ -389,7 +397,8 @@ class CombatManager:
         enemy_data = enemy["data"]
         
         # Some enemies can't be negotiated with
-        if enemy["type"] in ["alien_drone", "rogue_ai_ship"]:
+        negotiation_cost = self.get_negotiation_cost()
+        if negotiation_cost is None:
             return {
                 "success": False,
                 "message": f"{enemy_data['name']} cannot be reasoned with!",
@@ -397,10 +406,7 @@ class CombatManager:
                 "combat_ongoing": True
             }
         
-        # Calculate negotiation cost
-        base_cost = enemy_data["wealth_reward"][1]  # Max reward as base
         hp_percent = enemy["hp"] / enemy["max_hp"]
-        negotiation_cost = int(base_cost * hp_percent)
         
         if player_stats["wealth"] < negotiation_cost:
             return {
@@ -461,31 +467,32 @@ class CombatManager:
             if random.random() < enemy_data["loot_chance"]:
                 from inventory_system import InventoryManager
                 
-                # Select loot from table
-                for loot_entry in enemy_data["loot_table"]:
-                    if random.random() < loot_entry["chance"]:
-                        item_id = loot_entry["item"]
-                        qty_min, qty_max = loot_entry["quantity"]
-                        quantity = random.randint(qty_min, qty_max)
-                        
-                        # Try to add to inventory
-                        can_add, reason = InventoryManager.can_add_item(
+                # Each entry drops independently; one draw picks which ones did
+                loot_table = enemy_data["loot_table"]
+                for index in get_drop_table(ENEMY_LOOT_CHANCES[enemy["type"]]).sample():
+                    loot_entry = loot_table[index]
+                    item_id = loot_entry["item"]
+                    qty_min, qty_max = loot_entry["quantity"]
+                    quantity = random.randint(qty_min, qty_max)
+                    
+                    # Try to add to inventory
+                    can_add, reason = InventoryManager.can_add_item(
+                        player_stats["inventory"],
+                        player_stats["cargo_capacity"],
+                        item_id,
+                        quantity
+                    )
+                    
+                    if can_add:
+                        InventoryManager.add_item(
                             player_stats["inventory"],
-                            player_stats["cargo_capacity"],
                             item_id,
                             quantity
                         )
-                        
-                        if can_add:
-                            InventoryManager.add_item(
-                                player_stats["inventory"],
-                                item_id,
-                                quantity
-                            )
-                            results["rewards"]["items"].append({
-                                "item_id": item_id,
-                                "quantity": quantity
-                            })
+                        results["rewards"]["items"].append({
+                            "item_id": item_id,
+                            "quantity": quantity
+                        })
             
             message = f"Victory! Defeated {enemy_data['name']}. "
             if wealth_reward > 0:
@@ -503,6 +510,47 @@ class CombatManager:
         
         return results
     
+    def to_dict(self):
+        """Convert the active combat to a dictionary for save files"""
+        if not self.current_combat:
+            return None
+        
+        enemy = self.current_combat["enemy"]
+        return {
+            "player": {
+                "hp": self.current_combat["player"]["hp"],
+                "max_hp": self.current_combat["player"]["max_hp"]
+            },
+            "enemy": {
+                "type": enemy["type"],
+                "hp": enemy["hp"],
+                "max_hp": enemy["max_hp"]
+            },
+            "turn": self.current_combat["turn"],
+            "log": self.current_combat["log"]
+        }
+    
+    def load_from_dict(self, combat_data, player_stats):
+        """Restore a combat saved by to_dict, re-linking the enemy template and player stats"""
+        if not combat_data:
+            self.current_combat = None
+            return
+        
+        enemy = self.create_enemy(combat_data["enemy"]["type"])
+        enemy["hp"] = combat_data["enemy"]["hp"]
+        enemy["max_hp"] = combat_data["enemy"]["max_hp"]
+        
+        self.current_combat = {
+            "player": {
+                "hp": combat_data["player"]["hp"],
+                "max_hp": combat_data["player"]["max_hp"],
+                "stats": player_stats
+            },
+            "enemy": enemy,
+            "turn": combat_data.get("turn", 1),
+            "log": combat_data.get("log", [])
+        }
+    
     def get_combat_summary(self):
         """Get a summary of the combat for display"""
         if not self.current_combat:
@@ -0,0 +1,345 @@
+"""
+Game Simulator Module for Cosmic Explorer
+Plays whole games headlessly with bot policies, for engine benchmarks and balance tuning
+"""
+
+import os
+import random
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from multiprocessing import Pool
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from action_processor import ActionProcessor, CHOICE_ACTIONS
+from session_manager import GameSession
+from inventory_system import ITEM_TYPES
+from ship_system import SHIP_MODS, SHIP_TYPES
+
+# Free actions (buying, selling, events) don't use turns, so cap actions per game too
+MAX_GAME_ACTIONS = 500
+
+# Turns per bucket in the game length histogram
+LENGTH_BUCKET_TURNS = 10
+
+# Spellings accepted for boolean config overrides
+BOOL_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+# Event choice that sends an escape pod towards the nearest repair station
+SAFE_HARBOR_CHOICE = next(
+    choice for choice, (action, _) in CHOICE_ACTIONS.items() if action == "navigate"
+)
+
+
+class BotPolicy(ABC):
+    """Picks a game's next action; subclasses implement choose_action"""
+
+    name = None
+
+    @abstractmethod
+    def choose_action(self, session, rng):
+        """Get the next (action, data) for a session"""
+
+    @staticmethod
+    def get_moves(session):
+        """Get navigate data for every node connected to the current one"""
+        location = session.get_current_location()
+        if not location:
+            return [{}]
+        return [{"target_node_id": node.id} for node in location["node"].connections] or [{}]
+
+
+class RandomPolicy(BotPolicy):
+    """Picks any action that can make sense where the player is, uniformly"""
+
+    name = "random"
+
+    def choose_action(self, session, rng):
+        stats = session.player_stats
+        if stats.get("in_combat", False):
+            return rng.choice([
+                ("combat_action", {"combat_action": "attack"}),
+                ("flee", {}),
+                ("negotiate", {})
+            ])
+
+        actions = [("navigate", move) for move in self.get_moves(session)]
+        actions += [("event", {}), ("scan", {}), ("mine", {}), ("salvage", {}),
+                    ("consume_food", {})]
+        if session.at_repair_location:
+            actions.append(("repair", {}))
+            actions += [
+                ("sell_item", {"item_id": item["item_id"], "quantity": item["quantity"]})
+                for item in stats.inventory
+            ]
+        return rng.choice(actions)
+
+
+class TraderPolicy(BotPolicy):
+    """Mines, salvages and sells cargo at stations, repairing and refuelling as it goes"""
+
+    name = "trader"
+
+    # Auto-combat policy: fight, but run when the hull gets low
+    COMBAT_POLICY = {"action": "attack", "flee_below": 0.3}
+
+    def choose_action(self, session, rng):
+        stats = session.player_stats
+        if stats.get("in_combat", False):
+            return "combat_auto", {"policy": self.COMBAT_POLICY}
+
+        if SAFE_HARBOR_CHOICE in session.available_choices:
+            return "choice", {"choice": SAFE_HARBOR_CHOICE}
+
+        if stats.health < 50 and stats.food >= 10:
+            return "consume_food", {"amount": 10}
+
+        # Use carried consumables before they are sold
+        if stats.fuel < 30 and self.has_item(stats, "fuel_cells"):
+            return "use_item", {"item_id": "fuel_cells"}
+
+        if session.at_repair_location and not stats.in_pod_mode:
+            effective_stats = session.get_effective_stats()
+            sellable = [
+                item for item in stats.inventory
+                if not ITEM_TYPES.get(item["item_id"], {}).get("effect")
+                and ITEM_TYPES.get(item["item_id"], {}).get("category") != "quest"
+            ]
+            if sellable:
+                item = sellable[0]
+                return "sell_item", {"item_id": item["item_id"], "quantity": item["quantity"]}
+            if stats.ship_condition < effective_stats["max_ship_condition"] * 0.6 \
+                    and stats.wealth >= 100:
+                return "repair", {}
+            if self.can_fit_mod(stats, "mining_laser") \
+                    and stats.wealth >= SHIP_MODS["mining_laser"]["cost"] + 200:
+                return "buy_mod", {"mod_id": "mining_laser"}
+
+        location = session.get_current_location()
+        node_type = location["node"].type if location else None
+        if stats.fuel > 20 and not stats.in_pod_mode:
+            if node_type == "asteroid_field" and self.has_mod(stats, "mining_laser"):
+                return "mine", {}
+            if node_type in ("debris_field", "battlefield", "derelict_station"):
+                return "salvage", {}
+
+        return "navigate", self.choose_move(session, rng)
+
+    def choose_move(self, session, rng):
+        """Head for a station when carrying cargo, otherwise explore unvisited nodes"""
+        location = session.get_current_location()
+        if not location or not location["node"].connections:
+            return {}
+
+        nodes = location["node"].connections
+        if session.player_stats.inventory:
+            stations = [node for node in nodes if node.has_trade or node.has_repair]
+            if stations:
+                return {"target_node_id": rng.choice(stations).id}
+        unvisited = [node for node in nodes if not node.visited]
+        return {"target_node_id": rng.choice(unvisited or nodes).id}
+
+    @staticmethod
+    def has_item(stats, item_id):
+        return any(item["item_id"] == item_id for item in stats.inventory)
+
+    @staticmethod
+    def has_mod(stats, mod_id):
+        return any(mod_id in mods for mods in stats.ship_mods.values())
+
+    @classmethod
+    def can_fit_mod(cls, stats, mod_id):
+        """Check that a mod is not installed yet and its slot has room"""
+        slot = SHIP_MODS[mod_id]["slot"]
+        capacity = SHIP_TYPES[stats.ship_type]["slots"].get(slot, 0)
+        return not cls.has_mod(stats, mod_id) and len(stats.ship_mods.get(slot, [])) < capacity
+
+
+POLICIES = {policy.name: policy for policy in (RandomPolicy, TraderPolicy)}
+
+
+def get_end_reason(session, capped):
+    """Get why a simulated game ended"""
+    stats = session.player_stats
+    if session.victory:
+        return "victory"
+    if capped:
+        return "action_cap"
+    if stats.health <= 0:
+        return "health"
+    if stats.in_pod_mode and stats.pod_hp <= 0:
+        return "pod_destroyed"
+    if stats.ship_condition <= 0 and not stats.in_pod_mode:
+        return "ship_destroyed"
+    if stats.fuel <= 0:
+        return "fuel"
+    if session.turn_count >= config.MAX_TURNS:
+        return "max_turns"
+    return "unknown"
+
+
+def play_game(policy_name, seed, max_actions=MAX_GAME_ACTIONS):
+    """
+    Play one game to the end with a bot policy, without a server.
+
+    Seeds the global random module, which the engine draws from, so a
+    (policy, seed) pair always plays the same game. Returns the game's
+    outcome and the seconds each action's handler took.
+    """
+    random.seed(seed)
+    rng = random.Random(seed)
+    policy = POLICIES[policy_name]()
+    processor = ActionProcessor()
+    session = GameSession(f"sim-{seed}")
+
+    latencies = {}
+    actions = 0
+    while actions < max_actions:
+        action, data = policy.choose_action(session, rng)
+        start = time.perf_counter()
+        result = processor.process_action(session, action, data, autosave=False)
+        elapsed = time.perf_counter() - start
+
+        # The call that finds the game over doesn't run a handler
+        if session.game_over and not result.get("success"):
+            break
+        latencies.setdefault(action, []).append(elapsed)
+        actions += 1
+
+    return {
+        "seed": seed,
+        "turns": session.turn_count,
+        "actions": actions,
+        "victory": session.victory,
+        "wealth": session.player_stats.wealth,
+        "end_reason": get_end_reason(session, capped=not session.game_over),
+        "latencies": latencies
+    }
+
+
+def convert_config_value(current, value):
+    """Convert an override to the type of the knob's current value"""
+    if isinstance(current, bool) and not isinstance(value, bool):
+        # bool("False") is True, so only accept the spellings that mean one or the other
+        flag = str(value).strip().lower()
+        if flag not in BOOL_VALUES:
+            raise ValueError(f"Not a boolean: {value}")
+        return BOOL_VALUES[flag]
+    return type(current)(value)
+
+
+def apply_config_overrides(overrides):
+    """Set config knobs by name, converting values to each knob's type; returns the old values"""
+    values = {}
+    for name, value in (overrides or {}).items():
+        if name.startswith("_") or not hasattr(config, name):
+            raise ValueError(f"Unknown config setting: {name}")
+        try:
+            values[name] = convert_config_value(getattr(config, name), value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {name}: {value}")
+
+    previous = {name: getattr(config, name) for name in values}
+    for name, value in values.items():
+        setattr(config, name, value)
+    return previous
+
+
+def simulate(games, policy_name="trader", workers=1, seed=0, overrides=None,
+             max_actions=MAX_GAME_ACTIONS):
+    """
+    Play `games` games with seeds seed, seed + 1, ... and summarize them.
+
+    With more than one worker the games fan out over a multiprocessing
+    pool, and each worker applies the config overrides when it starts.
+    The overrides are undone in this process afterwards.
+    """
+    if policy_name not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy_name}")
+    if games < 1 or workers < 1:
+        raise ValueError("games and workers must be positive")
+
+    jobs = [(policy_name, seed + i, max_actions) for i in range(games)]
+    previous = apply_config_overrides(overrides)
+    try:
+        settings = get_balance_settings()
+        start = time.perf_counter()
+        if workers == 1:
+            results = [play_game(*job) for job in jobs]
+        else:
+            with Pool(workers, initializer=apply_config_overrides,
+                      initargs=(overrides,)) as pool:
+                results = pool.starmap(play_game, jobs,
+                                       chunksize=max(1, games // (workers * 4)))
+        elapsed = time.perf_counter() - start
+    finally:
+        apply_config_overrides(previous)
+
+    return summarize(results, elapsed, policy_name, workers, settings)
+
+
+def get_balance_settings():
+    """Get the config knobs that decide how games end"""
+    return {
+        "VICTORY_WEALTH_THRESHOLD": config.VICTORY_WEALTH_THRESHOLD,
+        "MAX_TURNS": config.MAX_TURNS,
+        "STARTING_WEALTH": config.STARTING_WEALTH,
+        "STARTING_FUEL": config.STARTING_FUEL
+    }
+
+
+def summarize(results, elapsed, policy_name, workers, settings):
+    """Get throughput, game length, outcome and per-action latency figures for played games"""
+    actions = sum(game["actions"] for game in results)
+    turns = np.array([game["turns"] for game in results])
+    wealth = np.array([game["wealth"] for game in results])
+
+    latencies = {}
+    for game in results:
+        for action, times in game["latencies"].items():
+            latencies.setdefault(action, []).extend(times)
+
+    handlers = {}
+    for action, times in sorted(latencies.items()):
+        times_us = np.array(times) * 1e6
+        handlers[action] = {
+            "count": len(times),
+            "mean_us": round(float(times_us.mean()), 1),
+            "p50_us": round(float(np.percentile(times_us, 50)), 1),
+            "p99_us": round(float(np.percentile(times_us, 99)), 1)
+        }
+
+    buckets = Counter(int(length) // LENGTH_BUCKET_TURNS * LENGTH_BUCKET_TURNS for length in turns)
+
+    return {
+        "policy": policy_name,
+        "games": len(results),
+        "workers": workers,
+        "settings": settings,
+        "elapsed_seconds": round(elapsed, 3),
+        "actions": actions,
+        "actions_per_second": round(actions / elapsed, 1) if elapsed > 0 else None,
+        "victory_rate": round(sum(game["victory"] for game in results) / len(results), 4),
+        "end_reasons": dict(Counter(game["end_reason"] for game in results).most_common()),
+        "game_length": {
+            "mean": round(float(turns.mean()), 2),
+            "min": int(turns.min()),
+            "p10": float(np.percentile(turns, 10)),
+            "p50": float(np.percentile(turns, 50)),
+            "p90": float(np.percentile(turns, 90)),
+            "max": int(turns.max()),
+            "histogram": {f"{low}-{low + LENGTH_BUCKET_TURNS - 1}": buckets[low]
+                          for low in sorted(buckets)}
+        },
+        "final_wealth": {
+            "mean": round(float(wealth.mean()), 1),
+            "p50": float(np.percentile(wealth, 50))
+        },
+        "handlers": handlers
+    }
@@ -0,0 +1,151 @@
+"""
+Instrumented Lock Module for Cosmic Explorer
+A lock that records wait and hold times by holder, to find contention
+"""
+
+import sys
+import threading
+import time
+
+from metrics import LOCK_HOLD_SECONDS, LOCK_WAIT_SECONDS
+from tracing import add_span
+
+# Ways a contention report can rank holder sites
+REPORT_SORT_KEYS = ("hold", "wait", "contended")
+
+
+class SiteStats:
+    """Contention counters for one holder site"""
+
+    __slots__ = ("contended", "max_queue")
+
+    def __init__(self):
+        self.contended = 0
+        self.max_queue = 0
+
+
+class InstrumentedLock:
+    """
+    A threading.Lock that records how long callers wait for it and hold it.
+
+    Times are kept per holder site: what get_site() returns when the lock is
+    taken, or else the name of the function taking it. Only one in every
+    sample_every acquisitions is timed and charged to a site, to keep the
+    cost down on a busy server; the totals count every acquisition. Wait
+    and hold times go to the lock histograms in metrics.py.
+    """
+
+    def __init__(self, name, get_site=None, sample_every=1):
+        self.name = name
+        self.get_site = get_site
+        self.sample_every = max(1, sample_every)
+        self.lock = threading.Lock()
+        self.queue_lock = threading.Lock()
+        self.waiting = 0
+        self.acquisitions = 0
+        self.contended = 0
+        self.sites = {}
+
+        # Only touched by the thread holding the lock
+        self.holder_site = None
+        self.acquired_at = None
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._acquire(blocking, timeout)
+
+    def release(self):
+        if self.acquired_at is not None:
+            LOCK_HOLD_SECONDS.observe(time.perf_counter() - self.acquired_at,
+                                      self.name, self.holder_site)
+            self.acquired_at = None
+        self.holder_site = None
+        self.lock.release()
+
+    def locked(self):
+        return self.lock.locked()
+
+    def __enter__(self):
+        self._acquire(True, -1)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def _acquire(self, blocking, timeout):
+        queue = 0
+        waited = 0.0
+        if not self.lock.acquire(False):
+            if not blocking:
+                return False
+            with self.queue_lock:
+                self.waiting += 1
+                queue = self.waiting
+            started = time.perf_counter()
+            acquired = self.lock.acquire(True, timeout)
+            waited = time.perf_counter() - started
+            with self.queue_lock:
+                self.waiting -= 1
+            add_span("lock.wait", waited, lock=self.name, queue=queue)
+            if not acquired:
+                return False
+
+        # Held from here on, so the counters below need no other lock
+        self.acquisitions += 1
+        self.contended += queue > 0
+        if self.acquisitions % self.sample_every == 0:
+            site = self.get_holder_site()
+            stats = self.sites.get(site)
+            if stats is None:
+                stats = self.sites[site] = SiteStats()
+            if queue:
+                stats.contended += 1
+                stats.max_queue = max(stats.max_queue, queue)
+            LOCK_WAIT_SECONDS.observe(waited, self.name, site)
+            self.holder_site = site
+            self.acquired_at = time.perf_counter()
+        return True
+
+    def get_holder_site(self):
+        """Get the site taking the lock; never raises, since the lock is already held"""
+        try:
+            site = self.get_site() if self.get_site else None
+        except Exception:
+            site = None
+        # Skip this method, _acquire and acquire or __enter__
+        return site or sys._getframe(3).f_code.co_name
+
+    def get_report(self, sort="hold", limit=10):
+        """Get the lock's totals and its top holder sites by total hold, wait or contention"""
+        summaries = {}
+        for family, kind in ((LOCK_WAIT_SECONDS, "wait"), (LOCK_HOLD_SECONDS, "hold")):
+            for row in family.summarize():
+                if row["lock"] == self.name:
+                    summaries.setdefault(row["site"], {})[kind] = row
+
+        sites = []
+        for site, stats in list(self.sites.items()):
+            rows = summaries.get(site, {})
+            entry = {"site": site, "samples": rows["wait"]["count"] if "wait" in rows else 0,
+                     "contended": stats.contended, "max_queue": stats.max_queue}
+            for kind in ("wait", "hold"):
+                row = rows.get(kind)
+                entry[f"{kind}_total"] = round(row["count"] * row["mean"], 6) if row else 0.0
+                for stat in ("mean", "p99", "max"):
+                    entry[f"{kind}_{stat}"] = row[stat] if row else 0.0
+            sites.append(entry)
+        sort_key = sort if sort == "contended" else f"{sort}_total"
+        sites.sort(key=lambda entry: entry[sort_key], reverse=True)
+
+        acquired_at = self.acquired_at
+        return {
+            "name": self.name,
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "contention_rate": round(self.contended / self.acquisitions, 4)
+            if self.acquisitions else 0.0,
+            "sample_every": self.sample_every,
+            "waiting": self.waiting,
+            "held_by": self.holder_site,
+            "held_for": round(time.perf_counter() - acquired_at, 6) if acquired_at else None,
+            "sites": sites[:limit]
+        }
@@ -340,33 +340,24 @@ class InventoryManager:
     
     @staticmethod
     def get_items_by_category(category):
-        """Get all items of a specific category"""
-        return {
-            item_id: item_info
-            for item_id, item_info in ITEM_TYPES.items()
-            if item_info["category"] == category
-        }
+        """Get all items of a specific category (a shared dict; do not modify)"""
+        from catalog import CATALOG
+        return CATALOG.items_by_category.get(category, {})
     
     @staticmethod
     def generate_random_loot(category=None, value_range=(10, 200)):
         """Generate random loot based on category and value range"""
         import random
+        from sampling import get_loot_table
         
-        # Filter items by category and value
-        eligible_items = []
-        for item_id, item_info in ITEM_TYPES.items():
-            if item_info["category"] == "quest":
-                continue
-            if category and item_info["category"] != category:
-                continue
-            if value_range[0] <= item_info["base_value"] <= value_range[1]:
-                eligible_items.append((item_id, item_info))
-        
-        if not eligible_items:
+        # Eligible items are filtered once per category and value range
+        loot_table = get_loot_table(category, tuple(value_range))
+        if not loot_table:
             return None
         
         # Select random item
-        item_id, item_info = random.choice(eligible_items)
+        item_id = loot_table.sample()
+        item_info = ITEM_TYPES[item_id]
         
         # Random quantity based on value (higher value = lower quantity)
         if item_info["base_value"] > 100:
@@ -0,0 +1,94 @@
+"""
+Loadout Memo Module for Cosmic Explorer
+Process-wide bounded memo for stats derived from ship and pod loadouts
+"""
+
+import threading
+from collections import OrderedDict
+
+# Most players share a handful of loadouts, so these stay small
+SHIP_STATS_MEMO_SIZE = 1024
+POD_EFFECTS_MEMO_SIZE = 256
+
+
+class LoadoutMemo:
+    """
+    Least-recently-used memo of pure loadout calculations.
+
+    Shared by every session, so lookups take a lock. Cached values are
+    shared too; callers get them as-is and must copy before modifying.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, compute):
+        """Get the value for key, calling compute(key) on a miss"""
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        # Compute outside the lock; a racing miss just stores an equal value
+        value = compute(key)
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Get entry count, capacity and hit/miss counters"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+SHIP_STATS_MEMO = LoadoutMemo(SHIP_STATS_MEMO_SIZE)
+POD_EFFECTS_MEMO = LoadoutMemo(POD_EFFECTS_MEMO_SIZE)
+
+
+def get_ship_stats_key(ship_type, equipped_mods):
+    """
+    Get an order-insensitive signature for a ship type and its mods.
+
+    Slots are dropped since a mod's effects do not depend on where it sits;
+    repeated mods are kept because their effects stack.
+    """
+    return ship_type, tuple(sorted(mod_id for mods in equipped_mods.values() for mod_id in mods))
+
+
+def get_pod_effects_key(augmentations):
+    """Get an order-insensitive signature for installed pod augmentations"""
+    return tuple(sorted(augmentations))
+
+
+def get_memo_stats():
+    """Get counters for every loadout memo"""
+    return {
+        "ship_stats": SHIP_STATS_MEMO.get_stats(),
+        "pod_effects": POD_EFFECTS_MEMO.get_stats()
+    }
@@ -0,0 +1,313 @@
+"""
+Loadout Optimizer Module for Cosmic Explorer
+Best mods for a hull's slots and a budget, by branch-and-bound
+"""
+
+import heapq
+import math
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ship_system import SHIP_TYPES, SHIP_MODS, MULTIPLICATIVE_MOD_EFFECTS, ShipManager
+from catalog import CATALOG, SLOT_TYPES
+
+# Stats an objective can weight, as named by calculate_effective_stats
+OPTIMIZABLE_STATS = (
+    "combat_power", "cargo_capacity", "fuel_efficiency", "mining_yield", "max_hp",
+    "speed", "accuracy", "salvage_chance", "scan_bonus", "hull_repair"
+)
+
+# fuel_efficiency multiplies fuel use, so a smaller value is better
+LOWER_IS_BETTER_STATS = ("fuel_efficiency",)
+
+# Named objectives and the stat weights they stand for
+OBJECTIVES = {
+    "combat_power": {"combat_power": 1.0},
+    "cargo": {"cargo_capacity": 1.0},
+    "fuel_efficiency": {"fuel_efficiency": 1.0},
+    "mining_yield": {"mining_yield": 1.0}
+}
+
+# Ternary search steps when pricing the budget for the search bound
+BUDGET_PRICE_STEPS = 40
+
+# Mods adding less than this to the objective are never worth a slot
+MIN_MOD_GAIN = 1e-9
+
+
+def parse_objective(objective):
+    """
+    Get stat weights from a named objective or a "stat:weight,..." mix.
+
+    Raises ValueError for unknown objectives, stats or weights.
+    """
+    if objective in OBJECTIVES:
+        return dict(OBJECTIVES[objective])
+
+    weights = {}
+    for part in objective.split(","):
+        stat, _, weight = part.partition(":")
+        stat = stat.strip()
+        if stat not in OPTIMIZABLE_STATS:
+            raise ValueError(f"Unknown objective or stat: {stat or objective}")
+        try:
+            weights[stat] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for {stat}: {weight}") from None
+        if not math.isfinite(weights[stat]):
+            raise ValueError(f"Invalid weight for {stat}: {weight}")
+    return weights
+
+
+def get_mod_gains(weights):
+    """
+    Get each catalog mod's contribution to a weighted objective.
+
+    Additive effects count as the amount added and multiplicative ones as
+    the log of their factor, so gains add up over a loadout and a single
+    stat objective ranks loadouts exactly as that stat does.
+    """
+    gains = np.zeros(len(CATALOG.mod_ids))
+    for stat, weight in weights.items():
+        column = CATALOG.effect_columns.get(stat)
+        if column is None or not weight:
+            continue
+        values = CATALOG.effect_vectors[:, column]
+        if stat in MULTIPLICATIVE_MOD_EFFECTS:
+            values = np.log(values)
+        if stat in LOWER_IS_BETTER_STATS:
+            values = -values
+        gains += weight * values
+    return gains
+
+
+def drop_dominated(candidates, gains, costs, slots, capacities):
+    """
+    Drop mods that can never be needed in a best loadout.
+
+    A mod is dropped when its slot has as many other mods, at least as
+    cheap and with at least the same gain, as the slot has room for: one of
+    them is always free to take its place.
+    """
+    kept = []
+    best_gains = {slot: [] for slot in capacities}
+    for i in sorted(candidates, key=lambda i: (costs[i], -gains[i], i)):
+        slot = slots[i]
+        capacity = capacities[slot]
+        better = best_gains[slot]
+        if len(better) == capacity and better[0] >= gains[i]:
+            continue
+        kept.append(i)
+        heapq.heappush(better, gains[i])
+        if len(better) > capacity:
+            heapq.heappop(better)
+    return kept
+
+
+def get_priced_bound(price, gains, costs, slots, capacities, budget):
+    """
+    Get a bound on any loadout's gain with each credit of budget priced at `price`.
+
+    A loadout within budget gains at most price * budget plus, per slot, its
+    largest gains net of price * cost, for any price of at least zero.
+    """
+    net_gains = {slot: [] for slot in capacities}
+    for gain, cost, slot in zip(gains, costs, slots):
+        if gain > price * cost:
+            net_gains[slot].append(gain - price * cost)
+    return price * budget + sum(
+        sum(sorted(values, reverse=True)[:capacities[slot]])
+        for slot, values in net_gains.items()
+    )
+
+
+def get_budget_price(gains, costs, slots, capacities, budget):
+    """Find the budget price giving the tightest priced bound (it is convex in price)"""
+    low = 0.0
+    high = max((gain / cost for gain, cost in zip(gains, costs) if cost > 0), default=0.0)
+    for _ in range(BUDGET_PRICE_STEPS):
+        first = low + (high - low) / 3
+        second = high - (high - low) / 3
+        if (get_priced_bound(first, gains, costs, slots, capacities, budget)
+                <= get_priced_bound(second, gains, costs, slots, capacities, budget)):
+            high = second
+        else:
+            low = first
+    return low
+
+
+class LoadoutSearch:
+    """
+    Branch-and-bound over which mods to fit into each slot type.
+
+    Picks at most one of each mod, at most `capacities[slot]` mods per slot
+    and at most `budget` total cost, maximizing the summed gains (ties go
+    to the cheaper loadout).
+
+    Relaxing the budget into a price per credit (a Lagrangian bound) leaves
+    a separate top-k choice per slot; the price giving the tightest bound is
+    found once, candidates are tried in order of gain net of that price, and
+    a branch is cut when neither the priced bound nor the best gains per
+    slot (ignoring the budget) can beat the best loadout found so far.
+    """
+
+    def __init__(self, gains, costs, slots, capacities, budget):
+        self.budget = budget
+        self.capacities = dict(capacities)
+        candidates = [
+            i for i, gain in enumerate(gains)
+            if gain > MIN_MOD_GAIN and costs[i] <= budget and self.capacities.get(slots[i], 0) > 0
+        ]
+        candidates = drop_dominated(candidates, gains, costs, slots, self.capacities)
+        self.price = get_budget_price(
+            [gains[i] for i in candidates], [costs[i] for i in candidates],
+            [slots[i] for i in candidates], self.capacities, budget
+        )
+
+        order = sorted(candidates, key=lambda i: (self.price * costs[i] - gains[i], costs[i], i))
+        self.indices = order
+        self.gains = [float(gains[i]) for i in order]
+        self.costs = [costs[i] for i in order]
+        self.slots = [slots[i] for i in order]
+
+        # Per slot and suffix start, running sums of the largest gains left,
+        # as they are and net of the budget price
+        self.top_gains = self.get_top_sums(self.gains)
+        self.top_priced_gains = self.get_top_sums(
+            [gain - self.price * cost for gain, cost in zip(self.gains, self.costs)]
+        )
+
+        self.best_gain = 0.0
+        self.best_cost = 0
+        self.best_picks = ()
+        self.nodes = 0
+
+    def get_top_sums(self, values):
+        """Get {slot: [running sums of the largest positive values from each position on]}"""
+        count = len(values)
+        top_sums = {}
+        for slot, capacity in self.capacities.items():
+            best = []
+            suffix = [None] * (count + 1)
+            suffix[count] = [0.0]
+            for position in range(count - 1, -1, -1):
+                if self.slots[position] == slot and values[position] > 0:
+                    best = sorted(best + [values[position]], reverse=True)[:capacity]
+                suffix[position] = [0.0]
+                for value in best:
+                    suffix[position].append(suffix[position][-1] + value)
+            top_sums[slot] = suffix
+        return top_sums
+
+    def bound(self, start, budget_left, room):
+        """Get an upper bound on the gain the candidates from start on can add"""
+        per_slot = 0.0
+        priced = self.price * budget_left
+        for slot, left in room.items():
+            sums = self.top_gains[slot][start]
+            per_slot += sums[min(left, len(sums) - 1)]
+            sums = self.top_priced_gains[slot][start]
+            priced += sums[min(left, len(sums) - 1)]
+        return min(per_slot, priced)
+
+    def record(self, gain, cost, picks):
+        """Keep a loadout if it beats the best one so far"""
+        if gain > self.best_gain + MIN_MOD_GAIN or (
+            abs(gain - self.best_gain) <= MIN_MOD_GAIN and cost < self.best_cost
+        ):
+            self.best_gain, self.best_cost, self.best_picks = gain, cost, picks
+
+    def fill_greedily(self, positions):
+        """Record the loadout from taking candidates in the given order while they fit"""
+        room = dict(self.capacities)
+        gain, cost, picks = 0.0, 0, ()
+        for position in positions:
+            slot = self.slots[position]
+            if room[slot] and cost + self.costs[position] <= self.budget:
+                room[slot] -= 1
+                gain += self.gains[position]
+                cost += self.costs[position]
+                picks += (self.indices[position],)
+        self.record(gain, cost, picks)
+
+    def search(self, start, gain, cost, picks, room):
+        """Try adding each candidate from start on to the current picks"""
+        self.nodes += 1
+        self.record(gain, cost, picks)
+
+        budget_left = self.budget - cost
+        for position in range(start, len(self.gains)):
+            # Later candidates are a subset, so their bound is no higher
+            if gain + self.bound(position, budget_left, room) < self.best_gain - MIN_MOD_GAIN:
+                break
+            slot = self.slots[position]
+            if room[slot] == 0 or self.costs[position] > budget_left:
+                continue
+            room[slot] -= 1
+            self.search(
+                position + 1,
+                gain + self.gains[position],
+                cost + self.costs[position],
+                picks + (self.indices[position],),
+                room
+            )
+            room[slot] += 1
+
+    def run(self):
+        """Search every loadout and get (picked indices, gain, cost)"""
+        # Start from greedy fills by gain and by density so most branches cut early
+        positions = range(len(self.gains))
+        self.fill_greedily(sorted(positions, key=lambda position: -self.gains[position]))
+        self.fill_greedily(sorted(
+            positions,
+            key=lambda position: -self.gains[position] / self.costs[position]
+            if self.costs[position] > 0 else -math.inf
+        ))
+        self.search(0, 0.0, 0, (), dict(self.capacities))
+        return self.best_picks, self.best_gain, self.best_cost
+
+
+@lru_cache(maxsize=256)
+def _optimize(ship_type, budget, weight_items):
+    """Find the best loadout for a ship type, budget and sorted weight items"""
+    ship_info = SHIP_TYPES[ship_type]
+    gains = get_mod_gains(dict(weight_items))
+    costs = CATALOG.mod_costs.tolist()
+    slots = [SHIP_MODS[mod_id]["slot"] for mod_id in CATALOG.mod_ids]
+    search = LoadoutSearch(gains, costs, slots, ship_info["slots"], budget)
+    picks, gain, cost = search.run()
+
+    loadout = {slot: [] for slot in SLOT_TYPES}
+    for index in sorted(picks):
+        mod_id = CATALOG.mod_ids[index]
+        loadout[SHIP_MODS[mod_id]["slot"]].append(mod_id)
+    return {
+        "ship_type": ship_type,
+        "budget": budget,
+        "weights": dict(weight_items),
+        "loadout": loadout,
+        "cost": cost,
+        "score": gain,
+        "stats": ShipManager.calculate_effective_stats(None, ship_type, loadout),
+        "nodes_explored": search.nodes
+    }
+
+
+def optimize_loadout(ship_type, budget, objective="combat_power"):
+    """
+    Get the best mods for a fresh hull of ship_type within budget.
+
+    `objective` is a named objective from OBJECTIVES or a "stat:weight,..."
+    mix of OPTIMIZABLE_STATS. Results are cached and shared, so they must
+    not be modified. Raises ValueError for an unknown ship type or objective.
+    """
+    if ship_type not in SHIP_TYPES:
+        raise ValueError(f"Unknown ship type: {ship_type}")
+    weights = parse_objective(objective)
+    return _optimize(ship_type, int(budget), tuple(sorted(weights.items())))
@@ -0,0 +1,167 @@
+"""
+Map Search Module for Cosmic Explorer
+Name and node type indexes for searching large star maps
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+from star_map_index import NODE_TYPE_CODES
+
+# Default and maximum number of search results
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Match ranks, best first
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(text):
+    """Get the set of three-character substrings of a string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class MapSearchIndex:
+    """
+    Search index over the node names and types of a star map.
+
+    Generated names repeat a lot, so the name indexes are built over the
+    distinct names and each name maps to an array of node rows. Token
+    prefixes are answered by bisecting a sorted token list; longer
+    substrings go through a trigram index and are verified against the name.
+    """
+
+    def __init__(self, star_map):
+        self.nodes = star_map.nodes
+        self.names = []
+        self.names_lower = []
+        name_ids = {}
+        name_rows = []
+        type_codes = []
+
+        for node in star_map.nodes:
+            name_id = name_ids.get(node.name)
+            if name_id is None:
+                name_id = name_ids[node.name] = len(self.names)
+                self.names.append(node.name)
+                self.names_lower.append(node.name.lower())
+                name_rows.append([])
+            name_rows[name_id].append(node.uid)
+            type_codes.append(NODE_TYPE_CODES.get(node.type, -1))
+
+        self.name_rows = [np.array(rows, dtype=np.int32) for rows in name_rows]
+        self.type_codes = np.array(type_codes, dtype=np.int8)
+        # Node types used by each name, so type filters can skip whole names
+        self.name_type_codes = [
+            frozenset(self.type_codes[rows].tolist()) for rows in self.name_rows
+        ]
+
+        # Inverted index by node type
+        self.type_rows = {
+            node_type: np.flatnonzero(self.type_codes == code).astype(np.int32)
+            for node_type, code in NODE_TYPE_CODES.items()
+        }
+
+        # Sorted (token, name_id) pairs for prefix lookups
+        self.tokens = sorted({
+            (token, name_id)
+            for name_id, name in enumerate(self.names)
+            for token in tokenize(name)
+        })
+
+        # Trigram -> name ids for substring lookups, frozen to tuples to save memory
+        trigram_index = {}
+        for name_id, name in enumerate(self.names_lower):
+            for trigram in trigrams(name):
+                trigram_index.setdefault(trigram, []).append(name_id)
+        self.trigram_index = {trigram: tuple(ids) for trigram, ids in trigram_index.items()}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _prefix_matches(self, prefix):
+        """Get the ids of all names with a token starting with prefix"""
+        matches = set()
+        for i in range(bisect_left(self.tokens, (prefix,)), len(self.tokens)):
+            token, name_id = self.tokens[i]
+            if not token.startswith(prefix):
+                break
+            matches.add(name_id)
+        return matches
+
+    def _substring_matches(self, text):
+        """Get the ids of all names containing text (at least three characters)"""
+        candidates = None
+        for trigram in trigrams(text):
+            posting = self.trigram_index.get(trigram)
+            if not posting:
+                return set()
+            candidates = set(posting) if candidates is None else candidates.intersection(posting)
+        return {name_id for name_id in candidates if text in self.names_lower[name_id]}
+
+    def match_names(self, query):
+        """Get (rank, name_id) pairs for every name matching a query, best first"""
+        text = query.strip().lower()
+        query_tokens = tokenize(text)
+        if not query_tokens:
+            return []
+
+        ranks = {}
+
+        # Every query token must prefix a token of the name
+        prefix_ids = self._prefix_matches(query_tokens[0])
+        for token in query_tokens[1:]:
+            prefix_ids &= self._prefix_matches(token)
+        for name_id in prefix_ids:
+            exact = self.names_lower[name_id] == text
+            ranks[name_id] = RANK_EXACT if exact else RANK_PREFIX
+
+        if len(text) >= 3:
+            for name_id in self._substring_matches(text):
+                ranks.setdefault(name_id, RANK_SUBSTRING)
+
+        return sorted(
+            ((rank, name_id) for name_id, rank in ranks.items()),
+            key=lambda match: (match[0], self.names_lower[match[1]])
+        )
+
+    def search(self, query=None, node_types=None, limit=DEFAULT_SEARCH_LIMIT):
+        """Search nodes by name and/or type, returning (total, [(rank, node)])"""
+        codes = None
+        if node_types is not None:
+            codes = {NODE_TYPE_CODES[t] for t in node_types if t in NODE_TYPE_CODES}
+
+        if not query or not query.strip():
+            if codes is None:
+                return 0, []
+            rows = np.sort(np.concatenate(
+                [self.type_rows[t] for t in node_types if t in self.type_rows] or
+                [np.empty(0, dtype=np.int32)]
+            ))
+            return len(rows), [(RANK_EXACT, self.nodes[row]) for row in rows[:limit].tolist()]
+
+        total = 0
+        results = []
+        for rank, name_id in self.match_names(query):
+            rows = self.name_rows[name_id]
+            if codes is not None and not self.name_type_codes[name_id] <= codes:
+                if self.name_type_codes[name_id].isdisjoint(codes):
+                    continue
+                rows = rows[np.isin(self.type_codes[rows], list(codes))]
+            total += len(rows)
+            if len(results) < limit:
+                results.extend(
+                    (rank, self.nodes[row]) for row in rows[:limit - len(results)].tolist()
+                )
+        return total, results
@@ -0,0 +1,177 @@
+"""
+Map Tiles Module for Cosmic Explorer
+Spatial index over region and node positions for viewport queries
+"""
+
+import math
+
+import numpy as np
+
+# Zoom levels below this only get region summaries
+DETAIL_ZOOM_LEVEL = 2
+
+
+class SpatialGrid:
+    """
+    Uniform grid over a set of 2D points.
+
+    Points are sorted by cell so each occupied cell maps to a contiguous
+    slice of row numbers. A bounding-box query only visits the cells that
+    overlap the box and then filters the candidates exactly.
+    """
+
+    def __init__(self, positions, cell_size=None):
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.cells = {}
+
+        if len(self.positions) == 0:
+            self.origin = np.zeros(2)
+            self.cell_size = 1.0
+            self.shape = (0, 0)
+            return
+
+        self.origin = self.positions.min(axis=0)
+        extent = self.positions.max(axis=0) - self.origin
+        if cell_size is None:
+            # Aim for roughly one point per cell on a square grid
+            cells_per_axis = max(1, math.ceil(math.sqrt(len(self.positions))))
+            cell_size = max(float(extent.max()) / cells_per_axis, 1.0)
+        self.cell_size = cell_size
+
+        cell_coords = np.floor((self.positions - self.origin) / cell_size).astype(np.int64)
+        self.shape = tuple(int(v) + 1 for v in cell_coords.max(axis=0))
+        cell_keys = cell_coords[:, 0] * self.shape[1] + cell_coords[:, 1]
+
+        self.order = np.argsort(cell_keys, kind="stable")
+        sorted_keys = cell_keys[self.order]
+        keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+        for key, start, count in zip(keys.tolist(), starts.tolist(), counts.tolist()):
+            self.cells[key] = (start, start + count)
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Get the rows of all points inside a bounding box"""
+        if not self.cells:
+            return np.empty(0, dtype=np.int64)
+
+        # Clip in float space first, so huge coordinates can't overflow the int cast
+        shape = np.array(self.shape)
+        low = np.floor((np.array([min_x, min_y]) - self.origin) / self.cell_size)
+        high = np.floor((np.array([max_x, max_y]) - self.origin) / self.cell_size)
+        low = np.clip(low, 0, shape).astype(np.int64)
+        high = np.clip(high, -1, shape - 1).astype(np.int64)
+        if (high < low).any():
+            return np.empty(0, dtype=np.int64)
+
+        chunks = []
+        for cell_x in range(low[0], high[0] + 1):
+            row_start = cell_x * self.shape[1]
+            for cell_y in range(low[1], high[1] + 1):
+                span = self.cells.get(row_start + cell_y)
+                if span:
+                    chunks.append(self.order[span[0]:span[1]])
+
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.concatenate(chunks)
+        points = self.positions[rows]
+        inside = (
+            (points[:, 0] >= min_x) & (points[:, 0] <= max_x) &
+            (points[:, 1] >= min_y) & (points[:, 1] <= max_y)
+        )
+        return np.sort(rows[inside])
+
+
+class MapTileIndex:
+    """Viewport queries over a star map, built on top of a StarMapIndex"""
+
+    def __init__(self, star_map, map_index):
+        self.map_index = map_index
+        self.regions = star_map.regions
+
+        # Region centroids are the mean position of their nodes
+        region_count = len(self.regions)
+        node_counts = np.bincount(map_index.region_index, minlength=region_count)
+        sums_x = np.bincount(map_index.region_index, weights=map_index.positions[:, 0],
+                             minlength=region_count)
+        sums_y = np.bincount(map_index.region_index, weights=map_index.positions[:, 1],
+                             minlength=region_count)
+        fallback = np.array([region.position for region in self.regions],
+                            dtype=np.float64).reshape(-1, 2)
+        safe_counts = np.maximum(node_counts, 1)
+        self.centroids = np.where(
+            (node_counts > 0)[:, None],
+            np.column_stack([sums_x / safe_counts, sums_y / safe_counts]),
+            fallback
+        )
+        self.node_counts = node_counts
+        self.repair_counts = np.bincount(map_index.region_index, weights=map_index.has_repair,
+                                         minlength=region_count).astype(np.int64)
+        self.trade_counts = np.bincount(map_index.region_index, weights=map_index.has_trade,
+                                        minlength=region_count).astype(np.int64)
+
+        self.region_grid = SpatialGrid(self.centroids)
+        self.node_grid = SpatialGrid(map_index.positions)
+
+    def get_bounds(self):
+        """Get the bounding box of every node and region centroid"""
+        points = np.vstack([self.centroids, self.map_index.positions])
+        if len(points) == 0:
+            return [0.0, 0.0, 0.0, 0.0]
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        return [float(low[0]), float(low[1]), float(high[0]), float(high[1])]
+
+    def get_tile(self, bbox=None, zoom=DETAIL_ZOOM_LEVEL):
+        """Get the regions, and at detail zoom the nodes, inside a bounding box"""
+        if bbox is None:
+            bbox = self.get_bounds()
+        min_x, min_y, max_x, max_y = bbox
+
+        regions = []
+        for row in self.region_grid.query(min_x, min_y, max_x, max_y).tolist():
+            region = self.regions[row]
+            regions.append({
+                "id": region.id,
+                "name": region.name,
+                "type": region.type,
+                "x": float(self.centroids[row, 0]),
+                "y": float(self.centroids[row, 1]),
+                "node_count": int(self.node_counts[row]),
+                "repair_count": int(self.repair_counts[row]),
+                "trade_count": int(self.trade_counts[row]),
+                "connections": region.connection_ids
+            })
+
+        tile = {
+            "bbox": [min_x, min_y, max_x, max_y],
+            "zoom": zoom,
+            "level_of_detail": "regions",
+            "regions": regions
+        }
+
+        if zoom < DETAIL_ZOOM_LEVEL:
+            return tile
+
+        map_index = self.map_index
+        nodes = []
+        for row in self.node_grid.query(min_x, min_y, max_x, max_y).tolist():
+            node = map_index.nodes[row]
+            nodes.append({
+                "id": node.id,
+                "name": node.name,
+                "type": node.type,
+                "region_id": node.region_id,
+                "x": float(map_index.positions[row, 0]),
+                "y": float(map_index.positions[row, 1]),
+                "connections": node.connection_ids,
+                "discovered": node.discovered,
+                "visited": node.visited,
+                "has_repair": node.has_repair,
+                "has_trade": node.has_trade,
+                "danger_level": node.danger_level
+            })
+
+        tile["level_of_detail"] = "nodes"
+        tile["nodes"] = nodes
+        return tile
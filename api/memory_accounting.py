@@ -0,0 +1,125 @@
+"""
+Memory Accounting Module for Cosmic Explorer
+Estimates how much memory game sessions hold
+"""
+
+import operator
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regions import Node, Region
+from ship_system import SHIP_TYPES, SHIP_MODS
+from inventory_system import ITEM_TYPES
+from pod_system import POD_AUGMENTATIONS, POD_CONFIG
+from combat_system import ENEMY_TYPES, COMBAT_ACTIONS
+
+# Module-level catalogs shared by every session; never charged to one
+SHARED_CATALOGS = (
+    Node.NODE_CONFIGS, Region.REGION_CONFIGS, SHIP_TYPES, SHIP_MODS, ITEM_TYPES,
+    POD_AUGMENTATIONS, POD_CONFIG, ENEMY_TYPES, COMBAT_ACTIONS
+)
+
+# Leaf types that hold no references worth following
+ATOMIC_TYPES = (str, bytes, int, float, bool, complex, type(None))
+
+# Ids of objects inside SHARED_CATALOGS, collected on first use
+_shared_ids = None
+
+
+def get_shared_ids():
+    """Get the ids of every object inside the shared catalogs"""
+    global _shared_ids
+    if _shared_ids is not None:
+        return _shared_ids
+
+    shared = set()
+    stack = list(SHARED_CATALOGS)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in shared:
+            continue
+        shared.add(id(obj))
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+    _shared_ids = frozenset(shared)
+    return _shared_ids
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Get the bytes held by an object and everything it references.
+
+    Follows dicts, sequences, sets, __dict__ and __slots__ attributes.
+    Objects whose ids are already in `seen` are not counted again, so one
+    `seen` set can be shared across calls to split a total between parts.
+    Classes, modules and functions are not followed.
+    """
+    if seen is None:
+        seen = set()
+
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if isinstance(current, (type, type(sys), type(deep_sizeof))):
+            continue
+
+        total += sys.getsizeof(current)
+        if isinstance(current, ATOMIC_TYPES):
+            continue
+
+        if isinstance(current, np.ndarray):
+            # getsizeof already counts owned data; views pin their base array
+            if current.base is not None:
+                stack.append(current.base)
+        elif isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for cls in type(current).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                for slot in slots:
+                    if slot not in ("__dict__", "__weakref__") and hasattr(current, slot):
+                        stack.append(getattr(current, slot))
+
+    return total
+
+
+def get_session_memory_report(session, components):
+    """
+    Split the memory held by a session between named attributes.
+
+    Components are attribute names, dotted ones reaching into an attribute
+    (such as "player_stats.inventory"). Each is charged only for objects not
+    already charged to an earlier one; whatever is left on the session is
+    reported as "other".
+    """
+    seen = set(get_shared_ids())
+    report = {}
+    for name in components:
+        report[name] = deep_sizeof(operator.attrgetter(name)(session), seen)
+    report["other"] = deep_sizeof(session, seen)
+
+    return {
+        "total_bytes": sum(report.values()),
+        "components": report
+    }
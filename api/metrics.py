@@ -0,0 +1,240 @@
+"""
+Metrics Module for Cosmic Explorer
+Process-wide latency and size histograms, exported in Prometheus text format
+"""
+
+import threading
+
+# Each power of two is split into this many linear sub-buckets (2 ** 3 = 8),
+# so a bucket is at most 12.5% wide, like an HdrHistogram with 3 bits of precision
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Recorded values are clamped below 2 ** 40 (12.7 days in microseconds, 1 TiB in bytes)
+MAX_VALUE = (1 << 40) - 1
+
+# Quantiles reported by the JSON summary
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+# Prometheus `le` bounds, in the histograms' recorded units; powers of four
+# so each falls on a bucket edge
+LATENCY_BOUNDS = tuple(4 ** power for power in range(3, 14))  # 64 us to 67 s
+SIZE_BOUNDS = tuple(4 ** power for power in range(4, 13))  # 256 B to 16 MiB
+
+
+def get_bucket_index(value):
+    """Get the bucket holding a non-negative integer value"""
+    shift = max(value.bit_length() - SUB_BUCKET_BITS - 1, 0)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def get_bucket_range(index):
+    """Get the lowest value of a bucket and the lowest value past it"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index + 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    sub_bucket = (index & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+    return sub_bucket << shift, (sub_bucket + 1) << shift
+
+
+BUCKET_COUNT = get_bucket_index(MAX_VALUE) + 1
+
+
+class Histogram:
+    """Log-linear counts of non-negative integers, with their sum and maximum"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        value = min(max(value, 0), MAX_VALUE)
+        self.counts[get_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def get_quantile(self, quantile):
+        """Get the middle of the bucket holding the given quantile, or 0 if empty"""
+        rank = max(1, round(quantile * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                lower, upper = get_bucket_range(index)
+                return min((lower + upper) / 2, self.max)
+        return 0
+
+    def get_cumulative_counts(self, bounds):
+        """Get how many values fell below each bound, which must be bucket edges"""
+        cumulative = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < BUCKET_COUNT and get_bucket_range(index)[1] <= bound:
+                seen += self.counts[index]
+                index += 1
+            cumulative.append(seen)
+        return cumulative
+
+
+class HistogramFamily:
+    """
+    A Prometheus histogram metric: one Histogram per combination of labels.
+
+    Values are observed in the exported unit (seconds or bytes) and stored
+    as integers of `unit` of it, e.g. microseconds with unit=1e-6.
+    """
+
+    def __init__(self, name, help_text, label_names, unit, bounds):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.unit = unit
+        self.bounds = bounds
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """Record a value for the given label values, in label_names order"""
+        recorded = int(value / self.unit)
+        with self.lock:
+            histogram = self.children.get(label_values)
+            if histogram is None:
+                histogram = self.children[label_values] = Histogram()
+            histogram.record(recorded)
+
+    def clear(self):
+        with self.lock:
+            self.children.clear()
+
+    def get_series(self):
+        """Get (labels dict, copied Histogram) for every label combination seen"""
+        with self.lock:
+            series = []
+            for label_values, histogram in self.children.items():
+                copy = Histogram()
+                copy.counts = list(histogram.counts)
+                copy.count, copy.total, copy.max = histogram.count, histogram.total, histogram.max
+                series.append((dict(zip(self.label_names, label_values)), copy))
+        series.sort(key=lambda entry: tuple(entry[0].values()))
+        return series
+
+    def render(self):
+        """Get the Prometheus text exposition lines of this metric"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, histogram in self.get_series():
+            cumulative = histogram.get_cumulative_counts(self.bounds)
+            for bound, count in zip(self.bounds, cumulative):
+                bucket_labels = format_labels(dict(labels, le=format_number(bound * self.unit)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_bucket{format_labels(dict(labels, le='+Inf'))} "
+                         f"{histogram.count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} "
+                         f"{format_number(histogram.total * self.unit)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {histogram.count}")
+        return lines
+
+    def summarize(self):
+        """Get count, mean, quantiles and maximum for every label combination"""
+        summary = []
+        for labels, histogram in self.get_series():
+            row = dict(labels, count=histogram.count,
+                       mean=round(histogram.total * self.unit / histogram.count, 6))
+            for quantile in SUMMARY_QUANTILES:
+                row[f"p{round(quantile * 100)}"] = round(
+                    histogram.get_quantile(quantile) * self.unit, 6
+                )
+            row["max"] = round(histogram.max * self.unit, 6)
+            summary.append(row)
+        return summary
+
+
+def format_number(value):
+    """Format a float without trailing zeros or exponent noise"""
+    text = f"{value:.9f}".rstrip("0").rstrip(".")
+    return text or "0"
+
+
+def format_labels(labels):
+    """Format a label dict as {name="value",...}, or nothing without labels"""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def escape_label_value(value):
+    """Escape backslashes, quotes and newlines in a label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_gauges(gauges):
+    """Get Prometheus lines for (name, help, type, value) point-in-time values"""
+    lines = []
+    for name, help_text, metric_type, value in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}",
+                  f"{name} {format_number(value)}"]
+    return lines
+
+
+HTTP_REQUEST_SECONDS = HistogramFamily(
+    "cosmic_http_request_duration_seconds", "Time to handle an HTTP request",
+    ("endpoint", "method", "status"), 1e-6, LATENCY_BOUNDS
+)
+HTTP_RESPONSE_BYTES = HistogramFamily(
+    "cosmic_http_response_bytes", "Size of HTTP response bodies",
+    ("endpoint",), 1, SIZE_BOUNDS
+)
+JSON_ENCODE_SECONDS = HistogramFamily(
+    "cosmic_json_encode_seconds", "Time to encode JSON response bodies",
+    ("endpoint",), 1e-6, LATENCY_BOUNDS
+)
+ACTION_SECONDS = HistogramFamily(
+    "cosmic_action_duration_seconds", "Time to process a game action, including auto-save",
+    ("action", "outcome"), 1e-6, LATENCY_BOUNDS
+)
+AUTOSAVE_SECONDS = HistogramFamily(
+    "cosmic_autosave_duration_seconds", "Time to write the auto-save slot",
+    ("outcome",), 1e-6, LATENCY_BOUNDS
+)
+AUTOSAVE_BYTES = HistogramFamily(
+    "cosmic_autosave_bytes", "Size of auto-save files",
+    (), 1, SIZE_BOUNDS
+)
+LOCK_WAIT_SECONDS = HistogramFamily(
+    "cosmic_lock_wait_seconds", "Time spent waiting to acquire a lock, by holder site",
+    ("lock", "site"), 1e-6, LATENCY_BOUNDS
+)
+LOCK_HOLD_SECONDS = HistogramFamily(
+    "cosmic_lock_hold_seconds", "Time a lock was held, by holder site",
+    ("lock", "site"), 1e-6, LATENCY_BOUNDS
+)
+
+HISTOGRAMS = (HTTP_REQUEST_SECONDS, HTTP_RESPONSE_BYTES, JSON_ENCODE_SECONDS,
+              ACTION_SECONDS, AUTOSAVE_SECONDS, AUTOSAVE_BYTES,
+              LOCK_WAIT_SECONDS, LOCK_HOLD_SECONDS)
+
+
+def render_metrics(gauges=()):
+    """Get every metric in Prometheus text format, with some extra gauges first"""
+    lines = render_gauges(gauges)
+    for family in HISTOGRAMS:
+        lines += family.render()
+    return "\n".join(lines) + "\n"
+
+
+def get_metrics_summary():
+    """Get a quick JSON-friendly summary of every histogram, by metric name"""
+    return {family.name: family.summarize() for family in HISTOGRAMS}
+
+
+def reset_metrics():
+    """Forget every recorded value"""
+    for family in HISTOGRAMS:
+        family.clear()
@@ -0,0 +1,264 @@
+"""
+Navigation System Module for Cosmic Explorer
+Handles fuel costs and reachability queries over the star map
+"""
+
+import heapq
+import os
+import random
+import sys
+from collections import OrderedDict
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+
+# Region jump configuration
+JUMP_COSTS = {
+    "wormhole": 20,  # Jumping from a wormhole is cheaper
+    "default": 50
+}
+
+
+class NavigationManager:
+    """Manages fuel cost rules and route calculations"""
+
+    @staticmethod
+    def get_travel_fuel_cost(fuel_efficiency):
+        """Get the fuel cost of travelling between two connected nodes"""
+        return int(config.FUEL_CONSUMPTION_RATE * fuel_efficiency)
+
+    @staticmethod
+    def get_jump_fuel_cost(node_type):
+        """Get the fuel cost of jumping to another region from a node"""
+        return JUMP_COSTS.get(node_type, JUMP_COSTS["default"])
+
+    @staticmethod
+    def find_entry_node(region):
+        """Find the node a region jump arrives at, or None if it is not known yet"""
+        for node in region.nodes:
+            if node.discovered:
+                return node
+        return None
+
+    @staticmethod
+    def find_reachable(star_map, region_id, node_id, max_fuel, travel_cost):
+        """
+        Find every node and region reachable from a node within a fuel budget.
+
+        Runs a Dijkstra search bounded by max_fuel. Region jumps land on the
+        target region's entry node; regions without a discovered node are
+        reported as reachable, but their nodes are not expanded because the
+        arrival point is random.
+
+        Returns:
+            Dict with "nodes" and "regions" mapping ids to minimum fuel cost,
+            plus "unknown_entry" listing regions with a random arrival node
+        """
+        origin = star_map.get_node(node_id)
+        if not origin or origin.region_id != region_id:
+            return {"nodes": {}, "regions": {}, "unknown_entry": []}
+
+        # Costs are keyed by uid during the search
+        node_costs = {origin.uid: 0}
+        region_costs = {origin.region.uid: 0}
+        unknown_entry = set()
+        queue = [(0, origin.uid)]
+
+        while queue:
+            cost, current_uid = heapq.heappop(queue)
+            if cost > node_costs.get(current_uid, float("inf")):
+                continue
+
+            current_node = star_map.nodes[current_uid]
+
+            # Travel to connected nodes within the region
+            next_cost = cost + travel_cost
+            if next_cost <= max_fuel:
+                for neighbor in current_node.connections:
+                    if next_cost < node_costs.get(neighbor.uid, float("inf")):
+                        node_costs[neighbor.uid] = next_cost
+                        heapq.heappush(queue, (next_cost, neighbor.uid))
+
+            # Jump to connected regions
+            jump_cost = cost + NavigationManager.get_jump_fuel_cost(current_node.type)
+            if jump_cost > max_fuel:
+                continue
+
+            for target_region in current_node.region.connections:
+                if not target_region.nodes:
+                    continue
+
+                if jump_cost < region_costs.get(target_region.uid, float("inf")):
+                    region_costs[target_region.uid] = jump_cost
+
+                entry_node = NavigationManager.find_entry_node(target_region)
+                if not entry_node:
+                    unknown_entry.add(target_region.id)
+                    continue
+
+                if jump_cost < node_costs.get(entry_node.uid, float("inf")):
+                    node_costs[entry_node.uid] = jump_cost
+                    heapq.heappush(queue, (jump_cost, entry_node.uid))
+
+        # Regions are also reachable through any of their reachable nodes
+        for reached_uid, cost in node_costs.items():
+            reached_region_uid = star_map.nodes[reached_uid].region.uid
+            if cost < region_costs.get(reached_region_uid, float("inf")):
+                region_costs[reached_region_uid] = cost
+
+        return {
+            "nodes": {star_map.nodes[uid].id: cost for uid, cost in node_costs.items()},
+            "regions": {star_map.regions[uid].id: cost for uid, cost in region_costs.items()},
+            "unknown_entry": sorted(unknown_entry)
+        }
+
+
+class ReachabilityCache:
+    """
+    Caches reachability searches per (map version, origin node, fuel-efficiency bucket).
+
+    The bucket is the per-hop travel cost, so ship mods or pod augmentations that
+    change fuel_efficiency land in a new bucket and clear the cache. Each entry
+    remembers the fuel bound it was computed with and answers any query with
+    less fuel by filtering, since fuel only goes down between refuels.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.map_version = None
+        self.travel_cost = None
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop all cached searches"""
+        self.entries.clear()
+
+    def get_reachable(self, star_map, map_version, region_id, node_id, fuel, travel_cost):
+        """Get reachable nodes and regions within the given fuel"""
+        if map_version != self.map_version or travel_cost != self.travel_cost:
+            self.clear()
+            self.map_version = map_version
+            self.travel_cost = travel_cost
+
+        key = (map_version, node_id, travel_cost)
+        entry = self.entries.get(key)
+
+        if entry and entry["max_fuel"] >= fuel:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = {
+                "max_fuel": fuel,
+                "result": NavigationManager.find_reachable(
+                    star_map, region_id, node_id, fuel, travel_cost
+                )
+            }
+            self.entries[key] = entry
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        result = entry["result"]
+        if entry["max_fuel"] == fuel:
+            return result
+
+        return {
+            "nodes": {nid: cost for nid, cost in result["nodes"].items() if cost <= fuel},
+            "regions": {rid: cost for rid, cost in result["regions"].items() if cost <= fuel},
+            "unknown_entry": [
+                rid for rid in result["unknown_entry"] if result["regions"][rid] <= fuel
+            ]
+        }
+
+
+def web_navigation(session, target_node_id=None, target_region_id=None):
+    """Move a session to a connected node or region, returning (at repair, message, event type)"""
+    if not session.star_map:
+        # Fallback if no star map
+        at_repair_location = random.choice([True, False])
+        message = "Navigation system offline. Moving through unknown space."
+        return at_repair_location, message, None
+
+    location = session.get_current_location()
+    if not location:
+        return False, "Navigation error: Current location unknown.", None
+
+    current_region = location['region']
+    current_node = location['node']
+
+    # Get ship stats for fuel calculation
+    effective_stats = session.get_effective_stats()
+    fuel_efficiency = effective_stats.get("fuel_efficiency", 1.0)
+
+    # Navigation within region
+    if target_node_id and not target_region_id:
+        # Find target node
+        target_node = session.star_map.get_node(target_node_id)
+
+        if not target_node or target_node not in current_node.connections:
+            return False, "Cannot navigate to that location.", None
+
+        fuel_cost = NavigationManager.get_travel_fuel_cost(fuel_efficiency)
+        if session.player_stats['fuel'] < fuel_cost:
+            return False, "Insufficient fuel.", None
+
+        session.player_stats['fuel'] -= fuel_cost
+        session.current_node_id = target_node_id
+
+        # Random events during travel
+        if random.random() < target_node.danger_level:
+            damage = random.randint(5, 15)
+            session.player_stats['ship_condition'] -= damage
+            message = f"Danger encountered! Ship damaged (-{damage} HP). Arrived at {target_node.name}."
+            event_type = "danger"
+        else:
+            message = f"Traveled safely to {target_node.name}."
+            event_type = "navigation"
+
+        # Mark as visited
+        session.discover_node(target_node, visited=True)
+
+        return target_node.has_repair, message, event_type
+
+    # Region jump
+    elif target_region_id:
+        target_region = session.star_map.get_region(target_region_id)
+        if not target_region or target_region not in current_region.connections:
+            return False, "Cannot jump to that region from here.", None
+
+        fuel_cost = NavigationManager.get_jump_fuel_cost(current_node.type)
+        if session.player_stats['fuel'] < fuel_cost:
+            return False, "Insufficient fuel for region jump.", None
+
+        session.player_stats['fuel'] -= fuel_cost
+
+        # Find entry node
+        entry_node = NavigationManager.find_entry_node(target_region)
+
+        if not entry_node:
+            entry_node = random.choice(target_region.nodes)
+            session.discover_node(entry_node)
+            session.player_stats['wealth'] += 100
+            message = f"Discovered new region: {target_region.name}! (+100 wealth) Arrived at {entry_node.name}."
+        else:
+            message = f"Jumped to {target_region.name}. Arrived at {entry_node.name}."
+
+        session.current_region_id = target_region_id
+        session.current_node_id = entry_node.id
+
+        return entry_node.has_repair, message, "navigation"
+
+    # Auto-navigation (random choice)
+    else:
+        # Get available options
+        connected_nodes = current_node.connections
+
+        if connected_nodes:
+            target = random.choice(connected_nodes)
+            return web_navigation(session, target_node_id=target.id)
+        else:
+            return current_node.has_repair, "No available destinations.", "info"
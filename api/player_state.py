@@ -0,0 +1,186 @@
+"""
+Player State Module for Cosmic Explorer
+Typed player stats with change tracking and dict-style access
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from ship_system import SHIP_TYPES
+from pod_system import POD_CONFIG
+
+# Every stat a player has, in the order they appear in dict form
+PLAYER_STAT_FIELDS = (
+    "health",
+    "wealth",
+    "ship_condition",
+    "max_ship_condition",
+    "base_max_ship_condition",
+    "fuel",
+    "food",
+    "has_flight_pod",
+    "pod_hp",
+    "pod_max_hp",
+    "pod_augmentations",
+    "in_pod_mode",
+    "pod_animation_state",
+    "ship_type",
+    "ship_mods",
+    "inventory",
+    "cargo_capacity",
+    "used_cargo_space",
+    "temp_effects",
+    "in_combat",
+    "just_bought_pod"
+)
+
+# Stats holding lists/dicts that handlers change in place
+CONTAINER_FIELDS = frozenset({"pod_augmentations", "ship_mods", "inventory", "temp_effects"})
+
+# Dirty-tracking bit for each stat; one extra bit covers all unknown keys
+FIELD_BITS = {field: 1 << i for i, field in enumerate(PLAYER_STAT_FIELDS)}
+EXTRAS_BIT = 1 << len(PLAYER_STAT_FIELDS)
+
+
+class PlayerStats:
+    """
+    Player stats with one slot per stat.
+
+    Supports the dict operations the handlers use (indexing, get, in,
+    update, copy) so they can keep treating it like the old dict. Every
+    change sets the stat's bit in the `dirty` mask; containers are also
+    marked when read through the dict interface, since callers may change
+    them in place. Keys that are not known stats (e.g. from old saves) are
+    kept in `extras`, which is only created when needed.
+    """
+
+    __slots__ = PLAYER_STAT_FIELDS + ("extras", "dirty")
+
+    def __init__(self, **stats):
+        object.__setattr__(self, "extras", None)
+        object.__setattr__(self, "dirty", 0)
+
+        # Starting values for a new game
+        self.health = config.STARTING_HEALTH
+        self.wealth = config.STARTING_WEALTH
+        self.ship_condition = config.STARTING_SHIP_CONDITION
+        self.max_ship_condition = config.STARTING_SHIP_CONDITION
+        self.base_max_ship_condition = config.STARTING_SHIP_CONDITION
+        self.fuel = config.STARTING_FUEL
+        self.food = config.STARTING_FOOD
+        self.has_flight_pod = False
+        self.pod_hp = 0
+        self.pod_max_hp = POD_CONFIG["base_hp"]
+        self.pod_augmentations = []
+        self.in_pod_mode = False
+        self.pod_animation_state = "idle"
+
+        # Ship and inventory system
+        self.ship_type = "scout"
+        self.ship_mods = {"high": [], "mid": [], "low": [], "rig": []}
+        self.inventory = []
+        self.cargo_capacity = SHIP_TYPES["scout"]["cargo_capacity"]
+        self.used_cargo_space = 0
+
+        # Temporary effects: list of {effect_type, value, duration}
+        self.temp_effects = []
+
+        # Transient flags
+        self.in_combat = False
+        self.just_bought_pod = False
+
+        self.update(stats)
+        object.__setattr__(self, "dirty", 0)
+
+    def __setattr__(self, name, value):
+        bit = FIELD_BITS.get(name)
+        if bit is not None:
+            if name in CONTAINER_FIELDS or getattr(self, name, None) != value:
+                object.__setattr__(self, "dirty", self.dirty | bit)
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        bit = FIELD_BITS.get(key)
+        if bit is not None:
+            if key in CONTAINER_FIELDS:
+                object.__setattr__(self, "dirty", self.dirty | bit)
+            return getattr(self, key)
+        if not self.extras:
+            raise KeyError(key)
+        value = self.extras[key]
+        if isinstance(value, (list, dict)):
+            object.__setattr__(self, "dirty", self.dirty | EXTRAS_BIT)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in FIELD_BITS:
+            setattr(self, key, value)
+            return
+        if self.extras is None:
+            object.__setattr__(self, "extras", {})
+        self.extras[key] = value
+        object.__setattr__(self, "dirty", self.dirty | EXTRAS_BIT)
+
+    def __contains__(self, key):
+        return key in FIELD_BITS or bool(self.extras) and key in self.extras
+
+    def __iter__(self):
+        yield from PLAYER_STAT_FIELDS
+        if self.extras:
+            yield from self.extras
+
+    def __len__(self):
+        return len(PLAYER_STAT_FIELDS) + len(self.extras or ())
+
+    def get(self, key, default=None):
+        """Get a stat, or default if it is not set"""
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def update(self, stats):
+        """Set several stats from a dict"""
+        for key, value in stats.items():
+            self[key] = value
+
+    def copy(self):
+        """Get a shallow dict copy, as dict.copy() would"""
+        return self.to_dict()
+
+    def restore(self, stats):
+        """Reset every stat to a to_dict() snapshot, dropping extras it does not have"""
+        extras = {key: value for key, value in stats.items() if key not in FIELD_BITS}
+        if extras != (self.extras or {}):
+            object.__setattr__(self, "dirty", self.dirty | EXTRAS_BIT)
+        object.__setattr__(self, "extras", extras or None)
+        for field in PLAYER_STAT_FIELDS:
+            setattr(self, field, stats[field])
+
+    def to_dict(self):
+        """Convert to the dict format used by the client and save files"""
+        stats = {field: getattr(self, field) for field in PLAYER_STAT_FIELDS}
+        if self.extras:
+            stats.update(self.extras)
+        return stats
+
+    def pop_dirty(self):
+        """Get the names of stats changed since the last call and reset tracking"""
+        dirty = self.dirty
+        object.__setattr__(self, "dirty", 0)
+        if not dirty:
+            return set()
+
+        changed = {field for field, bit in FIELD_BITS.items() if dirty & bit}
+        if dirty & EXTRAS_BIT:
+            changed.update(self.extras or ())
+        return changed
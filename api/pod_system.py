@@ -3,6 +3,8 @@ Pod System Module for Cosmic Explorer
 Handles escape pod functionality, augmentations, and pod mode mechanics
 """
 
+from loadout_memo import POD_EFFECTS_MEMO, get_pod_effects_key
+
 # Pod augmentation definitions
 POD_AUGMENTATIONS = {
     "shield_boost": {
@@ -78,6 +80,7 @@ POD_CONFIG = {
     "max_augmentations": 4,
     "damage_chance": 0.3,  # Chance of taking damage during pod travel
     "base_damage": 10,
+    "distress_rescue_chance": 0.2,  # Chance a distress call brings a tow to safety
     "new_ship_cost": 400
 }
 
@@ -195,26 +198,11 @@ class PodManager:
         preserved_cargo = []
         if "cargo_module" in player_stats.get("pod_augmentations", []):
             # Import here to avoid circular dependency
-            from inventory_system import ITEM_TYPES
-            
-            # Sort items by value
-            valuable_items = sorted(
-                player_stats.get("inventory", []),
-                key=lambda x: ITEM_TYPES.get(x["item_id"], {}).get("base_value", 0) * x["quantity"],
-                reverse=True
-            )
+            from cargo_planner import select_cargo
             
-            # Save what we can
+            # Save the most valuable cargo that fits, splitting stacks if needed
             pod_capacity = POD_AUGMENTATIONS["cargo_module"]["effect"]["cargo_preservation"]
-            used_space = 0
-            
-            for item in valuable_items:
-                item_info = ITEM_TYPES.get(item["item_id"], {})
-                item_weight = item_info.get("weight", 0) * item["quantity"]
-                
-                if used_space + item_weight <= pod_capacity:
-                    preserved_cargo.append(item)
-                    used_space += item_weight
+            preserved_cargo = select_cargo(player_stats.get("inventory", []), pod_capacity)
         
         # Update inventory
         player_stats["inventory"] = preserved_cargo
@@ -259,6 +247,20 @@ class PodManager:
             player_stats["pod_animation_state"] = "active"
             return True, "Pod holding steady.", 0
     
+    @staticmethod
+    def roll_distress_rescue(player_stats):
+        """Roll whether a distress signal sent from the pod is answered"""
+        import random
+        
+        rescue_chance = POD_CONFIG["distress_rescue_chance"]
+        
+        # A distress beacon boosts the signal
+        if "distress_beacon" in player_stats.get("pod_augmentations", []):
+            rescue_chance = max(rescue_chance,
+                                POD_AUGMENTATIONS["distress_beacon"]["effect"]["rescue_chance"])
+        
+        return random.random() < rescue_chance
+    
     @staticmethod
     def can_buy_new_ship(player_stats):
         """Check if player can buy a new ship while in pod"""
@@ -288,6 +290,12 @@ class PodManager:
     @staticmethod
     def get_pod_effects(augmentations):
         """Get combined effects of all pod augmentations"""
+        key = get_pod_effects_key(augmentations)
+        return dict(POD_EFFECTS_MEMO.get(key, PodManager._compute_pod_effects))
+    
+    @staticmethod
+    def _compute_pod_effects(augmentations):
+        """Combine the effects of a get_pod_effects_key signature"""
         effects = {
             "max_ship_condition": 0,
             "scan_multiplier": 1,
@@ -309,25 +317,13 @@ class PodManager:
                         # Percentage effects (don't stack beyond 1.0)
                         effects[effect] = min(effects[effect] + value, 1.0)
                     else:
-                        # Additive effects
-                        effects[effect] += value
+                        # Additive effects, including ones applied when installed
+                        effects[effect] = effects.get(effect, 0) + value
         
         return effects
     
     @staticmethod
     def get_available_augmentations(installed_augmentations):
-        """Get augmentations available for installation"""
-        available = {}
-        installed_slots = set()
-        
-        # Get installed slots
-        for aug_id in installed_augmentations:
-            if aug_id in POD_AUGMENTATIONS:
-                installed_slots.add(POD_AUGMENTATIONS[aug_id].get("slot"))
-        
-        # Filter available augmentations
-        for aug_id, aug_info in POD_AUGMENTATIONS.items():
-            if aug_id not in installed_augmentations and aug_info.get("slot") not in installed_slots:
-                available[aug_id] = aug_info
-        
-        return available
+        """Get augmentations available for installation (a shared dict; do not modify)"""
+        from catalog import get_available_augmentations
+        return get_available_augmentations(frozenset(installed_augmentations))
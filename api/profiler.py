@@ -0,0 +1,130 @@
+"""
+Profiler Module for Cosmic Explorer
+Whole-process stack sampling and per-request cProfile captures for the debug endpoints
+"""
+
+import cProfile
+import io
+import itertools
+import marshal
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+# Longest whole-process profile one request may ask for, in seconds
+MAX_PROFILE_SECONDS = 60
+
+# Seconds between stack samples; 200 samples a second
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Per-request profiles kept for download, oldest dropped first
+MAX_REQUEST_PROFILES = 20
+
+# Functions listed in the text form of a request profile
+REQUEST_PROFILE_TEXT_LINES = 40
+
+
+def get_frame_label(frame):
+    """Get a frame's file and function, as one collapsed-stack entry"""
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def collapse_stack(frame):
+    """Get a thread's stack as outermost-first labels joined by semicolons"""
+    labels = []
+    while frame is not None:
+        labels.append(get_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Samples the stack of every thread at a fixed interval from its own thread.
+
+    Counts identical stacks, prefixed with the thread's name, for the
+    collapsed-stack format that flamegraph.pl and speedscope read. The
+    threads in exclude_idents (such as the one waiting for the result) are
+    skipped.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL, exclude_idents=()):
+        self.interval = interval
+        self.exclude_idents = set(exclude_idents)
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+
+    def get_collapsed(self):
+        """Get 'thread;outer;...;inner count' lines, most frequent first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _sample(self):
+        own_ident = threading.get_ident()
+        while not self.stopping.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident or ident in self.exclude_idents:
+                    continue
+                name = names.get(ident, f"thread-{ident}")
+                self.stacks[f"{name};{collapse_stack(frame)}"] += 1
+            self.samples += 1
+
+
+class RequestProfiles:
+    """The most recent per-request cProfile captures, by id"""
+
+    def __init__(self, max_entries=MAX_REQUEST_PROFILES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def add(self, profile, label):
+        """Store a finished profile and get its id"""
+        profile.create_stats()
+        with self.lock:
+            profile_id = str(next(self.ids))
+            self.entries[profile_id] = (label, profile.stats)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return profile_id
+
+    def get_text(self, profile_id):
+        """Get a profile as a pstats report sorted by cumulative time, or None"""
+        entry = self.entries.get(profile_id)
+        if entry is None:
+            return None
+        label, stats = entry
+        output = io.StringIO()
+        report = pstats.Stats(stream=output)
+        report.stats = stats
+        report.get_top_level_stats()
+        report.sort_stats("cumulative").print_stats(REQUEST_PROFILE_TEXT_LINES)
+        return f"{label}\n{output.getvalue()}"
+
+    def get_pstats(self, profile_id):
+        """Get a profile in the binary format pstats.Stats and snakeviz load, or None"""
+        entry = self.entries.get(profile_id)
+        return marshal.dumps(entry[1]) if entry else None
+
+
+def start_request_profile():
+    """Start profiling the current thread, or get None if another profiler is running"""
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        return None
+    return profile
@@ -0,0 +1,145 @@
+"""
+Sampling Module for Cosmic Explorer
+Precompiled alias tables for encounter, loot and drop rolls
+"""
+
+import os
+import random
+import sys
+from functools import lru_cache
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_system import ITEM_TYPES
+from catalog import CATALOG
+
+# Danger levels are rounded to this step before picking an encounter table
+ENCOUNTER_DANGER_STEP = 0.01
+
+# Drop tables enumerate every subset of entries, so keep them small
+MAX_DROP_TABLE_ENTRIES = 12
+
+
+class AliasTable:
+    """
+    Draws from a fixed discrete distribution in O(1) (Vose's alias method).
+
+    Each of the n columns holds its own outcome with probability
+    `probabilities[i]` and its alias otherwise, so a draw picks a column and
+    a side with a single random number.
+    """
+
+    __slots__ = ("outcomes", "probabilities", "aliases")
+
+    def __init__(self, outcomes, weights):
+        outcomes = tuple(outcomes)
+        weights = [float(weight) for weight in weights]
+        total = sum(weights)
+        if not outcomes or len(outcomes) != len(weights) or total <= 0:
+            raise ValueError("An alias table needs matching outcomes and a positive total weight")
+
+        count = len(outcomes)
+        scaled = [weight * count / total for weight in weights]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self.outcomes = outcomes
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(outcomes[i] for i in aliases)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def sample(self):
+        """Draw one outcome"""
+        position = random.random() * len(self.outcomes)
+        column = int(position)
+        if position - column < self.probabilities[column]:
+            return self.outcomes[column]
+        return self.aliases[column]
+
+    def get_distribution(self):
+        """Get {outcome: probability} as encoded in the table"""
+        share = 1.0 / len(self.outcomes)
+        distribution = dict.fromkeys(self.outcomes, 0.0)
+        for outcome, probability, alias in zip(self.outcomes, self.probabilities, self.aliases):
+            distribution[outcome] += probability * share
+            distribution[alias] += (1.0 - probability) * share
+        return distribution
+
+
+def get_encounter_weights(danger_level, location_type=None):
+    """Get the relative chance of meeting each enemy type"""
+    return {
+        "pirate_scout": 1.0 - danger_level * 0.5,
+        "pirate_raider": danger_level,
+        "alien_drone": 0.3 if location_type == "ancient_ruins" else 0.1,
+        "space_kraken": danger_level * 0.3 if location_type == "nebula" else 0.05,
+        "rogue_ai_ship": danger_level * 0.4
+    }
+
+
+@lru_cache(maxsize=None)
+def _build_encounter_table(danger_bucket, location_type):
+    """Build the encounter table for one danger bucket and location type"""
+    weights = get_encounter_weights(danger_bucket * ENCOUNTER_DANGER_STEP, location_type)
+    return AliasTable(weights.keys(), weights.values())
+
+
+def get_encounter_table(danger_level, location_type=None):
+    """Get the enemy type table for a danger level, rounded to ENCOUNTER_DANGER_STEP"""
+    return _build_encounter_table(round(danger_level / ENCOUNTER_DANGER_STEP), location_type)
+
+
+@lru_cache(maxsize=None)
+def get_loot_table(category=None, value_range=(10, 200)):
+    """
+    Get a uniform table of item ids for random loot, or None if nothing fits.
+
+    Quest items are never loot; `value_range` bounds the item's base value
+    and must be a tuple so it can key the cache.
+    """
+    eligible = [
+        item_id for item_id in CATALOG.get_items_in_value_range(*value_range)
+        if ITEM_TYPES[item_id]["category"] != "quest"
+        and (not category or ITEM_TYPES[item_id]["category"] == category)
+    ]
+    if not eligible:
+        return None
+    return AliasTable(eligible, [1.0] * len(eligible))
+
+
+@lru_cache(maxsize=None)
+def get_drop_table(chances, scale=1.0):
+    """
+    Get a table of which entries drop when each is rolled independently.
+
+    Entry i drops with chance `chances[i] * scale` (capped at 1). Outcomes
+    are tuples of dropped entry indices in table order, so one draw replaces
+    a roll per entry. `chances` must be a tuple so it can key the cache.
+    """
+    if len(chances) > MAX_DROP_TABLE_ENTRIES:
+        raise ValueError(f"Drop tables support at most {MAX_DROP_TABLE_ENTRIES} entries")
+
+    odds = [min(1.0, max(0.0, chance * scale)) for chance in chances]
+    outcomes = []
+    weights = []
+    for mask in range(1 << len(odds)):
+        weight = 1.0
+        for index, chance in enumerate(odds):
+            weight *= chance if mask & (1 << index) else 1.0 - chance
+        if weight > 0:
+            outcomes.append(tuple(i for i in range(len(odds)) if mask & (1 << i)))
+            weights.append(weight)
+    return AliasTable(outcomes, weights)
@@ -3,7 +3,10 @@ Session Manager Module for Cosmic Explorer
 Handles game session state and persistence
 """
 
+import copy
+import hashlib
 import json
+import logging
 import os
 import sys
 from datetime import datetime
@@ -12,51 +15,49 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import config
-from regions import generate_new_star_map
 from ship_system import SHIP_TYPES, ShipManager
 from inventory_system import InventoryManager
-from pod_system import POD_CONFIG, PodManager
+from pod_system import PodManager
+from combat_system import CombatManager
+from navigation_system import ReachabilityCache
+from star_map_model import StarMap
+from player_state import PlayerStats
+from star_map_index import StarMapIndex
+from map_tiles import MapTileIndex
+from map_search import MapSearchIndex
+from memory_accounting import get_session_memory_report
+from tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Session attributes actions may change, captured by create_checkpoint
+CHECKPOINT_ATTRIBUTES = (
+    "active_quest", "completed_quests", "turn_count", "at_repair_location", "game_over",
+    "victory", "current_event", "available_choices", "current_region_id", "current_node_id",
+    "statistics"
+)
+
+# Session attributes broken out in memory reports; inventory is charged before the rest of
+# player_stats, and combat_manager holds the combat log
+MEMORY_REPORT_COMPONENTS = (
+    "star_map", "map_index", "map_tiles", "map_search", "reachability_cache",
+    "player_stats.inventory", "player_stats", "combat_manager", "statistics"
+)
+
+# Directory under config.SAVE_DIR_PATH holding hibernated sessions
+HIBERNATION_DIR = "hibernated"
 
 
 class GameSession:
     """Represents a single game session with all player state"""
     
-    def __init__(self, session_id):
+    def __init__(self, session_id, generate_map=True):
         self.session_id = session_id
         self.created_at = datetime.now()
         self.last_activity = datetime.now()
         
         # Initialize player stats
-        self.player_stats = {
-            "health": config.STARTING_HEALTH,
-            "wealth": config.STARTING_WEALTH,
-            "ship_condition": config.STARTING_SHIP_CONDITION,
-            "max_ship_condition": config.STARTING_SHIP_CONDITION,
-            "base_max_ship_condition": config.STARTING_SHIP_CONDITION,
-            "fuel": config.STARTING_FUEL,
-            "food": config.STARTING_FOOD,
-            "has_flight_pod": False,
-            "pod_hp": 0,
-            "pod_max_hp": POD_CONFIG["base_hp"],
-            "pod_augmentations": [],
-            "in_pod_mode": False,
-            "pod_animation_state": "idle",
-            
-            # Ship and inventory system
-            "ship_type": "scout",
-            "ship_mods": {
-                "high": [],
-                "mid": [],
-                "low": [],
-                "rig": []
-            },
-            "inventory": [],
-            "cargo_capacity": SHIP_TYPES["scout"]["cargo_capacity"],
-            "used_cargo_space": 0,
-            
-            # Temporary effects
-            "temp_effects": []  # List of {effect_type, value, duration}
-        }
+        self.player_stats = PlayerStats()
         
         # Game progress
         self.active_quest = None
@@ -67,11 +68,18 @@ class GameSession:
         self.victory = False
         self.current_event = None
         self.available_choices = []
-        
-        # Star map and navigation
-        self.star_map = generate_new_star_map()
-        self.current_region_id = self.star_map["current_region"]
-        self.current_node_id = self.star_map["current_node"]
+        self.combat_manager = CombatManager()  # Combat state belongs to this session only
+        
+        # Star map and navigation; skipped when the map is about to be loaded from a save
+        self.star_map = StarMap.generate() if generate_map else None
+        self.current_region_id = self.star_map.current_region if self.star_map else None
+        self.current_node_id = self.star_map.current_node if self.star_map else None
+        self.map_version = 0  # Bumped whenever the map or its discovered nodes change
+        self.reachability_cache = ReachabilityCache()
+        self.map_index = None  # Columnar mirror of star_map, built on first query
+        self.map_tiles = None  # Spatial grid for viewport queries, built on first query
+        self.map_search = None  # Name and type search index, built on first search
+        self.map_changes = None  # (node, discovered, visited) journal while a checkpoint is open
         
         # Statistics tracking
         self.statistics = {
@@ -84,29 +92,105 @@ class GameSession:
             "pod_uses": 0
         }
     
+    def mark_map_changed(self):
+        """Invalidate cached map queries after the star map changes"""
+        self.map_version += 1
+    
+    def get_map_index(self):
+        """Get the columnar star map index, building it if needed"""
+        if self.map_index is None and self.star_map:
+            self.map_index = StarMapIndex(self.star_map)
+        return self.map_index
+    
+    def get_map_tiles(self):
+        """Get the spatial tile index, building it if needed"""
+        if self.map_tiles is None and self.star_map:
+            self.map_tiles = MapTileIndex(self.star_map, self.get_map_index())
+        return self.map_tiles
+    
+    def get_map_search(self):
+        """Get the node name and type search index, building it if needed"""
+        if self.map_search is None and self.star_map:
+            self.map_search = MapSearchIndex(self.star_map)
+        return self.map_search
+    
+    def discover_node(self, node, visited=False):
+        """Mark a node as discovered (and optionally visited) in every map view"""
+        if self.map_changes is not None:
+            self.map_changes.append((node, node.discovered, node.visited))
+        changed = not node.discovered
+        node.discovered = True
+        if visited:
+            node.visited = True
+        
+        if self.map_index is not None:
+            self.map_index.update_node(node.id, discovered=True, visited=node.visited)
+        if changed:
+            self.mark_map_changed()
+    
+    def create_checkpoint(self):
+        """
+        Capture the state actions can change so they can be undone.
+        
+        Rather than copying the star map, node discoveries are journaled
+        until the checkpoint is restored or released.
+        """
+        self.map_changes = []
+        return {
+            "player_stats": copy.deepcopy(self.player_stats.to_dict()),
+            "combat": copy.deepcopy(self.combat_manager.to_dict()),
+            "attributes": {
+                name: copy.deepcopy(getattr(self, name)) for name in CHECKPOINT_ATTRIBUTES
+            }
+        }
+    
+    def restore_checkpoint(self, checkpoint):
+        """Undo every change made since create_checkpoint"""
+        self.player_stats.restore(checkpoint["player_stats"])
+        for name, value in checkpoint["attributes"].items():
+            setattr(self, name, value)
+        self.combat_manager.load_from_dict(checkpoint["combat"], self.player_stats)
+        
+        map_changes = self.map_changes or []
+        for node, discovered, visited in reversed(map_changes):
+            node.discovered = discovered
+            node.visited = visited
+            if self.map_index is not None:
+                self.map_index.update_node(node.id, discovered=discovered, visited=visited)
+        if map_changes:
+            self.mark_map_changed()
+        self.map_changes = None
+    
+    def release_checkpoint(self):
+        """Keep the changes made since create_checkpoint and stop journaling"""
+        self.map_changes = None
+    
     def update_activity(self):
         """Update last activity timestamp"""
         self.last_activity = datetime.now()
     
     def calculate_cargo_space(self):
         """Calculate used cargo space from inventory"""
-        self.player_stats["used_cargo_space"] = InventoryManager.calculate_cargo_space(
-            self.player_stats["inventory"]
+        # Read through attributes so recomputing does not mark the inventory dirty
+        self.player_stats.used_cargo_space = InventoryManager.calculate_cargo_space(
+            self.player_stats.inventory
         )
-        return self.player_stats["used_cargo_space"]
+        return self.player_stats.used_cargo_space
     
+    @traced("GameSession.get_effective_stats")
     def get_effective_stats(self):
         """Calculate effective stats including all modifications"""
         # Get base stats from ship manager
+        stats = self.player_stats
         effective_stats = ShipManager.calculate_effective_stats(
-            self.player_stats,
-            self.player_stats["ship_type"],
-            self.player_stats["ship_mods"]
+            stats,
+            stats.ship_type,
+            stats.ship_mods
         )
         
         # Apply pod augmentation effects if pod is equipped and not in use
-        if self.player_stats["has_flight_pod"] and not self.player_stats["in_pod_mode"]:
-            pod_effects = PodManager.get_pod_effects(self.player_stats["pod_augmentations"])
+        if stats.has_flight_pod and not stats.in_pod_mode:
+            pod_effects = PodManager.get_pod_effects(stats.pod_augmentations)
             
             # Apply pod effects
             if "max_ship_condition" in pod_effects:
@@ -119,19 +203,19 @@ class GameSession:
                 effective_stats["fuel_efficiency"] *= pod_effects["fuel_efficiency"]
         
         # Apply temporary effects
-        for effect in self.player_stats.get("temp_effects", []):
+        for effect in stats.temp_effects:
             if effect["duration"] > 0:
                 if effect["effect_type"] == "temp_hp":
                     effective_stats["max_hp"] += effect["value"]
         
         # Update calculated values
         effective_stats["max_ship_condition"] = effective_stats["max_hp"]
-        effective_stats["cargo_capacity"] = self.player_stats["cargo_capacity"] + \
-            effective_stats.get("cargo_capacity", 0) - SHIP_TYPES[self.player_stats["ship_type"]]["cargo_capacity"]
+        effective_stats["cargo_capacity"] = stats.cargo_capacity + \
+            effective_stats.get("cargo_capacity", 0) - SHIP_TYPES[stats.ship_type]["cargo_capacity"]
         effective_stats["used_cargo_space"] = self.calculate_cargo_space()
         
         # Merge with current stats
-        result = self.player_stats.copy()
+        result = stats.to_dict()
         result.update(effective_stats)
         
         return result
@@ -166,30 +250,47 @@ class GameSession:
         if not self.star_map:
             return None
         
-        current_region = self.star_map["regions"].get(self.current_region_id)
-        if not current_region:
-            return None
-        
-        current_node = None
-        for node in current_region["nodes"]:
-            if node["id"] == self.current_node_id:
-                current_node = node
-                break
-        
-        if not current_node:
+        current_node = self.star_map.get_node(self.current_node_id)
+        if not current_node or current_node.region_id != self.current_region_id:
             return None
         
         return {
-            "region": current_region,
+            "region": current_node.region,
             "node": current_node,
             "region_id": self.current_region_id,
             "node_id": self.current_node_id
         }
     
-    def to_dict(self):
+    def get_location_name(self):
+        """Get the human-readable name of the current location for save metadata"""
+        if not self.star_map:
+            return "Deep Space"
+    
+        location = self.get_current_location()
+        if location:
+            return f"{location['node'].name} ({location['region'].name})"
+    
+        region = self.star_map.get_region(self.current_region_id)
+        return region.name if region else "Unknown Space"
+    
+    def get_memory_report(self):
+        """Estimate the bytes held by each part of this session"""
+        return get_session_memory_report(self, MEMORY_REPORT_COMPONENTS)
+    
+    def get_memory_version(self):
+        """Get a value that changes whenever the memory this session holds may have changed"""
+        return (self.last_activity, self.map_version, self.map_index is None,
+                self.map_tiles is None, self.map_search is None, self.reachability_cache.misses)
+    
+    @traced("GameSession.to_dict")
+    def to_dict(self, effective_stats=None):
         """Convert session to dictionary for serialization"""
-        effective_stats = self.get_effective_stats()
+        if effective_stats is None:
+            effective_stats = self.get_effective_stats()
         location = self.get_current_location()
+        if location:
+            location = dict(location, region=location["region"].to_dict(),
+                            node=location["node"].to_dict())
         
         return {
             "session_id": self.session_id,
@@ -204,7 +305,7 @@ class GameSession:
             "victory": self.victory,
             "current_event": self.current_event,
             "available_choices": self.available_choices,
-            "star_map": self.star_map,
+            "star_map": self.star_map.to_dict() if self.star_map else None,
             "current_region_id": self.current_region_id,
             "current_node_id": self.current_node_id,
             "current_location": location,
@@ -212,17 +313,19 @@ class GameSession:
             "max_turns": config.MAX_TURNS
         }
     
+    @traced("GameSession.to_save_dict")
     def to_save_dict(self):
         """Convert session to minimal dictionary for save files"""
         return {
-            "player_stats": self.player_stats,
+            "player_stats": self.player_stats.to_dict(),
             "active_quest": self.active_quest,
             "completed_quests": self.completed_quests,
             "turn_count": self.turn_count,
             "at_repair_location": self.at_repair_location,
-            "star_map": self.star_map,
+            "star_map": self.star_map.to_dict() if self.star_map else None,
             "current_region_id": self.current_region_id,
             "current_node_id": self.current_node_id,
+            "combat": self.combat_manager.to_dict(),
             "statistics": self.statistics
         }
     
@@ -244,7 +347,12 @@ class GameSession:
             self.at_repair_location = save_data["at_repair_location"]
         
         if "star_map" in save_data:
-            self.star_map = save_data["star_map"]
+            star_map_data = save_data["star_map"]
+            self.star_map = StarMap.from_dict(star_map_data) if star_map_data else None
+            self.map_index = None
+            self.map_tiles = None
+            self.map_search = None
+            self.mark_map_changed()
         
         if "current_region_id" in save_data:
             self.current_region_id = save_data["current_region_id"]
@@ -255,10 +363,44 @@ class GameSession:
         if "statistics" in save_data:
             self.statistics.update(save_data["statistics"])
         
+        # Restore any fight in progress; older saves have no combat to resume
+        self.combat_manager.load_from_dict(save_data.get("combat"), self.player_stats)
+        if self.combat_manager.current_combat:
+            self.current_event = "combat"
+        else:
+            self.player_stats["in_combat"] = False
+        
         # Update repair location status based on current node
         location = self.get_current_location()
-        if location and location["node"]:
-            self.at_repair_location = location["node"].get("has_repair", False)
+        if location:
+            self.at_repair_location = location["node"].has_repair
+    
+    def to_hibernation_dict(self):
+        """Convert session to a save dictionary that also keeps in-memory only fields"""
+        data = self.to_save_dict()
+        data["session"] = {
+            "created_at": self.created_at.isoformat(),
+            "last_activity": self.last_activity.isoformat(),
+            "game_over": self.game_over,
+            "victory": self.victory,
+            "current_event": self.current_event,
+            "available_choices": self.available_choices
+        }
+        return data
+    
+    @classmethod
+    def from_hibernation_dict(cls, session_id, data):
+        """Rebuild a session written by to_hibernation_dict, without generating a map first"""
+        session = cls(session_id, generate_map=False)
+        session.load_from_dict(data)
+        fields = data["session"]
+        session.created_at = datetime.fromisoformat(fields["created_at"])
+        session.last_activity = datetime.fromisoformat(fields["last_activity"])
+        session.game_over = fields["game_over"]
+        session.victory = fields["victory"]
+        session.current_event = fields["current_event"]
+        session.available_choices = fields["available_choices"]
+        return session
     
     def save_to_file(self, filepath=None):
         """Save session to file"""
@@ -295,17 +437,29 @@ class GameSession:
 
 
 class SessionManager:
-    """Manages multiple game sessions"""
+    """
+    Manages multiple game sessions.
+    
+    With config.SESSION_MEMORY_BUDGET_MB set, sessions are hibernated to
+    disk whenever their estimated memory goes over it, least recently
+    active or largest first (config.SESSION_EVICTION_POLICY). A hibernated
+    session is loaded back the next time it is asked for.
+    """
     
     def __init__(self):
         self.sessions = {}
         self.max_sessions = 100  # Prevent memory issues
         self.session_timeout = 3600  # 1 hour in seconds
+        self.memory_reports = {}  # session_id -> (memory version, report), reused until stale
+        self.hibernated = {}  # session_id -> (file path, last activity) of sessions on disk
+        self.hibernations = 0
     
     def create_session(self, session_id, force_new=False):
         """Create a new game session"""
-        if not force_new and session_id in self.sessions:
-            return self.sessions[session_id]
+        if not force_new:
+            session = self.get_session(session_id)
+            if session:
+                return session
         
         # Check session limit
         if len(self.sessions) >= self.max_sessions:
@@ -313,16 +467,23 @@ class SessionManager:
         
         session = GameSession(session_id)
         self.sessions[session_id] = session
+        self.discard_hibernated(session_id)
+        self.enforce_memory_budget(keep=session_id)
         return session
     
     def get_session(self, session_id):
-        """Get an existing session"""
-        return self.sessions.get(session_id)
+        """Get an existing session, waking it if it was hibernated"""
+        session = self.sessions.get(session_id)
+        if session is None and session_id in self.hibernated:
+            session = self.wake_session(session_id)
+        return session
     
     def remove_session(self, session_id):
         """Remove a session"""
         if session_id in self.sessions:
             del self.sessions[session_id]
+        self.memory_reports.pop(session_id, None)
+        self.discard_hibernated(session_id)
     
     def cleanup_old_sessions(self):
         """Remove inactive sessions"""
@@ -334,6 +495,10 @@ class SessionManager:
             if time_diff > self.session_timeout:
                 to_remove.append(session_id)
         
+        for session_id, (_, last_activity) in self.hibernated.items():
+            if (current_time - last_activity).total_seconds() > self.session_timeout:
+                to_remove.append(session_id)
+        
         for session_id in to_remove:
             self.remove_session(session_id)
     
@@ -345,17 +510,128 @@ class SessionManager:
             except Exception as e:
                 print(f"Error saving session {session.session_id}: {e}")
     
+    def get_session_memory(self, session):
+        """Get a session's memory report, reusing the last one until the session changes"""
+        version = session.get_memory_version()
+        cached = self.memory_reports.get(session.session_id)
+        if cached is None or cached[0] != version:
+            cached = (version, session.get_memory_report())
+            self.memory_reports[session.session_id] = cached
+        return cached[1]
+    
+    def get_estimated_memory(self):
+        """Get the bytes held by sessions as of their last memory reports, without measuring"""
+        # Read without game_lock (by /metrics), so iterate over a snapshot
+        return sum(report["total_bytes"] for _, report in list(self.memory_reports.values()))
+    
+    def get_hibernation_path(self, session_id):
+        """Get the file a session hibernates to, named by a hash so any id is a safe name"""
+        digest = hashlib.sha256(str(session_id).encode()).hexdigest()[:32]
+        return os.path.join(config.SAVE_DIR_PATH, HIBERNATION_DIR, f"session_{digest}.json")
+    
+    def hibernate_session(self, session_id):
+        """Move a session to disk; it stays in memory if it cannot be written"""
+        session = self.sessions[session_id]
+        filepath = self.get_hibernation_path(session_id)
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                json.dump(session.to_hibernation_dict(), f, separators=(",", ":"))
+        except (OSError, TypeError, ValueError):
+            logger.exception("Error hibernating session %s", session_id)
+            return False
+        
+        del self.sessions[session_id]
+        self.memory_reports.pop(session_id, None)
+        self.hibernated[session_id] = (filepath, session.last_activity)
+        self.hibernations += 1
+        return True
+    
+    def wake_session(self, session_id):
+        """Load a hibernated session back into memory; it stays hibernated if it cannot be read"""
+        filepath, _ = self.hibernated[session_id]
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+            session = GameSession.from_hibernation_dict(session_id, data)
+        except Exception:
+            logger.exception("Error waking session %s from %s", session_id, filepath)
+            return None
+        
+        self.discard_hibernated(session_id)
+        self.sessions[session_id] = session
+        self.enforce_memory_budget(keep=session_id)
+        return session
+    
+    def discard_hibernated(self, session_id):
+        """Forget a hibernated session and delete its file"""
+        entry = self.hibernated.pop(session_id, None)
+        if entry and os.path.exists(entry[0]):
+            os.remove(entry[0])
+    
+    def enforce_memory_budget(self, keep=None, refresh=False):
+        """
+        Hibernate sessions until the rest fit in config.SESSION_MEMORY_BUDGET_MB.
+        
+        The session `keep` (the one being created or woken) is never
+        hibernated. Sizes are deep-size estimates of session objects, not
+        process memory. Sessions are judged by their last memory report,
+        and only those picked for hibernation are measured again; with
+        refresh every session is measured first. Returns the ids of the
+        hibernated sessions.
+        """
+        budget = int(config.SESSION_MEMORY_BUDGET_MB * 1024 * 1024)
+        if budget <= 0:
+            return []
+        
+        sizes = {}
+        for sid, session in self.sessions.items():
+            cached = self.memory_reports.get(sid)
+            report = cached[1] if cached and not refresh else self.get_session_memory(session)
+            sizes[sid] = report["total_bytes"]
+        total = sum(sizes.values())
+        if total <= budget:
+            return []
+        
+        if config.SESSION_EVICTION_POLICY == "largest":
+            order = sorted(sizes, key=sizes.get, reverse=True)
+        else:
+            order = sorted(sizes, key=lambda sid: self.sessions[sid].last_activity)
+        
+        hibernated = []
+        for session_id in order:
+            if total <= budget:
+                break
+            if session_id == keep:
+                continue
+            size = self.get_session_memory(self.sessions[session_id])["total_bytes"]
+            total += size - sizes[session_id]
+            if total > budget and self.hibernate_session(session_id):
+                total -= size
+                hibernated.append(session_id)
+        return hibernated
+    
     def get_session_stats(self):
-        """Get statistics about active sessions"""
+        """Get statistics about active sessions, with each one's memory by component"""
+        memory = {sid: self.get_session_memory(session) for sid, session in self.sessions.items()}
         return {
             "active_sessions": len(self.sessions),
             "total_players": len(self.sessions),
+            "memory": {
+                "total_bytes": sum(report["total_bytes"] for report in memory.values()),
+                "budget_bytes": int(config.SESSION_MEMORY_BUDGET_MB * 1024 * 1024),
+                "eviction_policy": config.SESSION_EVICTION_POLICY,
+                "hibernated_sessions": len(self.hibernated),
+                "hibernations": self.hibernations
+            },
             "sessions": {
                 sid: {
                     "turn_count": session.turn_count,
                     "wealth": session.player_stats["wealth"],
                     "game_over": session.game_over,
-                    "victory": session.victory
+                    "victory": session.victory,
+                    "memory_bytes": memory[sid]["total_bytes"],
+                    "memory": memory[sid]["components"]
                 }
                 for sid, session in self.sessions.items()
             }
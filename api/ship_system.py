@@ -3,6 +3,8 @@ Ship System Module for Cosmic Explorer
 Handles all ship-related functionality including types, modifications, and stats
 """
 
+from loadout_memo import SHIP_STATS_MEMO, get_ship_stats_key
+
 # Ship type definitions with their base stats and characteristics
 SHIP_TYPES = {
     "scout": {
@@ -71,6 +73,9 @@ SHIP_TYPES = {
     }
 }
 
+# Mod effects that multiply the ship's base value; all others add to it
+MULTIPLICATIVE_MOD_EFFECTS = ("fuel_efficiency", "mining_yield", "scan_bonus")
+
 # Ship modification definitions organized by slot type
 SHIP_MODS = {
     # High slot mods (weapons, mining, utilities)
@@ -253,6 +258,13 @@ class ShipManager:
     @staticmethod
     def calculate_effective_stats(base_stats, ship_type, equipped_mods):
         """Calculate effective ship stats including all modifications"""
+        key = get_ship_stats_key(ship_type, equipped_mods)
+        return dict(SHIP_STATS_MEMO.get(key, ShipManager._compute_effective_stats))
+    
+    @staticmethod
+    def _compute_effective_stats(loadout_key):
+        """Calculate effective stats for a get_ship_stats_key signature"""
+        ship_type, mod_ids = loadout_key
         ship_info = SHIP_TYPES.get(ship_type, SHIP_TYPES["scout"])
         
         # Start with base ship stats
@@ -270,20 +282,19 @@ class ShipManager:
         }
         
         # Apply mod effects
-        for slot_type, mods in equipped_mods.items():
-            for mod_id in mods:
-                if mod_id in SHIP_MODS:
-                    mod_effects = SHIP_MODS[mod_id].get("effects", {})
-                    
-                    # Apply each effect
-                    for effect, value in mod_effects.items():
-                        if effect in effective_stats:
-                            if effect in ["fuel_efficiency", "mining_yield", "scan_bonus"]:
-                                # Multiplicative effects
-                                effective_stats[effect] *= value
-                            else:
-                                # Additive effects
-                                effective_stats[effect] += value
+        for mod_id in mod_ids:
+            if mod_id in SHIP_MODS:
+                mod_effects = SHIP_MODS[mod_id].get("effects", {})
+                
+                # Apply each effect
+                for effect, value in mod_effects.items():
+                    if effect in effective_stats:
+                        if effect in MULTIPLICATIVE_MOD_EFFECTS:
+                            # Multiplicative effects
+                            effective_stats[effect] *= value
+                        else:
+                            # Additive effects
+                            effective_stats[effect] += value
         
         return effective_stats
     
@@ -318,12 +329,9 @@ class ShipManager:
     
     @staticmethod
     def get_available_mods_for_slot(slot_type):
-        """Get all modifications available for a specific slot type"""
-        return {
-            mod_id: mod_info 
-            for mod_id, mod_info in SHIP_MODS.items() 
-            if mod_info["slot"] == slot_type
-        }
+        """Get all modifications for a slot type (a shared dict; do not modify)"""
+        from catalog import CATALOG
+        return CATALOG.mods_by_slot.get(slot_type, {})
     
     @staticmethod
     def purchase_ship(player_stats, ship_type):
@@ -0,0 +1,175 @@
+"""
+Star Map Index Module for Cosmic Explorer
+Mirrors the star map into columnar NumPy arrays for vectorized queries
+"""
+
+import os
+import sys
+from collections import deque
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regions import NodeType
+
+# Stable integer codes for node types
+NODE_TYPE_CODES = {node_type: code for code, node_type in enumerate(NodeType.get_all_types())}
+
+# Node types where an escape pod can dock and buy a new ship
+SAFE_HARBOR_TYPES = [NodeType.PLANET, NodeType.STATION]
+
+
+class StarMapIndex:
+    """
+    Columnar mirror of a star map.
+
+    Every node gets a row (its uid in the StarMap model); positions are
+    absolute (region position plus the node's offset within the region).
+    Connections are stored in CSR form so neighbour lookups are array
+    slices. Flags that change during play (discovered, visited) are kept in
+    sync through update_node().
+    """
+
+    def __init__(self, star_map):
+        # Rows are the model's node uids, so id lookups share its tables
+        self.nodes = star_map.nodes
+        self.node_ids = [node.id for node in star_map.nodes]
+        self.node_rows = star_map.node_uids
+        self.region_ids = [region.id for region in star_map.regions]
+        self.region_rows = star_map.region_uids
+
+        nodes = star_map.nodes
+        self.positions = np.array(
+            [node.absolute_position for node in nodes], dtype=np.float64
+        ).reshape(-1, 2)
+        self.type_codes = np.array(
+            [NODE_TYPE_CODES.get(node.type, -1) for node in nodes], dtype=np.int8
+        )
+        self.has_repair = np.array([node.has_repair for node in nodes], dtype=bool)
+        self.has_trade = np.array([node.has_trade for node in nodes], dtype=bool)
+        self.danger_level = np.array([node.danger_level for node in nodes], dtype=np.float32)
+        self.region_index = np.array([node.region.uid for node in nodes], dtype=np.int32)
+        self.discovered = np.array([node.discovered for node in nodes], dtype=bool)
+        self.visited = np.array([node.visited for node in nodes], dtype=bool)
+
+        # Connections in CSR form: neighbours of row i are
+        # neighbor_rows[neighbor_offsets[i]:neighbor_offsets[i + 1]]
+        neighbor_rows = []
+        offsets = [0]
+        for node in nodes:
+            neighbor_rows.extend(neighbor.uid for neighbor in node.connections)
+            offsets.append(len(neighbor_rows))
+        self.neighbor_rows = np.array(neighbor_rows, dtype=np.int32)
+        self.neighbor_offsets = np.array(offsets, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def update_node(self, node_id, **flags):
+        """Sync changed node flags (discovered, visited) from the model"""
+        row = self.node_rows.get(node_id)
+        if row is None:
+            return
+        for flag, value in flags.items():
+            if flag in ("discovered", "visited"):
+                getattr(self, flag)[row] = value
+
+    def get_neighbors(self, node_id):
+        """Get the rows of all nodes connected to a node"""
+        return self._neighbor_slice(self.node_rows[node_id])
+
+    def _neighbor_slice(self, row):
+        return self.neighbor_rows[self.neighbor_offsets[row]:self.neighbor_offsets[row + 1]]
+
+    def build_mask(self, node_types=None, has_repair=None, has_trade=None, region_id=None,
+                   discovered=None, max_danger=None):
+        """Build a boolean row mask from optional filters"""
+        mask = np.ones(len(self.node_ids), dtype=bool)
+
+        if node_types is not None:
+            codes = [NODE_TYPE_CODES[t] for t in node_types if t in NODE_TYPE_CODES]
+            mask &= np.isin(self.type_codes, codes)
+        if has_repair is not None:
+            mask &= self.has_repair == has_repair
+        if has_trade is not None:
+            mask &= self.has_trade == has_trade
+        if region_id is not None:
+            mask &= self.region_index == self.region_rows.get(region_id, -1)
+        if discovered is not None:
+            mask &= self.discovered == discovered
+        if max_danger is not None:
+            mask &= self.danger_level <= max_danger
+
+        return mask
+
+    def get_distances(self, node_id):
+        """Get the straight-line distance from a node to every node"""
+        origin = self.positions[self.node_rows[node_id]]
+        return np.hypot(*(self.positions - origin).T)
+
+    def find_nearest(self, node_id, include_origin=False, **filters):
+        """Find the nearest node matching the filters, or None"""
+        mask = self.build_mask(**filters)
+        if not include_origin:
+            mask[self.node_rows[node_id]] = False
+        if not mask.any():
+            return None
+
+        distances = np.where(mask, self.get_distances(node_id), np.inf)
+        return self.node_ids[int(np.argmin(distances))]
+
+    def find_within(self, node_id, distance, **filters):
+        """Find all nodes matching the filters within a distance, nearest first"""
+        distances = self.get_distances(node_id)
+        mask = self.build_mask(**filters) & (distances <= distance)
+        mask[self.node_rows[node_id]] = False
+
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(distances[rows], kind="stable")]
+        return [(self.node_ids[row], float(distances[row])) for row in rows]
+
+    def find_safest_neighbor(self, node_id):
+        """Find the connected node with the lowest danger level, or None"""
+        neighbors = self.get_neighbors(node_id)
+        if len(neighbors) == 0:
+            return None
+        return self.node_ids[int(neighbors[np.argmin(self.danger_level[neighbors])])]
+
+    def find_next_hop(self, node_id, target_node_id):
+        """Get the first node on the shortest connection path to a target, or None"""
+        origin = self.node_rows[node_id]
+        target = self.node_rows[target_node_id]
+        if origin == target:
+            return None
+
+        previous = {origin: None}
+        queue = deque([origin])
+        while queue:
+            row = queue.popleft()
+            if row == target:
+                break
+            for neighbor in self._neighbor_slice(row).tolist():
+                if neighbor not in previous:
+                    previous[neighbor] = row
+                    queue.append(neighbor)
+
+        if target not in previous:
+            return None
+
+        row = target
+        while previous[row] != origin:
+            row = previous[row]
+        return self.node_ids[row]
+
+    def find_nearest_safe_harbor(self, node_id):
+        """Find the nearest planet or station with repairs in the node's region"""
+        region_id = self.region_ids[self.region_index[self.node_rows[node_id]]]
+        return self.find_nearest(
+            node_id,
+            include_origin=True,
+            node_types=SAFE_HARBOR_TYPES,
+            has_repair=True,
+            region_id=region_id
+        )
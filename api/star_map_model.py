@@ -0,0 +1,231 @@
+"""
+Star Map Model Module for Cosmic Explorer
+Typed in-memory star map; converted to the dict format only at the API boundary
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regions import Node, Region, generate_new_star_map
+
+# Shared placeholder for nodes without special items or quests
+EMPTY = ()
+
+
+class MapNode:
+    """A location within a region"""
+
+    __slots__ = (
+        "uid", "id", "type", "name", "region", "x", "y", "connections", "config",
+        "discovered", "visited", "has_repair", "has_trade", "special_items", "quests"
+    )
+
+    def __init__(self, uid, node_id, node_type, name, region, position):
+        self.uid = uid  # Row of this node in StarMap.nodes
+        self.id = node_id
+        self.type = sys.intern(node_type)
+        self.name = sys.intern(name)  # Generated names repeat, so share them
+        self.region = region
+        self.x, self.y = position  # Relative to the region position
+        self.connections = EMPTY  # Tuple of connected MapNodes in the same region
+        self.config = Node.NODE_CONFIGS[node_type]
+        self.discovered = False
+        self.visited = False
+        self.has_repair = False
+        self.has_trade = False
+        self.special_items = EMPTY
+        self.quests = EMPTY
+
+    @property
+    def region_id(self):
+        return self.region.id
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+    @property
+    def absolute_position(self):
+        return (self.region.x + self.x, self.region.y + self.y)
+
+    @property
+    def danger_level(self):
+        return self.config["danger_events"]
+
+    @property
+    def connection_ids(self):
+        return [node.id for node in self.connections]
+
+    def to_dict(self):
+        """Convert to the star map dict format"""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "region_id": self.region.id,
+            "name": self.name,
+            "position": (self.x, self.y),
+            "connections": self.connection_ids,
+            "discovered": self.discovered,
+            "visited": self.visited,
+            "has_repair": self.has_repair,
+            "has_trade": self.has_trade,
+            "danger_level": self.danger_level,
+            "special_items": list(self.special_items),
+            "quests": list(self.quests)
+        }
+
+
+class MapRegion:
+    """A region of space holding a group of nodes"""
+
+    __slots__ = ("uid", "id", "type", "name", "x", "y", "nodes", "connections", "config")
+
+    def __init__(self, uid, region_id, region_type, name, position):
+        self.uid = uid  # Row of this region in StarMap.regions
+        self.id = region_id
+        self.type = sys.intern(region_type)
+        self.name = name
+        self.x, self.y = position
+        self.nodes = []
+        self.connections = EMPTY  # Tuple of connected MapRegions
+        self.config = Region.REGION_CONFIGS[region_type]
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+    @property
+    def connection_ids(self):
+        return [region.id for region in self.connections]
+
+    def get_node(self, node_id):
+        """Get a node of this region by id, or None"""
+        for node in self.nodes:
+            if node.id == node_id:
+                return node
+        return None
+
+    def to_dict(self):
+        """Convert to the star map dict format"""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "name": self.name,
+            "position": (self.x, self.y),
+            "nodes": [node.to_dict() for node in self.nodes],
+            "connections": self.connection_ids,
+            "config": self.config
+        }
+
+
+class StarMap:
+    """
+    Typed star map held by game sessions.
+
+    Regions and nodes get integer uids (their row in regions/nodes) and
+    string ids are mapped to uids once. Connections are direct references,
+    repeated names and types are interned, and per-type settings such as
+    danger level come from the shared NODE_CONFIGS/REGION_CONFIGS instead
+    of being copied per node.
+    """
+
+    __slots__ = (
+        "regions", "nodes", "region_uids", "node_uids",
+        "current_region", "current_node", "discovered_regions", "map_seed"
+    )
+
+    def __init__(self):
+        self.regions = []
+        self.nodes = []
+        self.region_uids = {}
+        self.node_uids = {}
+        self.current_region = None
+        self.current_node = None
+        self.discovered_regions = []
+        self.map_seed = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @classmethod
+    def generate(cls, seed=None):
+        """Generate a new star map for a new game"""
+        return cls.from_dict(generate_new_star_map(seed))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a star map from the dict format used by saves and the client"""
+        star_map = cls()
+
+        for region_data in data["regions"].values():
+            region = MapRegion(
+                len(star_map.regions),
+                region_data["id"],
+                region_data["type"],
+                region_data["name"],
+                region_data["position"]
+            )
+            star_map.region_uids[region.id] = region.uid
+            star_map.regions.append(region)
+
+            for node_data in region_data["nodes"]:
+                node = MapNode(
+                    len(star_map.nodes),
+                    node_data["id"],
+                    node_data["type"],
+                    node_data["name"],
+                    region,
+                    node_data["position"]
+                )
+                node.discovered = node_data.get("discovered", False)
+                node.visited = node_data.get("visited", False)
+                node.has_repair = node_data.get("has_repair", False)
+                node.has_trade = node_data.get("has_trade", False)
+                node.special_items = tuple(node_data.get("special_items") or EMPTY)
+                node.quests = tuple(node_data.get("quests") or EMPTY)
+                star_map.node_uids[node.id] = node.uid
+                star_map.nodes.append(node)
+                region.nodes.append(node)
+
+        # Resolve connections once every id is known
+        for region, region_data in zip(star_map.regions, data["regions"].values()):
+            region.connections = tuple(
+                star_map.regions[star_map.region_uids[region_id]]
+                for region_id in region_data["connections"]
+                if region_id in star_map.region_uids
+            )
+            for node, node_data in zip(region.nodes, region_data["nodes"]):
+                node.connections = tuple(
+                    star_map.nodes[star_map.node_uids[node_id]]
+                    for node_id in node_data["connections"]
+                    if node_id in star_map.node_uids
+                )
+
+        star_map.current_region = data.get("current_region")
+        star_map.current_node = data.get("current_node")
+        star_map.discovered_regions = list(data.get("discovered_regions", []))
+        star_map.map_seed = data.get("map_seed")
+        return star_map
+
+    def to_dict(self):
+        """Convert to the star map dict format"""
+        return {
+            "regions": {region.id: region.to_dict() for region in self.regions},
+            "current_region": self.current_region,
+            "current_node": self.current_node,
+            "discovered_regions": self.discovered_regions,
+            "map_seed": self.map_seed
+        }
+
+    def get_region(self, region_id):
+        """Get a region by id, or None"""
+        uid = self.region_uids.get(region_id)
+        return None if uid is None else self.regions[uid]
+
+    def get_node(self, node_id):
+        """Get a node by id, or None"""
+        uid = self.node_uids.get(node_id)
+        return None if uid is None else self.nodes[uid]
@@ -0,0 +1,270 @@
+"""
+Tracing Module for Cosmic Explorer
+Lightweight request spans exported as OpenTelemetry JSON lines to a local file
+"""
+
+import contextvars
+import functools
+import json
+import os
+import queue
+import threading
+import time
+
+from traffic_recorder import open_trace
+
+# Resource and instrumentation scope written with every trace
+SERVICE_NAME = "cosmic-explorer"
+SCOPE_NAME = "cosmic_explorer.tracing"
+
+# OpenTelemetry span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_UNSET = 0
+STATUS_CODE_ERROR = 2
+
+# Spans kept per trace; more are counted on the root span instead
+MAX_TRACE_SPANS = 1000
+
+# Finished traces held for the writer thread; more than this are dropped
+MAX_PENDING_TRACES = 1000
+
+# The innermost open span of the current request, if it is being traced
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Trace:
+    """The finished spans of one request, sharing a trace id"""
+
+    __slots__ = ("trace_id", "spans", "dropped_spans")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self.dropped_spans = 0
+
+    def add(self, span):
+        if len(self.spans) < MAX_TRACE_SPANS:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+    def to_otlp(self):
+        """Get the trace as an OTLP/JSON ExportTraceServiceRequest"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": encode_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{
+                    "scope": {"name": SCOPE_NAME},
+                    "spans": [span.to_otlp() for span in self.spans]
+                }]
+            }]
+        }
+
+
+class Span:
+    """A timed operation; use it as a context manager to time a block"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "attributes",
+                 "start_ns", "end_ns", "error", "token")
+
+    def __init__(self, trace, parent_id, name, attributes, kind=SPAN_KIND_INTERNAL):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = None
+        self.end_ns = None
+        self.error = None
+        self.token = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def get_duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self.token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        _current_span.reset(self.token)
+        self.trace.add(self)
+        return False
+
+    def to_otlp(self):
+        status = {"code": STATUS_CODE_UNSET}
+        if self.error:
+            status = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": encode_attributes(self.attributes),
+            "status": status
+        }
+
+
+class NullSpan:
+    """Stands in for a span when the request is not traced"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def encode_attributes(attributes):
+    """Get OTLP/JSON key-value pairs for a dict of attributes"""
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+def span(name, **attributes):
+    """Get a span to time a block under the current span, or a no-op when not tracing"""
+    parent = _current_span.get()
+    if parent is None:
+        return NULL_SPAN
+    return Span(parent.trace, parent.span_id, name, attributes)
+
+
+def add_span(name, seconds, **attributes):
+    """Record a span that ended just now and lasted `seconds`, when tracing"""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    finished = Span(parent.trace, parent.span_id, name, attributes)
+    finished.end_ns = time.time_ns()
+    finished.start_ns = finished.end_ns - int(seconds * 1e9)
+    parent.trace.add(finished)
+
+
+def traced(name):
+    """Decorate a function so each call is a span while tracing"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_trace(name, **attributes):
+    """Start tracing the current request with a root server span"""
+    root = Span(Trace(), None, name, attributes, kind=SPAN_KIND_SERVER)
+    root.start_ns = time.time_ns()
+    _current_span.set(root)
+    return root
+
+
+def finish_trace(root, error=None):
+    """End the root span and get its trace, with the root first"""
+    root.end_ns = time.time_ns()
+    root.error = error
+    _current_span.set(None)
+    trace = root.trace
+    trace.spans.insert(0, root)
+    if trace.dropped_spans:
+        root.set_attribute("tracing.dropped_spans", trace.dropped_spans)
+    return trace
+
+
+def clear_trace():
+    """Stop tracing on this thread, e.g. after a request that never finished its trace"""
+    _current_span.set(None)
+
+
+class SpanExporter:
+    """
+    Appends traces to a file, one OTLP/JSON ExportTraceServiceRequest per line.
+
+    This is the OpenTelemetry Collector file exporter's format, so a
+    Collector's otlpjsonfile receiver can read it. With slow_ms above zero
+    only traces whose root span took at least that long are kept. A
+    background thread encodes and writes traces; if it falls
+    MAX_PENDING_TRACES behind, new traces are dropped.
+    """
+
+    def __init__(self, path, slow_ms=0, max_pending=MAX_PENDING_TRACES):
+        self.path = path
+        self.slow_ms = slow_ms
+        self.pending = queue.Queue(max_pending)
+        self.exported = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.writer = threading.Thread(target=self._write_traces, daemon=True)
+        self.writer.start()
+
+    def export(self, trace):
+        """Queue a finished trace, unless it was faster than the slow threshold"""
+        if trace.spans[0].get_duration_ms() < self.slow_ms:
+            self.skipped += 1
+            return
+        try:
+            self.pending.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write every queued trace and stop the writer thread"""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+
+    def get_stats(self):
+        return {
+            "path": self.path,
+            "slow_ms": self.slow_ms,
+            "exported": self.exported,
+            "skipped": self.skipped,
+            "dropped": self.dropped
+        }
+
+    def _write_traces(self):
+        with open_trace(self.path, "a") as output:
+            while True:
+                batch = [self.pending.get()]
+                while batch[-1] is not None and not self.pending.empty():
+                    batch.append(self.pending.get_nowait())
+
+                closing = batch[-1] is None
+                traces = batch[:-1] if closing else batch
+                output.writelines(json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n"
+                                  for trace in traces)
+                output.flush()
+                self.exported += len(traces)
+                if closing:
+                    return
@@ -0,0 +1,113 @@
+"""
+Traffic Recorder Module for Cosmic Explorer
+Captures API requests to a trace file for replay benchmarks
+"""
+
+import gzip
+import json
+import queue
+import threading
+import time
+
+# Requests held for the writer thread; more than this are dropped, not waited on
+MAX_PENDING_RECORDS = 10000
+
+# Seconds the writer waits for more records before flushing what it has
+FLUSH_INTERVAL = 0.5
+
+
+def open_trace(path, mode):
+    """Open a trace file as text, gzip-compressed when the path ends in .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path):
+    """Get the records of a trace file, oldest first"""
+    with open_trace(path, "r") as trace:
+        records = [json.loads(line) for line in trace if line.strip()]
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+class TrafficRecorder:
+    """
+    Appends one JSON line per request to a trace file.
+
+    record() only queues the raw request for a background thread, which
+    encodes and writes records in batches, so recording costs a request
+    about one queue put. If the writer falls behind by MAX_PENDING_RECORDS
+    requests, new records are dropped and counted instead of slowing
+    requests down.
+    """
+
+    def __init__(self, path, max_pending=MAX_PENDING_RECORDS):
+        self.path = path
+        self.pending = queue.Queue(max_pending)
+        self.recorded = 0
+        self.dropped = 0
+        self.writer = threading.Thread(target=self._write_records, daemon=True)
+        self.writer.start()
+
+    def record(self, session_id, endpoint, method, path, body, status, elapsed):
+        """Queue a finished request; body is the raw request body (bytes) or None"""
+        try:
+            self.pending.put_nowait(
+                (time.time(), session_id, endpoint, method, path, body, status, elapsed)
+            )
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write every queued record and stop the writer thread"""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+
+    def get_stats(self):
+        """Get the trace path and how many records were written and dropped"""
+        return {
+            "path": self.path,
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "pending": self.pending.qsize()
+        }
+
+    def _write_records(self):
+        with open_trace(self.path, "a") as trace:
+            while True:
+                batch = [self.pending.get()]
+
+                # Gather whatever else arrives shortly, then write it in one go
+                deadline = time.monotonic() + FLUSH_INTERVAL
+                while batch[-1] is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.pending.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                closing = batch[-1] is None
+                records = batch[:-1] if closing else batch
+                trace.writelines(self._encode(record) for record in records)
+                trace.flush()
+                self.recorded += len(records)
+                if closing:
+                    return
+
+    @staticmethod
+    def _encode(record):
+        ts, session_id, endpoint, method, path, body, status, elapsed = record
+        return json.dumps({
+            "ts": round(ts, 6),
+            "session": session_id,
+            "endpoint": endpoint,
+            "method": method,
+            "path": path,
+            "body": body.decode("utf-8", "replace") if body else None,
+            "status": status,
+            "ms": round(elapsed * 1000, 3)
+        }, separators=(",", ":")) + "\n"
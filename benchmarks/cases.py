@@ -0,0 +1,135 @@
+"""
+Hot-path benchmark cases for Cosmic Explorer.
+
+Each case is a setup function registered with @case. The runner calls it
+once per combination of the sweep values, outside the timed region, and
+times the function it returns.
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from config import config
+from regions import StarMapGenerator
+from session_manager import GameSession
+from inventory_system import ITEM_TYPES, InventoryManager
+from navigation_system import web_navigation
+from save_manager import save_game_to_slot, load_game_from_slot
+
+# Registered (name, sweeps, setup) cases, in registration order
+CASES = []
+
+# Map sizes and cargo hold sizes swept by the cases that depend on them
+MAP_REGIONS = (5, 20, 80)
+INVENTORY_STACKS = (0, 50, 500)
+
+# Save slot the save and load cases use inside their scratch directory
+BENCHMARK_SLOT = 1
+
+# Scratch save directories, kept until the run ends
+SCRATCH_DIRS = []
+
+
+def case(name, **sweeps):
+    """Register a benchmark; sweeps map a setup parameter to the values to run it with"""
+    def register(setup):
+        CASES.append((name, sweeps, setup))
+        return setup
+    return register
+
+
+def make_session(regions=5, stacks=0, seed=1):
+    """Get a game session on a seeded map of `regions` regions carrying `stacks` item stacks"""
+    star_map = StarMapGenerator(seed).generate_star_map(regions)
+    session = GameSession("benchmark")
+    session.load_from_dict({
+        "star_map": star_map,
+        "current_region_id": star_map["current_region"],
+        "current_node_id": star_map["current_node"]
+    })
+
+    item_ids = [item_id for item_id, info in ITEM_TYPES.items() if info["weight"] > 0]
+    session.player_stats["inventory"] = [
+        {"item_id": item_ids[i % len(item_ids)], "quantity": 1 + i % 5} for i in range(stacks)
+    ]
+    return session
+
+
+def use_scratch_saves():
+    """Point saves at a new scratch directory"""
+    scratch = tempfile.TemporaryDirectory()
+    SCRATCH_DIRS.append(scratch)
+    config.SAVE_DIR_PATH = scratch.name
+
+
+@case("generate_star_map", regions=MAP_REGIONS)
+def bench_generate_star_map(regions):
+    generator = StarMapGenerator(seed=1)
+    return lambda: generator.generate_star_map(regions)
+
+
+@case("session_to_dict", regions=MAP_REGIONS)
+def bench_session_to_dict(regions):
+    return make_session(regions).to_dict
+
+
+@case("get_effective_stats", stacks=INVENTORY_STACKS)
+def bench_get_effective_stats(stacks):
+    return make_session(stacks=stacks).get_effective_stats
+
+
+@case("web_navigation", regions=MAP_REGIONS)
+def bench_web_navigation(regions):
+    """Fly back and forth between the start node and its first neighbour"""
+    session = make_session(regions)
+    start = session.get_current_location()["node"]
+    route = itertools.cycle([start.connections[0].id, start.id])
+    session.player_stats["fuel"] = 10 ** 9
+    session.player_stats["ship_condition"] = 10 ** 9
+    return lambda: web_navigation(session, target_node_id=next(route))
+
+
+@case("can_add_item", stacks=(10, 100, 1000))
+def bench_can_add_item(stacks):
+    inventory = make_session(stacks=stacks).player_stats["inventory"]
+    capacity = sum(ITEM_TYPES[item["item_id"]]["weight"] * item["quantity"]
+                   for item in inventory) + 10
+    return lambda: InventoryManager.can_add_item(inventory, capacity, "rare_minerals", 2)
+
+
+@case("save_game_to_slot", regions=MAP_REGIONS)
+def bench_save_game_to_slot(regions):
+    """Save the way auto-save does, building the save dict each time"""
+    use_scratch_saves()
+    session = make_session(regions, stacks=50)
+    return lambda: save_game_to_slot(session.to_save_dict(), BENCHMARK_SLOT)
+
+
+@case("load_game_from_slot", regions=MAP_REGIONS)
+def bench_load_game_from_slot(regions):
+    """Read a save and restore a session from it"""
+    use_scratch_saves()
+    session = make_session(regions, stacks=50)
+    save_game_to_slot(session.to_save_dict(), BENCHMARK_SLOT)
+    return lambda: session.load_from_dict(load_game_from_slot(BENCHMARK_SLOT))
+
+
+@case("process_combat_action")
+def bench_process_combat_action():
+    """Attack round after round, starting a new fight whenever one ends"""
+    session = make_session()
+    combat_manager = session.combat_manager
+    stats = session.player_stats
+
+    def attack():
+        if not combat_manager.current_combat:
+            stats["ship_condition"] = 100
+            combat_manager.start_combat(stats, danger_level=0.5)
+        combat_manager.process_combat_action("attack", stats)
+    return attack
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmarks and compare them with a stored baseline.
+
+Each benchmark is timed timeit-style: the loop count is grown until one
+sample takes --min-time seconds, then --repeat samples are taken and the
+best per-call time is kept, as the least noisy estimate. Results slower
+than the baseline by more than --threshold are reported as regressions
+and make the run exit with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py [-k NAME ...] [--save] [--baseline PATH]
+                                        [--threshold 0.15] [--repeat 5] [--min-time 0.05]
+                                        [--list]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from cases import CASES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def expand_cases(filters):
+    """Get (full name, setup, kwargs) for every sweep combination whose name matches a filter"""
+    expanded = []
+    for name, sweeps, setup in CASES:
+        keys = list(sweeps)
+        for values in itertools.product(*(sweeps[key] for key in keys)):
+            kwargs = dict(zip(keys, values))
+            params = ",".join(f"{key}={value}" for key, value in kwargs.items())
+            full_name = f"{name}[{params}]" if params else name
+            if not filters or any(text in full_name for text in filters):
+                expanded.append((full_name, setup, kwargs))
+    return expanded
+
+
+def measure(func, repeat, min_time):
+    """Get (best, median, loops) seconds per call of func"""
+    loops = 1
+    while True:
+        elapsed = time_loops(func, loops)
+        if elapsed >= min_time:
+            break
+        # Aim a little past min_time so the next try usually lands
+        loops = max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9)))
+
+    samples = [elapsed / loops] + [time_loops(func, loops) / loops for _ in range(repeat - 1)]
+    return min(samples), statistics.median(samples), loops
+
+
+def time_loops(func, loops):
+    """Time `loops` calls of func with the garbage collector paused, like timeit"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def format_time(seconds):
+    """Format a per-call time with a readable unit"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def load_baseline(path):
+    """Get the stored results by benchmark name, or {} if there is no baseline yet"""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results):
+    """Store results with the machine details that make them comparable"""
+    with open(path, "w") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "results": results
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks")
+    parser.add_argument("-k", dest="filters", action="append", default=[], metavar="NAME",
+                        help="only run benchmarks whose name contains NAME")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true",
+                        help="store this run's results in the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="slowdown counted as a regression, as a fraction (default: 0.15)")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="seconds each sample runs for at least")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args()
+
+    cases = expand_cases(args.filters)
+    if args.list:
+        for full_name, _, _ in cases:
+            print(full_name)
+        return 0
+    if not cases:
+        parser.error("no benchmarks match")
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+    print(f"{'Benchmark':<40}{'Best':>12}{'Median':>12}{'Baseline':>12}{'Change':>10}")
+    for full_name, setup, kwargs in cases:
+        best, median, loops = measure(setup(**kwargs), args.repeat, args.min_time)
+        results[full_name] = {"best": best, "median": median, "loops": loops}
+
+        previous = baseline.get(full_name)
+        if previous:
+            change = best / previous["best"] - 1
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressions.append((full_name, change))
+            elif change < -args.threshold:
+                flag = "  faster"
+            compared = f"{format_time(previous['best']):>12}{change:>+10.1%}{flag}"
+        else:
+            compared = f"{'-':>12}{'new':>10}"
+        print(f"{full_name:<40}{format_time(best):>12}{format_time(median):>12}{compared}")
+
+    if args.save:
+        # Keep baselines of benchmarks this run filtered out
+        save_baseline(args.baseline, dict(baseline, **results))
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+
+    if regressions and not args.save:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for full_name, change in regressions:
+            print(f"  {full_name}: {change:+.1%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
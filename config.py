@@ -35,6 +35,23 @@ class GameConfig:
     MAX_SAVE_SLOTS = int(os.getenv('MAX_SAVE_SLOTS', 5))  # Number of save slots available
     AUTO_SAVE_SLOT = 0  # Slot 0 is reserved for auto-save
     
+    # Request capture for replay benchmarks; off unless a trace file is given (.gz to compress)
+    TRAFFIC_TRACE_PATH = os.getenv('TRAFFIC_TRACE_PATH', '')
+    
+    # Time one in this many game lock acquisitions for the contention report
+    LOCK_STATS_SAMPLE_EVERY = int(os.getenv('LOCK_STATS_SAMPLE_EVERY', 1))
+    
+    # Request span tracing to an OpenTelemetry JSON lines file; off unless a path is given
+    TRACE_SPANS_PATH = os.getenv('TRACE_SPANS_PATH', '')
+    TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', 0))  # Keep only traces this slow (0: all)
+    
+    # Token admin-only debug endpoints expect in X-Admin-Token; they are disabled without one
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    
+    # Estimated memory sessions may hold, in MB; sessions over it are hibernated to disk (0: off)
+    SESSION_MEMORY_BUDGET_MB = float(os.getenv('SESSION_MEMORY_BUDGET_MB', 0))
+    SESSION_EVICTION_POLICY = os.getenv('SESSION_EVICTION_POLICY', 'lru')  # lru or largest
+    
     # WebSocket and server settings for future UI integration
     WEBSOCKET_HOST = os.getenv('WEBSOCKET_HOST', 'localhost')
     WEBSOCKET_PORT = int(os.getenv('WEBSOCKET_PORT', 8765))
@@ -507,6 +507,7 @@ class GameEngine {
     constructor() {
         this.sessionId = 'default';
         this.gameState = null;
+        this.navigationCache = new NavigationCache();
         this.isRunning = false;
         this.lastFrameTime = 0;
         
@@ -670,6 +671,12 @@ class GameEngine {
         });
         
         const result = await response.json();
+        
+        // Keep the next moves the server sent so the map needs no extra request
+        if (result.game_state && result.navigation_options) {
+            this.navigationCache.store(result.game_state, result.navigation_options);
+        }
+        
         if (result.success) {
             // Update game state
             if (result.game_state) {
@@ -862,6 +869,11 @@ class GameEngine {
     }
     
     async fetchNavigationOptions() {
+        const cached = this.navigationCache.get(this.gameState);
+        if (cached) {
+            return cached;
+        }
+        
         try {
             const response = await fetch(`${GameConfig.game.apiUrl}/game/navigation_options/${this.sessionId}`);
             const data = await response.json();
@@ -9,6 +9,7 @@ class GameEngine {
     constructor() {
         this.sessionId = 'default';
         this.gameState = null;
+        this.navigationCache = new NavigationCache();
         this.isRunning = false;
         this.lastFrameTime = 0;
         
@@ -14,6 +14,12 @@ class GameActions {
         });
         
         const result = await response.json();
+        
+        // Keep the next moves the server sent so the map needs no extra request
+        if (result.game_state && result.navigation_options) {
+            this.gameEngine.navigationCache.store(result.game_state, result.navigation_options);
+        }
+        
         if (result.success) {
             // Update game state
             if (result.game_state) {
@@ -199,6 +205,11 @@ class GameActions {
     }
     
     async fetchNavigationOptions() {
+        const cached = this.gameEngine.navigationCache.get(this.gameEngine.gameState);
+        if (cached) {
+            return cached;
+        }
+        
         try {
             const response = await fetch(`${GameConfig.game.apiUrl}/game/navigation_options/${this.gameEngine.sessionId}`);
             const data = await response.json();
@@ -0,0 +1,29 @@
+// Navigation Options Cache for Cosmic Explorer
+// Keeps the navigation options sent with action results so the map needs no extra request
+
+class NavigationCache {
+    constructor() {
+        this.entry = null;
+    }
+    
+    static getKey(state) {
+        // Navigation options depend only on the game, position, fuel and fuel efficiency
+        const stats = state.player_stats || {};
+        return [state.created_at, state.current_node_id, stats.fuel, stats.fuel_efficiency].join('|');
+    }
+    
+    store(state, options) {
+        this.entry = { key: NavigationCache.getKey(state), data: options };
+    }
+    
+    get(state) {
+        // Options cached for a different game state are stale
+        if (this.entry && state && this.entry.key === NavigationCache.getKey(state)) {
+            return this.entry.data;
+        }
+        return null;
+    }
+}
+
+// Make the cache globally accessible
+window.NavigationCache = NavigationCache;
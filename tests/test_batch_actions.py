@@ -0,0 +1,101 @@
+"""Test cases for batched and atomic actions."""
+import copy
+import random
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from action_processor import ActionProcessor
+from session_manager import GameSession
+from ship_system import SHIP_MODS
+
+
+class TestBatchActions(unittest.TestCase):
+    """Test cases for ActionProcessor.process_actions."""
+
+    def setUp(self):
+        """Dock a session with cargo and credits to spend."""
+        random.seed(2)
+        self.processor = ActionProcessor()
+        self.session = GameSession("batch-actions")
+        self.session.at_repair_location = True
+        self.session.player_stats["wealth"] = 1000
+        self.session.player_stats["inventory"] = [
+            {"item_id": "rare_minerals", "quantity": 4},
+            {"item_id": "data_cores", "quantity": 2}
+        ]
+
+    def test_runs_in_order(self):
+        """Test that every action runs and reports its own result."""
+        batch = self.processor.process_actions(self.session, [
+            {"action": "sell_item", "item_id": "rare_minerals", "quantity": 4},
+            {"action": "sell_item", "item_id": "data_cores", "quantity": 2},
+            {"action": "buy_mod", "mod_id": "laser_cannon"}
+        ])
+        self.assertTrue(batch["success"])
+        self.assertFalse(batch["rolled_back"])
+        self.assertEqual(len(batch["results"]), 3)
+        self.assertEqual(self.session.player_stats["inventory"], [])
+        self.assertEqual(self.session.player_stats["ship_mods"]["high"], ["laser_cannon"])
+        self.assertEqual(self.session.player_stats["wealth"],
+                         1000 + 4 * 50 + 2 * 100 - SHIP_MODS["laser_cannon"]["cost"])
+
+    def test_atomic_rolls_back(self):
+        """Test that a failing action undoes the whole atomic batch."""
+        stats = self.session.player_stats
+        before = copy.deepcopy(stats.to_dict())
+        statistics = dict(self.session.statistics)
+
+        batch = self.processor.process_actions(self.session, [
+            {"action": "sell_item", "item_id": "data_cores", "quantity": 2},
+            {"action": "buy_mod", "mod_id": "laser_cannon"},
+            {"action": "buy_mod", "mod_id": "not_a_mod"},
+            {"action": "sell_item", "item_id": "rare_minerals", "quantity": 1}
+        ], atomic=True)
+
+        self.assertTrue(batch["rolled_back"])
+        self.assertFalse(batch["success"])
+        self.assertEqual(len(batch["results"]), 3)
+        self.assertEqual(batch["results"][-1]["event_type"], "error")
+        self.assertEqual(stats.to_dict(), before)
+        self.assertEqual(self.session.statistics, statistics)
+
+    def test_non_atomic_keeps_going(self):
+        """Test that a non-atomic batch keeps earlier and later successes."""
+        batch = self.processor.process_actions(self.session, [
+            {"action": "buy_mod", "mod_id": "not_a_mod"},
+            {"action": "sell_item", "item_id": "data_cores", "quantity": 1}
+        ])
+        self.assertFalse(batch["success"])
+        self.assertFalse(batch["rolled_back"])
+        self.assertEqual(self.session.player_stats["inventory"][1]["quantity"], 1)
+
+    def test_rollback_restores_map(self):
+        """Test that undoing a jump restores position, fuel and discovered nodes."""
+        session = self.session
+        location = session.get_current_location()
+        target = location["node"].connections[0]
+        session.get_map_index()
+        node_id, fuel, turns = session.current_node_id, session.player_stats["fuel"], session.turn_count
+
+        batch = self.processor.process_actions(session, [
+            {"action": "navigate", "target_node_id": target.id},
+            {"action": "buy_mod", "mod_id": "not_a_mod"}
+        ], atomic=True)
+
+        self.assertTrue(batch["rolled_back"])
+        self.assertEqual((session.current_node_id, session.player_stats["fuel"], session.turn_count),
+                         (node_id, fuel, turns))
+        self.assertFalse(target.visited)
+        row = session.map_index.node_rows[target.id]
+        self.assertEqual(bool(session.map_index.visited[row]), False)
+        self.assertIsNone(session.map_changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
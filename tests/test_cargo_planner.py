@@ -0,0 +1,100 @@
+"""Test cases for knapsack cargo selection."""
+import itertools
+import random
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from cargo_planner import get_kept_quantities, select_cargo, get_cargo_advice
+from inventory_system import ITEM_TYPES
+from player_state import PlayerStats
+from pod_system import PodManager, POD_AUGMENTATIONS
+
+
+def best_by_brute_force(inventory, capacity):
+    """Try every quantity of every stack and get the best kept value."""
+    best = 0
+    for quantities in itertools.product(*(range(item["quantity"] + 1) for item in inventory)):
+        items = [(ITEM_TYPES[item["item_id"]], q) for item, q in zip(inventory, quantities)]
+        if sum(info["weight"] * q for info, q in items) <= capacity:
+            best = max(best, sum(info["base_value"] * q for info, q in items))
+    return best
+
+
+class TestCargoSelection(unittest.TestCase):
+    """Test cases for picking the most valuable cargo."""
+
+    def test_matches_brute_force(self):
+        """Test random small inventories, with repeated item ids, against brute force."""
+        rng = random.Random(3)
+        item_ids = list(ITEM_TYPES)
+        for _ in range(200):
+            inventory = [
+                {"item_id": rng.choice(item_ids), "quantity": rng.randint(1, 4)}
+                for _ in range(rng.randint(0, 4))
+            ]
+            capacity = rng.randint(0, 25)
+            kept, kept_value, kept_weight = get_kept_quantities(inventory, capacity)
+
+            self.assertEqual(kept_value, best_by_brute_force(inventory, capacity))
+            weight = sum(ITEM_TYPES[item["item_id"]]["weight"] * quantity
+                         for item, quantity in zip(inventory, kept))
+            self.assertEqual(weight, kept_weight)
+            self.assertLessEqual(weight, capacity)
+            for item, quantity in zip(inventory, kept):
+                self.assertLessEqual(quantity, item["quantity"])
+
+    def test_weightless_items_always_kept(self):
+        """Test that quest items survive even with no capacity."""
+        inventory = [{"item_id": "rare_minerals", "quantity": 3},
+                     {"item_id": "ancient_key", "quantity": 1}]
+        self.assertEqual(select_cargo(inventory, 0), [{"item_id": "ancient_key", "quantity": 1}])
+
+
+class TestPodPreservation(unittest.TestCase):
+    """Test cases for cargo kept by the escape pod."""
+
+    def test_pod_splits_stacks(self):
+        """Test that ejection keeps part of a stack the old greedy pick dropped whole."""
+        stats = PlayerStats(has_flight_pod=True, pod_augmentations=["cargo_module"])
+        stats["inventory"] = [{"item_id": "alien_artifacts", "quantity": 10},
+                              {"item_id": "scrap_metal", "quantity": 5}]
+        capacity = POD_AUGMENTATIONS["cargo_module"]["effect"]["cargo_preservation"]
+
+        success, _ = PodManager.activate_pod(stats)
+        self.assertTrue(success)
+        kept_quantity = capacity // ITEM_TYPES["alien_artifacts"]["weight"]
+        self.assertEqual(stats["inventory"],
+                         [{"item_id": "alien_artifacts", "quantity": kept_quantity}])
+
+
+class TestCargoAdvice(unittest.TestCase):
+    """Test cases for the sell-or-jettison advice."""
+
+    def test_advice_frees_space_cheaply(self):
+        """Test that advice frees the requested space and keeps the valuable cargo."""
+        inventory = [{"item_id": "scrap_metal", "quantity": 3},
+                     {"item_id": "data_cores", "quantity": 10},
+                     {"item_id": "rare_minerals", "quantity": 4}]
+        advice = get_cargo_advice(inventory, 60, free_space=20)
+
+        self.assertLessEqual(advice["kept_weight"], 40)
+        self.assertEqual(advice["remove"], [{"item_id": "scrap_metal", "name": "Scrap Metal",
+                                             "quantity": 2, "weight": 20, "value": 40}])
+        self.assertEqual(advice["kept_value"] + advice["removed_value"], 60 + 1000 + 200)
+
+    def test_nothing_to_remove(self):
+        """Test that cargo that already fits is all kept."""
+        inventory = [{"item_id": "data_cores", "quantity": 2}]
+        advice = get_cargo_advice(inventory, 50)
+        self.assertEqual(advice["remove"], [])
+        self.assertEqual(advice["keep"], inventory)
+
+
+if __name__ == '__main__':
+    unittest.main()
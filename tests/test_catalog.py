@@ -0,0 +1,79 @@
+"""Test cases for the catalog lookup tables."""
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from ship_system import SHIP_TYPES, SHIP_MODS, ShipManager
+from inventory_system import ITEM_TYPES, InventoryManager
+from pod_system import POD_AUGMENTATIONS, PodManager
+from catalog import CATALOG, SLOT_TYPES, get_available_mods_for_loadout
+
+
+class TestCatalogIndex(unittest.TestCase):
+    """Test cases comparing each table with a scan of its catalog."""
+
+    def test_mods_by_slot(self):
+        """Test per-slot mod tables and cost ordering."""
+        for slot in SLOT_TYPES:
+            expected = {m: info for m, info in SHIP_MODS.items() if info["slot"] == slot}
+            self.assertEqual(ShipManager.get_available_mods_for_slot(slot), expected)
+            costs = [SHIP_MODS[m]["cost"] for m in CATALOG.mods_by_cost[slot]]
+            self.assertEqual(costs, sorted(costs))
+        self.assertEqual(ShipManager.get_available_mods_for_slot("unknown"), {})
+
+    def test_items(self):
+        """Test per-category item tables and value ranges."""
+        for category in {info["category"] for info in ITEM_TYPES.values()}:
+            expected = {i: info for i, info in ITEM_TYPES.items() if info["category"] == category}
+            self.assertEqual(InventoryManager.get_items_by_category(category), expected)
+
+        in_range = CATALOG.get_items_in_value_range(50, 150)
+        self.assertEqual(
+            sorted(in_range),
+            sorted(i for i, info in ITEM_TYPES.items() if 50 <= info["base_value"] <= 150)
+        )
+
+    def test_effect_vectors(self):
+        """Test that each mod's effect vector matches its effects."""
+        for mod_id, mod_info in SHIP_MODS.items():
+            row = CATALOG.effect_vectors[CATALOG.mod_rows[mod_id]]
+            for effect, value in mod_info.get("effects", {}).items():
+                self.assertEqual(row[CATALOG.effect_columns[effect]], value)
+        self.assertEqual(CATALOG.effect_vectors.shape, (len(SHIP_MODS), len(CATALOG.effect_names)))
+
+    def test_available_mods(self):
+        """Test the cached available_mods response against the per-slot scan."""
+        ship_mods = {"high": ["mining_laser", "laser_cannon"], "mid": [], "low": [], "rig": []}
+        response = get_available_mods_for_loadout("trader", ship_mods)
+        for slot in SLOT_TYPES:
+            installed = ship_mods[slot]
+            self.assertEqual(response[slot]["max_slots"], SHIP_TYPES["trader"]["slots"][slot])
+            self.assertEqual(response[slot]["used_slots"], len(installed))
+            self.assertEqual(response[slot]["available_mods"], {
+                m: info for m, info in SHIP_MODS.items()
+                if info["slot"] == slot and m not in installed
+            })
+
+        # The cache key ignores the order mods were installed in
+        reordered = dict(ship_mods, high=["laser_cannon", "mining_laser"])
+        self.assertIs(get_available_mods_for_loadout("trader", reordered), response)
+
+    def test_available_augmentations(self):
+        """Test available augmentations against the slot rules."""
+        installed = [next(iter(POD_AUGMENTATIONS))]
+        taken = POD_AUGMENTATIONS[installed[0]]["slot"]
+        available = PodManager.get_available_augmentations(installed)
+        self.assertEqual(available, {
+            a: info for a, info in POD_AUGMENTATIONS.items()
+            if a not in installed and info["slot"] != taken
+        })
+        self.assertEqual(PodManager.get_available_augmentations([]), POD_AUGMENTATIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
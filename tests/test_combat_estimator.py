@@ -0,0 +1,98 @@
+"""Test cases for the combat outcome estimator."""
+import random
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from combat_system import CombatManager, ENEMY_TYPES
+from combat_estimator import estimate_combat
+from player_state import PlayerStats
+
+ARMED_MODS = {
+    "high": ["laser_cannon", "missile_launcher"],
+    "mid": ["targeting_computer", "afterburner"],
+    "low": [],
+    "rig": []
+}
+
+
+def play_fights(ship_mods, enemy_type, action, fights):
+    """Play fights with the real CombatManager and count each outcome."""
+    counts = {}
+    for _ in range(fights):
+        stats = PlayerStats(ship_mods=ship_mods)
+        manager = CombatManager()
+        manager.start_combat(stats, enemy=manager.create_enemy(enemy_type))
+        result = {"combat_ongoing": True}
+        while result.get("combat_ongoing"):
+            result = manager.process_combat_action(action, stats)
+        if result["enemy_fled"]:
+            outcome = "enemy_fled"
+        else:
+            outcome = "win" if result["victory"] else "death"
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return {outcome: count / fights for outcome, count in counts.items()}
+
+
+class TestCombatEstimator(unittest.TestCase):
+    """Test cases for combat outcome odds."""
+
+    def test_outcomes_sum_to_one(self):
+        """Test that every strategy's outcomes add up to 1."""
+        estimate = estimate_combat(PlayerStats(ship_mods=ARMED_MODS), "space_kraken")
+        self.assertEqual(
+            set(estimate["strategies"]),
+            {"attack", "precise_shot", "barrage", "evasive", "flee", "negotiate"}
+        )
+        for strategy in estimate["strategies"].values():
+            self.assertAlmostEqual(sum(strategy["outcomes"].values()), 1.0, places=3)
+
+    def test_matches_played_fights(self):
+        """Test that estimated odds match fights played with CombatManager."""
+        random.seed(7)
+        for action in ("attack", "evasive"):
+            played = play_fights(ARMED_MODS, "space_kraken", action, 3000)
+            estimate = estimate_combat(PlayerStats(ship_mods=ARMED_MODS), "space_kraken")
+            outcomes = estimate["strategies"][action]["outcomes"]
+            for outcome in ("win", "enemy_fled", "death"):
+                self.assertAlmostEqual(outcomes[outcome], played.get(outcome, 0.0), delta=0.03)
+
+    def test_available_actions_follow_loadout(self):
+        """Test that special actions are only available with the right mods."""
+        unarmed = estimate_combat(PlayerStats(), "pirate_scout")["strategies"]
+        armed = estimate_combat(PlayerStats(ship_mods=ARMED_MODS), "pirate_scout")["strategies"]
+        self.assertFalse(unarmed["precise_shot"]["available"])
+        self.assertFalse(unarmed["barrage"]["available"])
+        self.assertTrue(armed["precise_shot"]["available"])
+        self.assertTrue(armed["barrage"]["available"])
+
+    def test_flee_and_negotiate(self):
+        """Test the odds for repeated flee and negotiation attempts."""
+        stats = PlayerStats()
+        drone = estimate_combat(stats, "alien_drone")["strategies"]
+        self.assertFalse(drone["negotiate"]["available"])
+        self.assertEqual(drone["negotiate"]["outcomes"]["unresolved"], 1.0)
+
+        # A 1 HP ship dies unless its first flee attempt works
+        scout = estimate_combat(stats, "pirate_scout", player_hp=1)["strategies"]
+        flee_chance = min(0.9, 1.2 / (ENEMY_TYPES["pirate_scout"]["speed"] * 1.5))
+        self.assertAlmostEqual(scout["flee"]["outcomes"]["fled"], flee_chance, places=4)
+        self.assertEqual(scout["negotiate"]["cost"], 100)
+        self.assertEqual(scout["negotiate"]["outcomes"]["negotiated"], 1.0)
+
+    def test_wounded_enemy(self):
+        """Test that an ongoing fight is estimated from the current HP."""
+        stats = PlayerStats(ship_mods=ARMED_MODS)
+        fresh = estimate_combat(stats, "rogue_ai_ship")["strategies"]["attack"]
+        wounded = estimate_combat(stats, "rogue_ai_ship", enemy_hp=10)["strategies"]["attack"]
+        self.assertGreater(wounded["outcomes"]["win"], fresh["outcomes"]["win"])
+        self.assertLess(wounded["mean_rounds"], fresh["mean_rounds"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""Test cases for per-session combat state."""
+import json
+import random
+import threading
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from combat_system import ENEMY_TYPES
+from action_processor import ActionProcessor
+from session_manager import GameSession
+
+
+def start_fight(session, enemy_type):
+    """Put a session into combat with a given enemy."""
+    manager = session.combat_manager
+    manager.start_combat(session.player_stats, enemy=manager.create_enemy(enemy_type))
+    session.player_stats["in_combat"] = True
+    session.current_event = "combat"
+
+
+class TestCombatState(unittest.TestCase):
+    """Test cases for combat owned by a single session."""
+
+    def test_enemy_references_template(self):
+        """Test that enemies share their template and fights leave it unchanged."""
+        session = GameSession("combat-template")
+        start_fight(session, "space_kraken")
+        enemy = session.combat_manager.current_combat["enemy"]
+        self.assertIs(enemy["data"], ENEMY_TYPES["space_kraken"])
+
+        session.combat_manager.process_combat_action("attack", session.player_stats)
+        self.assertEqual(ENEMY_TYPES["space_kraken"]["hp"], 100)
+
+    def test_combat_state_copies_template(self):
+        """Test that the UI combat state hands out a copy of the enemy template."""
+        session = GameSession("combat-state-copy")
+        start_fight(session, "pirate_scout")
+        enemy_data = session.combat_manager.get_combat_state()["enemy_data"]
+        self.assertEqual(enemy_data, ENEMY_TYPES["pirate_scout"])
+        enemy_data["name"] = "Renamed"
+        enemy_data["loot_table"].clear()
+        self.assertEqual(ENEMY_TYPES["pirate_scout"]["name"], "Pirate Scout")
+        self.assertTrue(ENEMY_TYPES["pirate_scout"]["loot_table"])
+
+    def test_sessions_do_not_share_combat(self):
+        """Test that starting a fight in one session leaves another alone."""
+        first = GameSession("combat-first")
+        second = GameSession("combat-second")
+        start_fight(first, "pirate_scout")
+        start_fight(second, "rogue_ai_ship")
+
+        self.assertEqual(first.combat_manager.get_combat_state()["enemy_type"], "pirate_scout")
+        self.assertEqual(second.combat_manager.get_combat_state()["enemy_type"], "rogue_ai_ship")
+
+    def test_combat_save_round_trip(self):
+        """Test that a fight in progress survives a save and load."""
+        session = GameSession("combat-save")
+        start_fight(session, "pirate_raider")
+        session.combat_manager.current_combat["enemy"]["hp"] = 17
+
+        saved = json.loads(json.dumps(session.to_save_dict()))
+        loaded = GameSession("combat-save")
+        loaded.load_from_dict(saved)
+
+        state = loaded.combat_manager.get_combat_state()
+        self.assertEqual(state["enemy_type"], "pirate_raider")
+        self.assertEqual(state["enemy_hp"], 17)
+        self.assertIs(loaded.combat_manager.current_combat["enemy"]["data"],
+                      ENEMY_TYPES["pirate_raider"])
+        self.assertEqual(loaded.current_event, "combat")
+
+    def test_load_without_combat_clears_flag(self):
+        """Test that older saves flagged in combat but without a fight load out of combat."""
+        session = GameSession("combat-old-save")
+        saved = session.to_save_dict()
+        del saved["combat"]
+        saved["player_stats"]["in_combat"] = True
+
+        session.load_from_dict(saved)
+        self.assertFalse(session.player_stats["in_combat"])
+        self.assertIsNone(session.combat_manager.current_combat)
+
+    def test_many_simultaneous_fights(self):
+        """Test that concurrent fights through one processor never see each other's enemy."""
+        processor = ActionProcessor()
+        enemy_types = list(ENEMY_TYPES)
+        sessions = []
+        for i in range(40):
+            session = GameSession(f"combat-{i}")
+            session.player_stats["ship_condition"] = 10 ** 6
+            session.player_stats["max_ship_condition"] = 10 ** 6
+            start_fight(session, enemy_types[i % len(enemy_types)])
+            sessions.append(session)
+
+        errors = []
+        barrier = threading.Barrier(len(sessions))
+
+        def fight(session, enemy_type):
+            barrier.wait()
+            while session.player_stats["in_combat"]:
+                state = session.combat_manager.get_combat_state()
+                if state["enemy_type"] != enemy_type:
+                    errors.append((session.session_id, state["enemy_type"]))
+                    return
+                processor.process_action(session, "combat_action", {"combat_action": "attack"})
+
+        threads = [
+            threading.Thread(target=fight, args=(session, enemy_types[i % len(enemy_types)]))
+            for i, session in enumerate(sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for session in sessions:
+            self.assertIsNone(session.combat_manager.current_combat)
+
+
+class TestAutoCombat(unittest.TestCase):
+    """Test cases for resolving combat server-side in one action."""
+
+    def setUp(self):
+        """Start a fight that a sturdy ship cannot lose quickly."""
+        random.seed(3)
+        self.processor = ActionProcessor()
+        self.session = GameSession("combat-auto")
+        self.session.player_stats["ship_condition"] = 500
+        self.session.player_stats["max_ship_condition"] = 500
+        start_fight(self.session, "pirate_scout")
+
+    def test_fixed_action_until_end(self):
+        """Test that a fixed action runs until the fight ends."""
+        result = self.processor.process_action(
+            self.session, "combat_auto", {"policy": {"action": "attack"}, "max_rounds": 50}
+        )
+        self.assertTrue(result["success"])
+        self.assertFalse(self.session.player_stats["in_combat"])
+        self.assertIsNone(self.session.combat_manager.current_combat)
+        self.assertEqual(result["event_type"], "combat_end")
+        self.assertEqual([r["round"] for r in result["rounds"]],
+                         list(range(1, len(result["rounds"]) + 1)))
+        self.assertTrue(all(r["move"] == "attack" for r in result["rounds"]))
+
+    def test_round_cap(self):
+        """Test that the fight is left running when the round cap is hit."""
+        self.session.combat_manager.current_combat["enemy"]["hp"] = 10 ** 6
+        result = self.processor.process_action(self.session, "combat_auto", {"max_rounds": 3})
+        self.assertEqual(len(result["rounds"]), 3)
+        self.assertTrue(self.session.player_stats["in_combat"])
+        self.assertIn("combat_state", result)
+
+    def test_flee_and_negotiate_policies(self):
+        """Test that the policy flees when hurt and negotiates when affordable."""
+        self.session.combat_manager.current_combat["player"]["hp"] = 100
+        result = self.processor.process_action(
+            self.session, "combat_auto", {"policy": {"flee_below": 0.5}, "max_rounds": 1}
+        )
+        self.assertEqual(result["rounds"][0]["move"], "flee")
+
+        start_fight(self.session, "pirate_scout")
+        result = self.processor.process_action(
+            self.session, "combat_auto", {"policy": {"negotiate": True}, "max_rounds": 1}
+        )
+        self.assertEqual(result["rounds"][0]["move"], "negotiate")
+
+        self.session.player_stats["wealth"] = 0
+        start_fight(self.session, "pirate_scout")
+        result = self.processor.process_action(
+            self.session, "combat_auto", {"policy": {"negotiate": True}, "max_rounds": 1}
+        )
+        self.assertEqual(result["rounds"][0]["move"], "attack")
+
+    def test_rejects_malformed_settings(self):
+        """Test that bad policies and round caps get an error event, not a crash."""
+        for data in ({"max_rounds": "abc"}, {"policy": "attack"},
+                     {"policy": {"flee_below": "x"}}, {"policy": {"action": "dance"}}):
+            result = self.processor.process_action(self.session, "combat_auto", data)
+            self.assertEqual(result["event_type"], "error", data)
+            self.assertNotIn("Error processing action", result["event"])
+        self.assertTrue(self.session.player_stats["in_combat"])
+
+    def test_round_cap_coerced(self):
+        """Test that a float round cap is truncated and the message counts one round."""
+        self.session.combat_manager.current_combat["enemy"]["hp"] = 10 ** 6
+        result = self.processor.process_action(self.session, "combat_auto", {"max_rounds": 1.7})
+        self.assertEqual(len(result["rounds"]), 1)
+        self.assertEqual(result["event"], "Combat continues after 1 round.")
+
+
+if __name__ == '__main__':
+    unittest.main()
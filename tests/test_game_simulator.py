@@ -0,0 +1,104 @@
+"""Test cases for the headless game simulator."""
+import random
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from action_processor import ActionProcessor
+from config import config
+from game_simulator import (POLICIES, SAFE_HARBOR_CHOICE, TraderPolicy, apply_config_overrides,
+                            convert_config_value, play_game, simulate)
+from session_manager import GameSession
+
+
+def without_timings(game):
+    return {key: value for key, value in game.items() if key != "latencies"}
+
+
+class TestPlayGame(unittest.TestCase):
+    """Test cases for playing single games."""
+
+    def test_same_seed_same_game(self):
+        """Test that a policy and seed always play out the same way."""
+        for policy_name in POLICIES:
+            self.assertEqual(without_timings(play_game(policy_name, 11)),
+                             without_timings(play_game(policy_name, 11)))
+
+    def test_games_end(self):
+        """Test that games end for a known reason within the turn and action limits."""
+        for seed in range(20):
+            game = play_game("trader", seed)
+            self.assertNotIn(game["end_reason"], ("unknown", "action_cap"))
+            self.assertLessEqual(game["turns"], config.MAX_TURNS)
+            self.assertEqual(game["actions"],
+                             sum(len(times) for times in game["latencies"].values()))
+
+    def test_action_cap(self):
+        """Test that a game stops at the action cap."""
+        game = play_game("random", 3, max_actions=5)
+        self.assertEqual((game["actions"], game["end_reason"]), (5, "action_cap"))
+
+
+class TestTraderPolicy(unittest.TestCase):
+    """Test cases for the trader bot's choices."""
+
+    def test_escape_pod_heads_for_harbor(self):
+        """Test that after the pod activates the trader picks the safe harbor choice."""
+        random.seed(3)
+        processor = ActionProcessor()
+        session = GameSession("sim-pod")
+        region = session.get_current_location()["region"]
+        session.current_node_id = next(node.id for node in region.nodes if not node.has_repair)
+        session.player_stats["has_flight_pod"] = True
+        session.player_stats["ship_condition"] = 0
+        processor.process_action(session, "scan", autosave=False)
+
+        action, data = TraderPolicy().choose_action(session, random.Random(0))
+        self.assertEqual((action, data), ("choice", {"choice": SAFE_HARBOR_CHOICE}))
+        _, hop = processor.find_safe_harbor_hop(session)
+        processor.process_action(session, action, data, autosave=False)
+        self.assertEqual(session.current_node_id, hop)
+
+
+class TestSimulate(unittest.TestCase):
+    """Test cases for simulating many games."""
+
+    def test_overrides_apply_and_restore(self):
+        """Test that config overrides shape the games and are undone afterwards."""
+        max_turns = config.MAX_TURNS
+        report = simulate(20, "trader", overrides={"MAX_TURNS": "5"})
+        self.assertEqual(config.MAX_TURNS, max_turns)
+        self.assertEqual(report["settings"]["MAX_TURNS"], 5)
+        self.assertLessEqual(report["game_length"]["max"], 5)
+        self.assertEqual(sum(report["end_reasons"].values()), 20)
+
+    def test_pool_matches_serial(self):
+        """Test that fanning out over worker processes plays the same games."""
+        serial = simulate(8, "trader", seed=4)
+        pooled = simulate(8, "trader", workers=2, seed=4)
+        for key in ("actions", "victory_rate", "end_reasons", "game_length"):
+            self.assertEqual(serial[key], pooled[key])
+        self.assertEqual(set(serial["handlers"]), set(pooled["handlers"]))
+
+    def test_invalid_arguments(self):
+        """Test that unknown policies and settings are rejected without changing config."""
+        with self.assertRaises(ValueError):
+            simulate(1, "pacifist")
+        with self.assertRaises(ValueError):
+            apply_config_overrides({"MAX_TURNS": 10, "NOT_A_SETTING": 1})
+        with self.assertRaises(ValueError):
+            apply_config_overrides({"MAX_TURNS": "many"})
+        self.assertEqual(convert_config_value(True, "False"), False)
+        self.assertEqual(convert_config_value(False, "1"), True)
+        with self.assertRaises(ValueError):
+            convert_config_value(True, "yes")
+        self.assertEqual(config.MAX_TURNS, int(os.getenv('MAX_TURNS', 50)))
+
+
+if __name__ == '__main__':
+    unittest.main()
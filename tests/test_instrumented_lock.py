@@ -0,0 +1,121 @@
+"""Test cases for lock contention instrumentation."""
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from instrumented_lock import InstrumentedLock
+from metrics import reset_metrics
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-token"}
+
+
+class TestInstrumentedLock(unittest.TestCase):
+    """Test cases for wait and hold accounting."""
+
+    def setUp(self):
+        reset_metrics()
+
+    def test_wait_and_hold_by_site(self):
+        """Test that a slow holder is charged hold time and makes others wait."""
+        lock = InstrumentedLock("test_lock")
+        holding = threading.Event()
+
+        def slow_holder():
+            with lock:
+                holding.set()
+                time.sleep(0.05)
+
+        def quick_holder():
+            with lock:
+                pass
+
+        slow = threading.Thread(target=slow_holder)
+        slow.start()
+        holding.wait()
+        quick = threading.Thread(target=quick_holder)
+        quick.start()
+        slow.join()
+        quick.join()
+
+        report = lock.get_report()
+        sites = {entry["site"]: entry for entry in report["sites"]}
+        self.assertEqual(report["acquisitions"], 2)
+        self.assertEqual(report["contended"], 1)
+        self.assertEqual([entry["site"] for entry in report["sites"]],
+                         ["slow_holder", "quick_holder"])
+        self.assertGreaterEqual(sites["slow_holder"]["hold_total"], 0.04)
+        self.assertGreaterEqual(sites["quick_holder"]["wait_total"], 0.02)
+        self.assertEqual(sites["quick_holder"]["max_queue"], 1)
+        self.assertEqual(lock.get_report(sort="wait")["sites"][0]["site"], "quick_holder")
+
+    def test_failing_site_name_keeps_lock_usable(self):
+        """Test that an error naming the site falls back to the caller and still releases."""
+        def broken_site():
+            raise RuntimeError("no site")
+
+        lock = InstrumentedLock("test_lock", get_site=broken_site)
+        with lock:
+            self.assertTrue(lock.locked())
+        self.assertFalse(lock.locked())
+        self.assertEqual(lock.get_report()["sites"][0]["site"],
+                         "test_failing_site_name_keeps_lock_usable")
+
+    def test_sampling(self):
+        """Test that only sampled acquisitions are timed, but all are counted."""
+        lock = InstrumentedLock("test_lock", sample_every=4)
+        for _ in range(10):
+            with lock:
+                pass
+        report = lock.get_report()
+        self.assertEqual(report["acquisitions"], 10)
+        self.assertEqual(report["sites"][0]["samples"], 2)
+
+
+class TestLockReport(unittest.TestCase):
+    """Test cases for the /debug/locks endpoint."""
+
+    def setUp(self):
+        reset_metrics()
+        self.saved_token = config.ADMIN_TOKEN
+        config.ADMIN_TOKEN = "test-token"
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        config.ADMIN_TOKEN = self.saved_token
+
+    def get_report(self, query=""):
+        return self.client.get(f'/debug/locks{query}', headers=ADMIN_HEADERS)
+
+    def test_routes_and_actions_are_sites(self):
+        """Test that the game lock names routes, and actions for single action requests."""
+        self.client.get('/api/game/state/missing')
+        self.client.post('/api/game/action/missing', json={"action": "scan"})
+
+        report = self.get_report().get_json()["locks"][0]
+        sites = [entry["site"] for entry in report["sites"]]
+        self.assertEqual(report["name"], "game_lock")
+        self.assertIn("get_game_state", sites)
+        self.assertIn("perform_action:scan", sites)
+
+    def test_rejects_unknown_sort(self):
+        """Test that only known sort keys are accepted."""
+        self.assertEqual(self.get_report('?sort=name').status_code, 400)
+
+    def test_requires_admin_token(self):
+        """Test that the report is refused without the admin token."""
+        self.assertEqual(self.client.get('/debug/locks').status_code, 403)
+        wrong = self.client.get('/debug/locks', headers={"X-Admin-Token": "guess"})
+        self.assertEqual(wrong.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
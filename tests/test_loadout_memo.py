@@ -0,0 +1,101 @@
+"""Test cases for the loadout stat memo."""
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from loadout_memo import LoadoutMemo, SHIP_STATS_MEMO, POD_EFFECTS_MEMO, get_memo_stats
+from ship_system import ShipManager
+from pod_system import PodManager
+from session_manager import GameSession
+
+
+class TestLoadoutMemo(unittest.TestCase):
+    """Test cases for the memo itself."""
+
+    def test_counts_and_evicts_least_recent(self):
+        """Test hit/miss counters and least-recently-used eviction."""
+        memo = LoadoutMemo(max_entries=2)
+        calls = []
+
+        def compute(key):
+            calls.append(key)
+            return key * 2
+
+        self.assertEqual(memo.get(1, compute), 2)
+        self.assertEqual(memo.get(2, compute), 4)
+        self.assertEqual(memo.get(1, compute), 2)
+        memo.get(3, compute)
+        memo.get(1, compute)
+        memo.get(2, compute)
+
+        self.assertEqual(calls, [1, 2, 3, 2])
+        stats = memo.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 4, 2))
+
+        memo.clear()
+        self.assertEqual(memo.get_stats()["hits"], 0)
+        self.assertEqual(len(memo), 0)
+
+
+class TestMemoizedStats(unittest.TestCase):
+    """Test cases for memoized ship and pod calculations."""
+
+    def setUp(self):
+        """Start each test with empty memos."""
+        SHIP_STATS_MEMO.clear()
+        POD_EFFECTS_MEMO.clear()
+
+    def test_mod_order_shares_entry(self):
+        """Test that the same mods in any order or slot listing hit one entry."""
+        first = {"high": ["laser_cannon", "missile_launcher"], "mid": ["afterburner"], "low": []}
+        second = {"mid": ["afterburner"], "high": ["missile_launcher", "laser_cannon"]}
+        stats = ShipManager.calculate_effective_stats(None, "combat", first)
+        self.assertEqual(ShipManager.calculate_effective_stats(None, "combat", second), stats)
+        self.assertEqual(get_memo_stats()["ship_stats"]["hits"], 1)
+        self.assertEqual(get_memo_stats()["ship_stats"]["misses"], 1)
+
+        # Repeated mods stack, so they get their own entry
+        doubled = {"high": ["laser_cannon", "laser_cannon", "missile_launcher"],
+                   "mid": ["afterburner"]}
+        self.assertNotEqual(ShipManager.calculate_effective_stats(None, "combat", doubled), stats)
+
+    def test_results_are_copies(self):
+        """Test that changing a returned dict leaves the cached value alone."""
+        mods = {"high": ["laser_cannon"]}
+        stats = ShipManager.calculate_effective_stats(None, "scout", mods)
+        stats["max_hp"] += 1000
+        self.assertEqual(ShipManager.calculate_effective_stats(None, "scout", mods)["max_hp"],
+                         stats["max_hp"] - 1000)
+
+        effects = PodManager.get_pod_effects(["shield_boost"])
+        effects["max_ship_condition"] += 1000
+        self.assertEqual(PodManager.get_pod_effects(["shield_boost"])["max_ship_condition"], 20)
+
+    def test_install_time_pod_effects(self):
+        """Test that augmentations applied at install time do not break pod effects."""
+        effects = PodManager.get_pod_effects(["life_support_upgrade", "emergency_supplies"])
+        self.assertEqual(effects["pod_max_hp"], 50)
+        self.assertEqual(effects["max_ship_condition"], 0)
+
+    def test_session_effective_stats(self):
+        """Test that session effective stats still include pod and temporary effects."""
+        session = GameSession("memo-session")
+        stats = session.player_stats
+        stats["has_flight_pod"] = True
+        stats["pod_augmentations"] = ["shield_boost"]
+        stats["temp_effects"] = [{"effect_type": "temp_hp", "value": 5, "duration": 2}]
+
+        base_hp = ShipManager.calculate_effective_stats(None, stats["ship_type"],
+                                                        stats["ship_mods"])["max_hp"]
+        for _ in range(3):
+            self.assertEqual(session.get_effective_stats()["max_hp"], base_hp + 25)
+        self.assertEqual(get_memo_stats()["pod_effects"]["misses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
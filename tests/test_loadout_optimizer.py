@@ -0,0 +1,118 @@
+"""Test cases for the ship loadout optimizer."""
+import itertools
+import random
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from catalog import CATALOG, SLOT_TYPES
+from ship_system import SHIP_TYPES, SHIP_MODS, ShipManager
+from loadout_optimizer import (LoadoutSearch, OBJECTIVES, get_mod_gains, optimize_loadout,
+                               parse_objective)
+
+CATALOG_COSTS = CATALOG.mod_costs.tolist()
+CATALOG_SLOTS = [SHIP_MODS[mod_id]["slot"] for mod_id in CATALOG.mod_ids]
+
+
+def best_by_brute_force(gains, costs, slots, capacities, budget):
+    """Try every loadout and get (gain, cost) of the best one."""
+    choices = []
+    for slot, capacity in capacities.items():
+        mods = [i for i, gain in enumerate(gains) if slots[i] == slot and gain > 0]
+        choices.append([
+            picks for count in range(capacity + 1)
+            for picks in itertools.combinations(mods, count)
+        ])
+
+    best = (0.0, 0)
+    for combination in itertools.product(*choices):
+        picks = sum(combination, ())
+        cost = sum(costs[i] for i in picks)
+        gain = sum(gains[i] for i in picks)
+        if cost <= budget and (gain > best[0] + 1e-9
+                               or (abs(gain - best[0]) <= 1e-9 and cost < best[1])):
+            best = (gain, cost)
+    return best
+
+
+class TestLoadoutSearch(unittest.TestCase):
+    """Test cases for the branch-and-bound search."""
+
+    def test_matches_brute_force_on_catalog(self):
+        """Test every hull, objective and a range of budgets against brute force."""
+        objectives = list(OBJECTIVES) + ["combat_power:1,cargo_capacity:0.2,max_hp:0.5"]
+        for ship_type, ship_info in SHIP_TYPES.items():
+            for objective in objectives:
+                gains = get_mod_gains(parse_objective(objective))
+                for budget in (0, 250, 600, 1100, 2000, 10000):
+                    search = LoadoutSearch(gains, CATALOG_COSTS, CATALOG_SLOTS,
+                                           ship_info["slots"], budget)
+                    _, gain, cost = search.run()
+                    expected = best_by_brute_force(gains, CATALOG_COSTS, CATALOG_SLOTS,
+                                                   ship_info["slots"], budget)
+                    self.assertAlmostEqual(gain, expected[0], places=9)
+                    self.assertEqual(cost, expected[1])
+
+    def test_matches_brute_force_with_ties(self):
+        """Test random catalogs full of equal gains and costs against brute force."""
+        rng = random.Random(5)
+        capacities = {"high": 2, "mid": 2, "low": 1, "rig": 1}
+        for _ in range(100):
+            gains = [rng.choice([0, 1, 2, 3, 5]) for _ in range(14)]
+            costs = [rng.choice([100, 200, 300]) for _ in range(14)]
+            slots = [rng.choice(SLOT_TYPES) for _ in range(14)]
+            budget = rng.choice([300, 600, 900])
+            _, gain, cost = LoadoutSearch(gains, costs, slots, capacities, budget).run()
+            self.assertEqual((gain, cost),
+                             best_by_brute_force(gains, costs, slots, capacities, budget))
+
+    def test_large_catalog_stays_small(self):
+        """Test that a catalog of hundreds of mods is searched in few nodes."""
+        rng = random.Random(1)
+        gains = [rng.random() * 10 for _ in range(600)]
+        costs = [rng.randint(100, 900) for _ in range(600)]
+        slots = [rng.choice(SLOT_TYPES) for _ in range(600)]
+        capacities = {"high": 4, "mid": 3, "low": 3, "rig": 2}
+        for budget in (1000, 3000, 10000):
+            search = LoadoutSearch(gains, costs, slots, capacities, budget)
+            picks, _, cost = search.run()
+            self.assertLessEqual(cost, budget)
+            self.assertLess(search.nodes, 1000)
+            for slot, capacity in capacities.items():
+                self.assertLessEqual(sum(1 for i in picks if slots[i] == slot), capacity)
+
+
+class TestOptimizeLoadout(unittest.TestCase):
+    """Test cases for the optimizer entry point."""
+
+    def test_result_stats(self):
+        """Test that the result's stats are the calculator's stats for the loadout."""
+        result = optimize_loadout("combat", 1500, "combat_power")
+        self.assertEqual(result["loadout"]["high"], ["laser_cannon", "missile_launcher"])
+        self.assertEqual(result["stats"], ShipManager.calculate_effective_stats(
+            None, "combat", result["loadout"]
+        ))
+        self.assertLessEqual(result["cost"], 1500)
+
+    def test_fuel_objective_lowers_fuel_use(self):
+        """Test that optimizing fuel efficiency picks mods that lower the multiplier."""
+        result = optimize_loadout("explorer", 5000, "fuel_efficiency")
+        self.assertLess(result["stats"]["fuel_efficiency"],
+                        SHIP_TYPES["explorer"]["fuel_efficiency"])
+
+    def test_invalid_objectives(self):
+        """Test that unknown objectives, stats, weights and hulls are rejected."""
+        for objective in ("bogus", "combat_power:x", "speed:inf", "combat_power,,"):
+            with self.assertRaises(ValueError):
+                optimize_loadout("scout", 1000, objective)
+        with self.assertRaises(ValueError):
+            optimize_loadout("freighter", 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Test cases for the node name and type search index."""
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from session_manager import GameSession
+from star_map_model import StarMap
+from map_search import MapSearchIndex, RANK_EXACT, RANK_PREFIX, RANK_SUBSTRING
+
+
+def make_star_map():
+    """A single region with a handful of named nodes."""
+    names = [
+        ("N1", "planet", "New Haven"),
+        ("N2", "planet", "Old Haven III"),
+        ("N3", "station", "Deep Space Alpha-1"),
+        ("N4", "wormhole", "Stable Gateway A"),
+        ("N5", "derelict", "Ancient Station Graveyard"),
+        ("N6", "planet", "New Haven")
+    ]
+    return StarMap.from_dict({
+        "regions": {
+            "A": {
+                "id": "A",
+                "name": "Region A",
+                "type": "core_worlds",
+                "position": (0, 0),
+                "connections": [],
+                "nodes": [
+                    {"id": node_id, "type": node_type, "name": name, "position": (0, 0),
+                     "connections": []}
+                    for node_id, node_type, name in names
+                ]
+            }
+        }
+    })
+
+
+class TestMapSearchIndex(unittest.TestCase):
+    """Test cases for prefix, substring and type searches."""
+
+    def setUp(self):
+        """Build a search index over a small hand-made map."""
+        self.index = MapSearchIndex(make_star_map())
+
+    def ids(self, *args, **kwargs):
+        """Run a search and return the matching node ids."""
+        return [node.id for _, node in self.index.search(*args, **kwargs)[1]]
+
+    def test_token_prefix_search(self):
+        """Test that every query token must prefix a token of the name."""
+        self.assertEqual(self.ids("hav"), ["N1", "N6", "N2"])
+        self.assertEqual(self.ids("deep al"), ["N3"])
+        self.assertEqual(self.ids("deep haven"), [])
+
+    def test_ranking(self):
+        """Test that exact matches beat prefix matches, which beat substrings."""
+        total, results = self.index.search("new haven")
+        self.assertEqual(total, 2)
+        self.assertEqual({rank for rank, _ in results}, {RANK_EXACT})
+        ranks = {node.id: rank for rank, node in self.index.search("ave")[1]}
+        self.assertEqual(ranks["N5"], RANK_SUBSTRING)
+        self.assertEqual(self.index.search("gate")[1][0][0], RANK_PREFIX)
+
+    def test_type_filters(self):
+        """Test type-only searches and type-filtered name searches."""
+        self.assertEqual(self.ids("", ["wormhole"]), ["N4"])
+        self.assertEqual(self.ids("station"), ["N5"])
+        self.assertEqual(self.ids("station", ["planet"]), [])
+        self.assertEqual(self.ids(""), [])
+
+    def test_limit_and_total(self):
+        """Test that the total counts every match regardless of the limit."""
+        total, results = self.index.search("haven", limit=1)
+        self.assertEqual(total, 3)
+        self.assertEqual(len(results), 1)
+
+    def test_generated_map(self):
+        """Test that every generated node can be found by its own name."""
+        star_map = StarMap.generate()
+        index = MapSearchIndex(star_map)
+        for node in star_map.nodes:
+            found = [n.id for _, n in index.search(node.name, limit=200)[1]]
+            self.assertIn(node.id, found)
+
+    def test_session_builds_index_on_first_search(self):
+        """Test that sessions only pay for the index once something is searched."""
+        session = GameSession("lazy-search")
+        self.assertIsNone(session.map_search)
+        index = session.get_map_search()
+        self.assertIs(session.get_map_search(), index)
+        self.assertEqual(len(index), len(session.star_map.nodes))
+
+
+if __name__ == '__main__':
+    unittest.main()
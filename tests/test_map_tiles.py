@@ -0,0 +1,152 @@
+"""Test cases for the spatial grid and viewport tile queries."""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from star_map_index import StarMapIndex
+from star_map_model import StarMap
+from map_tiles import SpatialGrid, MapTileIndex, DETAIL_ZOOM_LEVEL
+
+
+def make_node(node_id, region_id, position):
+    """Build a node dict in the star map format."""
+    return {
+        "id": node_id,
+        "type": "planet",
+        "region_id": region_id,
+        "name": node_id,
+        "position": position,
+        "connections": [],
+        "discovered": False,
+        "visited": False,
+        "has_repair": True,
+        "has_trade": False,
+        "danger_level": 0.1
+    }
+
+
+def make_star_map():
+    """Two regions far apart, each with two nodes."""
+    return StarMap.from_dict({
+        "regions": {
+            "A": {
+                "id": "A",
+                "name": "Region A",
+                "type": "core_worlds",
+                "position": (0, 0),
+                "connections": ["B"],
+                "nodes": [make_node("A1", "A", (-10, 0)), make_node("A2", "A", (10, 0))]
+            },
+            "B": {
+                "id": "B",
+                "name": "Region B",
+                "type": "frontier",
+                "position": (1000, 1000),
+                "connections": ["A"],
+                "nodes": [make_node("B1", "B", (0, -20)), make_node("B2", "B", (0, 20))]
+            }
+        }
+    })
+
+
+class TestSpatialGrid(unittest.TestCase):
+    """Test cases for the uniform grid."""
+
+    def test_query_matches_brute_force(self):
+        """Test that grid queries return exactly the points inside the box."""
+        rng = np.random.default_rng(7)
+        points = rng.uniform(-500, 500, size=(400, 2))
+        grid = SpatialGrid(points)
+        for _ in range(20):
+            low = rng.uniform(-600, 400, size=2)
+            high = low + rng.uniform(0, 400, size=2)
+            expected = np.flatnonzero(
+                (points[:, 0] >= low[0]) & (points[:, 0] <= high[0]) &
+                (points[:, 1] >= low[1]) & (points[:, 1] <= high[1])
+            )
+            result = grid.query(low[0], low[1], high[0], high[1])
+            self.assertEqual(result.tolist(), expected.tolist())
+
+    def test_huge_bbox(self):
+        """Test that a huge but finite box finds every point instead of overflowing."""
+        grid = SpatialGrid([[0, 0], [5, 5], [10, 10]])
+        self.assertEqual(grid.query(-1e308, -1e308, 1e308, 1e308).tolist(), [0, 1, 2])
+        self.assertEqual(grid.query(1e308, 1e308, 1e308, 1e308).tolist(), [])
+        self.assertEqual(grid.query(-1e308, -1e308, -1e300, -1e300).tolist(), [])
+
+    def test_empty_grid(self):
+        """Test that an empty grid answers every query with nothing."""
+        grid = SpatialGrid([])
+        self.assertEqual(len(grid.query(-1, -1, 1, 1)), 0)
+
+
+class TestMapTileIndex(unittest.TestCase):
+    """Test cases for viewport tiles over a star map."""
+
+    def setUp(self):
+        """Build a tile index over a small hand-made map."""
+        star_map = make_star_map()
+        self.tiles = MapTileIndex(star_map, StarMapIndex(star_map))
+
+    def test_low_zoom_returns_region_summaries(self):
+        """Test that low zoom levels only return region centroids."""
+        tile = self.tiles.get_tile([-100, -100, 2000, 2000], zoom=DETAIL_ZOOM_LEVEL - 1)
+        self.assertEqual(tile["level_of_detail"], "regions")
+        self.assertNotIn("nodes", tile)
+        self.assertEqual([r["id"] for r in tile["regions"]], ["A", "B"])
+        self.assertEqual((tile["regions"][1]["x"], tile["regions"][1]["y"]), (1000.0, 1000.0))
+        self.assertEqual(tile["regions"][1]["repair_count"], 2)
+
+    def test_detail_zoom_returns_nodes_in_view(self):
+        """Test that detail zoom returns only the nodes inside the box."""
+        tile = self.tiles.get_tile([900, 900, 1100, 1010], zoom=DETAIL_ZOOM_LEVEL)
+        self.assertEqual(tile["level_of_detail"], "nodes")
+        self.assertEqual([r["id"] for r in tile["regions"]], ["B"])
+        self.assertEqual([n["id"] for n in tile["nodes"]], ["B1"])
+
+    def test_generated_map_bounds_cover_everything(self):
+        """Test that a tile over the map bounds contains every node."""
+        star_map = StarMap.generate()
+        tiles = MapTileIndex(star_map, StarMapIndex(star_map))
+        tile = tiles.get_tile(zoom=DETAIL_ZOOM_LEVEL)
+        self.assertEqual(len(tile["nodes"]), len(star_map))
+        self.assertEqual(len(tile["regions"]), len(star_map.regions))
+
+
+class TestTilesEndpoint(unittest.TestCase):
+    """Test cases for validating the tiles endpoint's viewport."""
+
+    def test_rejects_malformed_bbox(self):
+        """Test that bboxes that are short, inverted or not finite are rejected."""
+        client = app_module.app.test_client()
+        for bbox in ("0,0,10", "10,0,0,10", "0,0,inf,10", "nan,0,10,10", "-inf,0,10,10"):
+            response = client.get(f'/api/game/map/missing/tiles?bbox={bbox}')
+            self.assertEqual(response.status_code, 400, bbox)
+        response = client.get('/api/game/map/missing/tiles?bbox=0,0,10,10')
+        self.assertEqual(response.status_code, 404)
+
+    def test_huge_bbox_covers_the_map(self):
+        """Test that a huge but finite bbox returns the same as the map bounds."""
+        client = app_module.app.test_client()
+        client.post('/api/game/new', json={"session_id": "huge-bbox", "force_new": True})
+        try:
+            whole = client.get('/api/game/map/huge-bbox/tiles').get_json()
+            huge = client.get('/api/game/map/huge-bbox/tiles'
+                              '?bbox=-1e308,-1e308,1e308,1e308').get_json()
+        finally:
+            app_module.session_manager.remove_session("huge-bbox")
+        self.assertGreater(len(whole["nodes"]), 0)
+        self.assertEqual(len(huge["nodes"]), len(whole["nodes"]))
+        self.assertEqual(len(huge["regions"]), len(whole["regions"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Test cases for latency histograms and the metrics endpoints."""
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from metrics import (Histogram, HistogramFamily, LATENCY_BOUNDS, get_bucket_index,
+                     get_bucket_range, reset_metrics)
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for the log-linear histogram."""
+
+    def test_buckets_cover_values(self):
+        """Test that every value falls inside its bucket and buckets stay narrow."""
+        for value in list(range(5000)) + [123456789, 2 ** 39]:
+            lower, upper = get_bucket_range(get_bucket_index(value))
+            self.assertLessEqual(lower, value)
+            self.assertLess(value, upper)
+            self.assertLessEqual(upper - lower, max(1, lower / 8))
+
+    def test_quantiles_within_precision(self):
+        """Test that quantiles land within a bucket's width of the exact values."""
+        rng = random.Random(7)
+        values = sorted(rng.randint(100, 1000000) for _ in range(5000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        for quantile in (0.5, 0.95, 0.99):
+            exact = values[round(quantile * len(values)) - 1]
+            self.assertAlmostEqual(histogram.get_quantile(quantile), exact, delta=exact * 0.07)
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual(histogram.max, values[-1])
+
+    def test_prometheus_buckets(self):
+        """Test that exported buckets are cumulative and end with the total count."""
+        family = HistogramFamily("test_seconds", "Test", ("kind",), 1e-6, LATENCY_BOUNDS)
+        for seconds in (0.00005, 0.0003, 0.002, 0.002, 5.0):
+            family.observe(seconds, "a")
+
+        lines = family.render()
+        self.assertIn('test_seconds_bucket{kind="a",le="0.000064"} 1', lines)
+        self.assertIn('test_seconds_bucket{kind="a",le="0.004096"} 4', lines)
+        self.assertIn('test_seconds_bucket{kind="a",le="+Inf"} 5', lines)
+        self.assertIn('test_seconds_count{kind="a"} 5', lines)
+        self.assertIn('test_seconds_sum{kind="a"} 5.00435', lines)
+
+
+class TestMetricsEndpoints(unittest.TestCase):
+    """Test cases for /metrics and /api/metrics."""
+
+    def setUp(self):
+        """Start a game with scratch saves and no recorded metrics."""
+        self.save_dir = tempfile.TemporaryDirectory()
+        self.saved_dir_path = config.SAVE_DIR_PATH
+        config.SAVE_DIR_PATH = self.save_dir.name
+        reset_metrics()
+        self.client = app_module.app.test_client()
+        self.client.post('/api/game/new', json={"session_id": "metrics", "force_new": True})
+
+    def tearDown(self):
+        app_module.session_manager.remove_session("metrics")
+        config.SAVE_DIR_PATH = self.saved_dir_path
+        self.save_dir.cleanup()
+
+    def test_prometheus_export(self):
+        """Test that routes, actions and auto-saves show up in the Prometheus export."""
+        self.client.post('/api/game/action/metrics', json={"action": "scan"})
+        self.client.post('/api/game/action/metrics', json={"action": "mine"})
+        self.client.post('/api/game/action/metrics', json={"action": "warp_drive"})
+
+        response = self.client.get('/metrics')
+        text = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn('cosmic_active_sessions ', text)
+        self.assertIn('cosmic_http_request_duration_seconds_count'
+                      '{endpoint="perform_action",method="POST",status="200"} 3', text)
+        self.assertIn('cosmic_action_duration_seconds_count'
+                      '{action="scan",outcome="success"} 1', text)
+        self.assertIn('cosmic_action_duration_seconds_count'
+                      '{action="unknown",outcome="error"} 1', text)
+        self.assertIn('cosmic_autosave_duration_seconds_count{outcome="ok"} 1', text)
+        self.assertIn('cosmic_autosave_bytes_count 1', text)
+        self.assertIn('cosmic_json_encode_seconds_count{endpoint="perform_action"} 3', text)
+
+    def test_json_summary(self):
+        """Test that the JSON summary has quantiles for every label combination."""
+        self.client.get('/api/game/state/metrics')
+        summary = self.client.get('/api/metrics').get_json()
+
+        requests = summary["histograms"]["cosmic_http_request_duration_seconds"]
+        state_row = next(row for row in requests if row["endpoint"] == "get_game_state")
+        self.assertEqual(state_row["count"], 1)
+        self.assertLessEqual(state_row["p50"], state_row["max"])
+        self.assertGreater(summary["gauges"]["cosmic_active_sessions"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Test cases for the navigation system and reachability queries."""
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from navigation_system import NavigationManager, ReachabilityCache
+from star_map_model import StarMap
+
+
+def make_node(node_id, region_id, node_type="planet", connections=None, discovered=False):
+    """Build a node dict in the star map format."""
+    return {
+        "id": node_id,
+        "type": node_type,
+        "region_id": region_id,
+        "name": node_id,
+        "position": (0, 0),
+        "connections": connections or [],
+        "discovered": discovered,
+        "visited": False,
+        "has_repair": False,
+        "has_trade": False,
+        "danger_level": 0.1
+    }
+
+
+def make_star_map():
+    """Two connected regions: A1 - A2 - A3 (wormhole) and B1 - B2."""
+    return StarMap.from_dict({
+        "regions": {
+            "A": {
+                "id": "A",
+                "name": "Region A",
+                "type": "core_worlds",
+                "position": (0, 0),
+                "connections": ["B"],
+                "nodes": [
+                    make_node("A1", "A", connections=["A2"], discovered=True),
+                    make_node("A2", "A", connections=["A1", "A3"]),
+                    make_node("A3", "A", node_type="wormhole", connections=["A2"])
+                ]
+            },
+            "B": {
+                "id": "B",
+                "name": "Region B",
+                "type": "frontier",
+                "position": (300, 0),
+                "connections": ["A"],
+                "nodes": [
+                    make_node("B1", "B", connections=["B2"]),
+                    make_node("B2", "B", connections=["B1"], discovered=True)
+                ]
+            }
+        }
+    })
+
+
+class TestNavigationManager(unittest.TestCase):
+    """Test cases for fuel costs and reachability searches."""
+
+    def test_fuel_costs(self):
+        """Test travel and jump fuel costs."""
+        self.assertEqual(NavigationManager.get_jump_fuel_cost("wormhole"), 20)
+        self.assertEqual(NavigationManager.get_jump_fuel_cost("planet"), 50)
+        self.assertLessEqual(
+            NavigationManager.get_travel_fuel_cost(0.8),
+            NavigationManager.get_travel_fuel_cost(1.0)
+        )
+
+    def test_reachable_within_region(self):
+        """Test that only nodes within the fuel budget are returned."""
+        reachable = NavigationManager.find_reachable(make_star_map(), "A", "A1", 9, 4)
+        self.assertEqual(reachable["nodes"], {"A1": 0, "A2": 4, "A3": 8})
+        self.assertEqual(reachable["regions"], {"A": 0})
+
+    def test_wormhole_jump_is_cheapest_route(self):
+        """Test that jumps land on the entry node with the minimum cost."""
+        reachable = NavigationManager.find_reachable(make_star_map(), "A", "A1", 100, 4)
+        # Walking to the wormhole (8) and jumping (20) beats jumping from A1 (50)
+        self.assertEqual(reachable["regions"]["B"], 28)
+        self.assertEqual(reachable["nodes"]["B2"], 28)
+        self.assertEqual(reachable["nodes"]["B1"], 32)
+        self.assertEqual(reachable["unknown_entry"], [])
+
+    def test_undiscovered_region_entry(self):
+        """Test that regions with a random entry node are not expanded."""
+        star_map = make_star_map()
+        star_map.get_node("B2").discovered = False
+        reachable = NavigationManager.find_reachable(star_map, "A", "A1", 100, 4)
+        self.assertEqual(reachable["regions"]["B"], 28)
+        self.assertEqual(reachable["unknown_entry"], ["B"])
+        self.assertNotIn("B1", reachable["nodes"])
+        self.assertNotIn("B2", reachable["nodes"])
+
+
+class TestReachabilityCache(unittest.TestCase):
+    """Test cases for the reachability cache."""
+
+    def test_cache_reuses_larger_search(self):
+        """Test that a search is reused for smaller fuel amounts."""
+        cache = ReachabilityCache()
+        star_map = make_star_map()
+        full = cache.get_reachable(star_map, 0, "A", "A1", 100, 4)
+        partial = cache.get_reachable(star_map, 0, "A", "A1", 9, 4)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertIn("B2", full["nodes"])
+        self.assertEqual(partial["nodes"], {"A1": 0, "A2": 4, "A3": 8})
+
+    def test_cache_invalidation(self):
+        """Test that map or fuel efficiency changes force a new search."""
+        cache = ReachabilityCache()
+        star_map = make_star_map()
+        cache.get_reachable(star_map, 0, "A", "A1", 100, 4)
+        cache.get_reachable(star_map, 0, "A", "A1", 100, 3)
+        cache.get_reachable(star_map, 1, "A", "A1", 100, 3)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(len(cache.entries), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
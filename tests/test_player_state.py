@@ -0,0 +1,85 @@
+"""Test cases for the typed player stats and session memory accounting."""
+import json
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from config import config
+from player_state import PlayerStats, PLAYER_STAT_FIELDS
+from memory_accounting import deep_sizeof
+from session_manager import GameSession
+
+
+class TestPlayerStats(unittest.TestCase):
+    """Test cases for dict-style access and change tracking."""
+
+    def setUp(self):
+        """Create stats for a new game."""
+        self.stats = PlayerStats()
+
+    def test_new_game_defaults(self):
+        """Test that a new player starts with the configured stats."""
+        self.assertEqual(self.stats["fuel"], config.STARTING_FUEL)
+        self.assertEqual(self.stats.ship_type, "scout")
+        self.assertFalse(self.stats.get("in_combat"))
+        self.assertEqual(list(self.stats.to_dict()), list(PLAYER_STAT_FIELDS))
+        self.assertEqual(self.stats.pop_dirty(), set())
+
+    def test_dict_access(self):
+        """Test the dict operations used by handlers."""
+        self.stats["wealth"] += 50
+        self.assertEqual(self.stats.wealth, config.STARTING_WEALTH + 50)
+        self.assertIn("just_bought_pod", self.stats)
+        self.assertNotIn("unknown_stat", self.stats)
+        self.assertEqual(self.stats.get("unknown_stat", 3), 3)
+        with self.assertRaises(KeyError):
+            self.stats["unknown_stat"]
+
+    def test_extras_and_save_round_trip(self):
+        """Test that unknown keys survive a save and load."""
+        self.stats.update({"fuel": 12, "legacy_flag": True})
+        saved = json.loads(json.dumps(self.stats.to_dict()))
+        loaded = PlayerStats(**saved)
+        self.assertEqual(loaded.fuel, 12)
+        self.assertTrue(loaded["legacy_flag"])
+        self.assertEqual(loaded.to_dict(), saved)
+
+    def test_dirty_tracking(self):
+        """Test that changes, and containers read through the dict API, are tracked."""
+        self.stats["fuel"] = self.stats.fuel
+        self.stats.health -= 10
+        self.stats.inventory.append({"item_id": "ore", "quantity": 1})
+        self.assertEqual(self.stats.pop_dirty(), {"health"})
+
+        self.stats["inventory"].append({"item_id": "ore", "quantity": 1})
+        self.assertEqual(self.stats.pop_dirty(), {"inventory"})
+        self.assertEqual(self.stats.pop_dirty(), set())
+
+
+class TestSessionMemoryReport(unittest.TestCase):
+    """Test cases for per-session memory accounting."""
+
+    def test_report_components(self):
+        """Test that the report splits a session into its parts."""
+        session = GameSession("memory-test")
+        session.get_map_index()
+        report = session.get_memory_report()
+        components = report["components"]
+        self.assertEqual(report["total_bytes"], sum(components.values()))
+        self.assertGreater(components["star_map"], components["player_stats"])
+        self.assertGreater(components["map_index"], 0)
+        self.assertGreater(components["other"], 0)
+
+    def test_slotted_stats_smaller_than_dict(self):
+        """Test that slotted stats take less memory than the dict form."""
+        stats = PlayerStats()
+        self.assertLess(deep_sizeof(stats), deep_sizeof(stats.to_dict()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Test cases for the profiling debug endpoints."""
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from profiler import StackSampler
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-token"}
+
+
+def spin_until(deadline):
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+class TestStackSampler(unittest.TestCase):
+    """Test cases for sampling thread stacks."""
+
+    def test_samples_busy_thread(self):
+        """Test that a busy thread's stack shows up, prefixed with its name."""
+        worker = threading.Thread(target=spin_until, args=(time.perf_counter() + 0.3,),
+                                  name="busy-worker")
+        sampler = StackSampler(interval=0.005, exclude_idents=[threading.get_ident()])
+        worker.start()
+        sampler.start()
+        worker.join()
+        sampler.stop()
+
+        lines = sampler.get_collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        self.assertGreater(sampler.samples, 0)
+        self.assertTrue(any("test_profiler.py:spin_until" in line for line in busy))
+        self.assertFalse(any(line.startswith("MainThread;") for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+
+class TestProfileEndpoints(unittest.TestCase):
+    """Test cases for /debug/profile and X-Profile."""
+
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.saved_settings = (config.ADMIN_TOKEN, config.SAVE_DIR_PATH)
+        config.ADMIN_TOKEN = "test-token"
+        config.SAVE_DIR_PATH = self.scratch.name
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        config.ADMIN_TOKEN, config.SAVE_DIR_PATH = self.saved_settings
+        app_module.session_manager.remove_session("profiled")
+        self.scratch.cleanup()
+
+    def test_requires_admin_token(self):
+        """Test that profiling needs the admin token, and is off without one configured."""
+        self.assertEqual(self.client.get('/debug/profile?seconds=0.01').status_code, 403)
+        config.ADMIN_TOKEN = ""
+        response = self.client.get('/debug/profile?seconds=0.01',
+                                   headers={"X-Admin-Token": ""})
+        self.assertEqual(response.status_code, 403)
+
+    def test_process_profile(self):
+        """Test that a process profile returns collapsed stacks."""
+        response = self.client.get('/debug/profile?seconds=0.05', headers=ADMIN_HEADERS)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response.headers['X-Profile-Samples']), 0)
+        self.assertIn("app.py:cleanup_sessions", response.get_data(as_text=True))
+
+        response = self.client.get('/debug/profile?seconds=600', headers=ADMIN_HEADERS)
+        self.assertEqual(response.status_code, 400)
+
+    def test_request_profile(self):
+        """Test that X-Profile captures one request, readable as text or with pstats."""
+        self.client.post('/api/game/new', json={"session_id": "profiled", "force_new": True})
+        response = self.client.post('/api/game/action/profiled', json={"action": "scan"},
+                                    headers=dict(ADMIN_HEADERS, **{"X-Profile": "1"}))
+        profile_id = response.headers['X-Profile-Id']
+
+        text = self.client.get(f'/debug/profile/{profile_id}', headers=ADMIN_HEADERS)
+        self.assertIn("perform_action", text.get_data(as_text=True))
+
+        data = self.client.get(f'/debug/profile/{profile_id}?format=pstats',
+                               headers=ADMIN_HEADERS).data
+        path = os.path.join(self.scratch.name, "request.pstats")
+        with open(path, "wb") as f:
+            f.write(data)
+        functions = [function for _, _, function in pstats.Stats(path).stats]
+        self.assertIn("handle_scan", functions)
+
+        unprofiled = self.client.post('/api/game/action/profiled', json={"action": "scan"},
+                                      headers={"X-Profile": "1"})
+        self.assertNotIn('X-Profile-Id', unprofiled.headers)
+        missing = self.client.get('/debug/profile/unknown', headers=ADMIN_HEADERS)
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
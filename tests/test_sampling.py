@@ -0,0 +1,113 @@
+"""Test cases for alias table sampling."""
+import random
+import unittest
+import sys
+import os
+from collections import Counter
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from sampling import (AliasTable, get_encounter_table, get_encounter_weights, get_loot_table,
+                      get_drop_table)
+from inventory_system import ITEM_TYPES, InventoryManager
+from combat_system import ENEMY_TYPES, ENEMY_LOOT_CHANCES
+from action_processor import SALVAGE_CHANCES
+
+DRAWS = 20000
+
+
+def linear_encounter_distribution(danger_level, location_type=None):
+    """Enemy odds as the original normalize-and-walk generate_encounter had them."""
+    weights = get_encounter_weights(danger_level, location_type)
+    total = sum(weights.values())
+    return {enemy_type: weight / total for enemy_type, weight in weights.items()}
+
+
+def roll_each_entry(chances):
+    """Roll every entry independently, as the original loot loops did."""
+    return tuple(i for i, chance in enumerate(chances) if random.random() < chance)
+
+
+class TestAliasTable(unittest.TestCase):
+    """Test cases for the alias table itself."""
+
+    def test_encodes_weights(self):
+        """Test that the table encodes exactly the normalized weights."""
+        weights = [5, 0, 1, 3.5, 0.25]
+        table = AliasTable("abcde", weights)
+        distribution = table.get_distribution()
+        for outcome, weight in zip("abcde", weights):
+            self.assertAlmostEqual(distribution[outcome], weight / sum(weights), places=12)
+
+    def test_sample_frequencies(self):
+        """Test that draws follow the weights."""
+        random.seed(11)
+        table = AliasTable(["x", "y", "z"], [0.7, 0.2, 0.1])
+        counts = Counter(table.sample() for _ in range(DRAWS))
+        self.assertAlmostEqual(counts["x"] / DRAWS, 0.7, delta=0.015)
+        self.assertAlmostEqual(counts["y"] / DRAWS, 0.2, delta=0.015)
+        self.assertAlmostEqual(counts["z"] / DRAWS, 0.1, delta=0.015)
+        self.assertEqual(counts["missing"], 0)
+
+    def test_rejects_empty_weights(self):
+        """Test that a table needs some positive weight."""
+        with self.assertRaises(ValueError):
+            AliasTable(["a"], [0])
+
+
+class TestGameTables(unittest.TestCase):
+    """Test cases checking each table against the sampling it replaced."""
+
+    def test_encounter_tables(self):
+        """Test encounter odds for every node danger level and location type."""
+        for danger_level in (0.1, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0):
+            for location_type in (None, "nebula", "ancient_ruins"):
+                expected = linear_encounter_distribution(danger_level, location_type)
+                actual = get_encounter_table(danger_level, location_type).get_distribution()
+                self.assertEqual(set(actual), set(ENEMY_TYPES))
+                for enemy_type, probability in expected.items():
+                    self.assertAlmostEqual(actual[enemy_type], probability, places=12)
+
+    def test_loot_tables(self):
+        """Test that random loot is uniform over the same eligible items."""
+        for category, value_range in ((None, (10, 200)), ("trade", (0, 1000)), ("quest", (0, 10))):
+            expected = [
+                item_id for item_id, info in ITEM_TYPES.items()
+                if info["category"] != "quest"
+                and (not category or info["category"] == category)
+                and value_range[0] <= info["base_value"] <= value_range[1]
+            ]
+            table = get_loot_table(category, value_range)
+            if not expected:
+                self.assertIsNone(table)
+                self.assertIsNone(InventoryManager.generate_random_loot(category, value_range))
+                continue
+            distribution = table.get_distribution()
+            self.assertEqual(sorted(distribution), sorted(expected))
+            for probability in distribution.values():
+                self.assertAlmostEqual(probability, 1 / len(expected), places=12)
+
+    def test_drop_tables_match_independent_rolls(self):
+        """Test drop tables against rolling each loot and salvage entry in turn."""
+        cases = [(chances, 1.0) for chances in ENEMY_LOOT_CHANCES.values()]
+        cases.append((SALVAGE_CHANCES, 1.5))
+        for chances, scale in cases:
+            odds = [min(1.0, chance * scale) for chance in chances]
+            distribution = get_drop_table(chances, scale).get_distribution()
+            self.assertAlmostEqual(sum(distribution.values()), 1.0, places=12)
+            for index, chance in enumerate(odds):
+                dropped = sum(p for outcome, p in distribution.items() if index in outcome)
+                self.assertAlmostEqual(dropped, chance, places=12)
+
+            # Whole subsets, not just each entry, match the sequential rolls
+            random.seed(5)
+            rolled = Counter(roll_each_entry(odds) for _ in range(DRAWS))
+            for outcome, probability in distribution.items():
+                self.assertAlmostEqual(rolled[outcome] / DRAWS, probability, delta=0.015)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Test cases for session memory accounting and the memory budget."""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from session_manager import GameSession, SessionManager
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Test cases for hibernating sessions over the memory budget."""
+
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.saved_settings = (config.SAVE_DIR_PATH, config.SESSION_MEMORY_BUDGET_MB,
+                               config.SESSION_EVICTION_POLICY)
+        config.SAVE_DIR_PATH = self.scratch.name
+        self.manager = SessionManager()
+
+    def tearDown(self):
+        (config.SAVE_DIR_PATH, config.SESSION_MEMORY_BUDGET_MB,
+         config.SESSION_EVICTION_POLICY) = self.saved_settings
+        self.scratch.cleanup()
+
+    def fit_budget(self):
+        """Set the budget to just hold the sessions in memory now"""
+        total = sum(self.manager.get_session_memory(session)["total_bytes"]
+                    for session in self.manager.sessions.values())
+        config.SESSION_MEMORY_BUDGET_MB = total / (1024 * 1024)
+
+    def add_cargo(self, session):
+        """Fill a session's inventory so it clearly outweighs a new session"""
+        session.player_stats["inventory"].extend({"item_id": "scrap_metal", "quantity": n}
+                                                 for n in range(2000))
+        session.update_activity()
+
+    def test_stats_report_memory_components(self):
+        """Test that session stats break each session's memory into its parts."""
+        self.manager.create_session("alpha")
+        stats = self.manager.get_session_stats()
+        session_stats = stats["sessions"]["alpha"]
+        for name in ("star_map", "player_stats.inventory", "combat_manager", "statistics"):
+            self.assertIn(name, session_stats["memory"])
+        self.assertEqual(session_stats["memory_bytes"], sum(session_stats["memory"].values()))
+        self.assertEqual(stats["memory"]["total_bytes"], session_stats["memory_bytes"])
+        self.assertEqual(stats["memory"]["budget_bytes"], 0)
+
+    def test_lru_hibernates_least_recent_and_wakes_on_use(self):
+        """Test that the least recently active session goes to disk and comes back intact."""
+        oldest = self.manager.create_session("oldest")
+        oldest.turn_count = 7
+        oldest.current_event = "market"
+        self.add_cargo(oldest)
+        self.manager.create_session("newer").update_activity()
+        self.fit_budget()
+
+        self.manager.create_session("newest")
+        self.assertEqual(sorted(self.manager.sessions), ["newer", "newest"])
+        self.assertEqual(self.manager.hibernations, 1)
+        filepath = self.manager.hibernated["oldest"][0]
+        self.assertTrue(os.path.exists(filepath))
+
+        woken = self.manager.get_session("oldest")
+        self.assertEqual(woken.turn_count, 7)
+        self.assertEqual(woken.player_stats["inventory"], oldest.player_stats["inventory"])
+        self.assertEqual(woken.current_event, "market")
+        self.assertEqual(woken.last_activity, oldest.last_activity)
+        self.assertFalse(os.path.exists(filepath))
+        # Waking the large session pushes the two newer ones out in turn
+        self.assertEqual(list(self.manager.sessions), ["oldest"])
+        self.assertEqual(sorted(self.manager.hibernated), ["newer", "newest"])
+
+    def test_largest_policy(self):
+        """Test that the largest policy hibernates the biggest session, even if recent."""
+        config.SESSION_EVICTION_POLICY = "largest"
+        self.manager.create_session("small")
+        self.add_cargo(self.manager.create_session("big"))
+        self.fit_budget()
+
+        self.manager.create_session("third")
+        self.assertEqual(list(self.manager.hibernated), ["big"])
+
+    def test_removed_sessions_delete_hibernation_file(self):
+        """Test that removing or replacing a hibernated session deletes its file."""
+        self.manager.create_session("gone")
+        self.assertTrue(self.manager.hibernate_session("gone"))
+        filepath = self.manager.hibernated["gone"][0]
+        self.manager.create_session("gone", force_new=True)
+        self.assertFalse(os.path.exists(filepath))
+        self.assertEqual(self.manager.hibernated, {})
+
+    def test_wake_skips_map_generation(self):
+        """Test that waking loads the saved map without generating a new one first."""
+        session = self.manager.create_session("sleeper")
+        self.manager.hibernate_session("sleeper")
+        with mock.patch("session_manager.StarMap.generate") as generate:
+            woken = self.manager.get_session("sleeper")
+        generate.assert_not_called()
+        self.assertEqual(woken.current_node_id, session.current_node_id)
+        self.assertEqual(len(woken.star_map.nodes), len(session.star_map.nodes))
+
+    def test_failed_wake_keeps_session_hibernated(self):
+        """Test that a session whose file cannot be read stays hibernated with its file."""
+        self.manager.create_session("broken")
+        self.manager.hibernate_session("broken")
+        filepath = self.manager.hibernated["broken"][0]
+        with open(filepath, "w") as f:
+            f.write("{not json")
+
+        with self.assertLogs("session_manager", "ERROR"):
+            self.assertIsNone(self.manager.get_session("broken"))
+        self.assertIn("broken", self.manager.hibernated)
+        self.assertTrue(os.path.exists(filepath))
+
+    def test_reachability_searches_refresh_the_report(self):
+        """Test that cached reachability searches invalidate the memory report."""
+        session = self.manager.create_session("explorer")
+        before = self.manager.get_session_memory(session)
+        session.reachability_cache.get_reachable(
+            session.star_map, session.map_version, session.current_region_id,
+            session.current_node_id, 100, 5)
+        after = self.manager.get_session_memory(session)
+        self.assertGreater(after["components"]["reachability_cache"],
+                           before["components"]["reachability_cache"])
+
+    def test_budget_check_reuses_estimates(self):
+        """Test that creating a session under budget only measures the new session."""
+        config.SESSION_MEMORY_BUDGET_MB = 1024
+        self.manager.create_session("first")
+        self.manager.create_session("second").update_activity()
+        with mock.patch.object(GameSession, "get_memory_report", autospec=True,
+                               side_effect=GameSession.get_memory_report) as measure:
+            self.manager.create_session("third")
+        self.assertEqual([call.args[0].session_id for call in measure.call_args_list],
+                         ["third"])
+
+
+class TestSessionReport(unittest.TestCase):
+    """Test cases for the /debug/sessions endpoint."""
+
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.saved_settings = (config.ADMIN_TOKEN, config.SAVE_DIR_PATH)
+        config.ADMIN_TOKEN = "test-token"
+        config.SAVE_DIR_PATH = self.scratch.name
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        config.ADMIN_TOKEN, config.SAVE_DIR_PATH = self.saved_settings
+        app_module.session_manager.remove_session("reported")
+        self.scratch.cleanup()
+
+    def test_session_report(self):
+        """Test that the report needs the admin token and lists session memory."""
+        self.client.post('/api/game/new', json={"session_id": "reported", "force_new": True})
+        self.assertEqual(self.client.get('/debug/sessions').status_code, 403)
+
+        report = self.client.get('/debug/sessions',
+                                 headers={"X-Admin-Token": "test-token"}).get_json()
+        self.assertGreater(report["sessions"]["reported"]["memory_bytes"], 0)
+        self.assertIn("hibernated_sessions", report["memory"])
+
+    def test_memory_route_uses_cached_report(self):
+        """Test that the public memory route reuses the session manager's cached report."""
+        self.client.post('/api/game/new', json={"session_id": "reported", "force_new": True})
+        first = self.client.get('/api/game/memory/reported').get_json()
+        with mock.patch.object(GameSession, "get_memory_report") as measure:
+            second = self.client.get('/api/game/memory/reported').get_json()
+        measure.assert_not_called()
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
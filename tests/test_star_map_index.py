@@ -0,0 +1,168 @@
+"""Test cases for the columnar star map index."""
+import random
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from action_processor import ActionProcessor
+from regions import generate_new_star_map
+from session_manager import GameSession
+from star_map_index import StarMapIndex
+from star_map_model import StarMap
+
+
+def make_node(node_id, node_type, position, connections, has_repair=False, has_trade=False,
+              danger_level=0.1):
+    """Build a node dict in the star map format."""
+    return {
+        "id": node_id,
+        "type": node_type,
+        "region_id": "A",
+        "name": node_id,
+        "position": position,
+        "connections": connections,
+        "discovered": False,
+        "visited": False,
+        "has_repair": has_repair,
+        "has_trade": has_trade,
+        "danger_level": danger_level
+    }
+
+
+def make_star_map():
+    """A single region laid out as a chain: A1 - A2 - A3 - A4."""
+    return StarMap.from_dict({
+        "regions": {
+            "A": {
+                "id": "A",
+                "name": "Region A",
+                "type": "core_worlds",
+                "position": (100, 0),
+                "connections": [],
+                "nodes": [
+                    make_node("A1", "anomaly", (0, 0), ["A2"], danger_level=0.8),
+                    make_node("A2", "derelict", (10, 0), ["A1", "A3"], has_trade=True,
+                              danger_level=0.7),
+                    make_node("A3", "asteroid_field", (20, 0), ["A2", "A4"], has_repair=True,
+                              danger_level=0.6),
+                    make_node("A4", "station", (30, 0), ["A3"], has_repair=True,
+                              has_trade=True, danger_level=0.1)
+                ]
+            }
+        }
+    })
+
+
+class TestStarMapIndex(unittest.TestCase):
+    """Test cases for vectorized star map queries."""
+
+    def setUp(self):
+        """Build an index over a small hand-made map."""
+        self.index = StarMapIndex(make_star_map())
+
+    def test_columns_mirror_dict(self):
+        """Test that every node gets a row with absolute positions."""
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(tuple(self.index.positions[self.index.node_rows["A3"]]), (120.0, 0.0))
+        self.assertEqual(self.index.has_repair.sum(), 2)
+
+    def test_find_nearest(self):
+        """Test nearest-node queries with filters."""
+        self.assertEqual(self.index.find_nearest("A1", has_repair=True), "A3")
+        self.assertEqual(self.index.find_nearest("A1", node_types=["station"]), "A4")
+        self.assertIsNone(self.index.find_nearest("A1", node_types=["wormhole"]))
+
+    def test_find_within(self):
+        """Test distance-bounded queries."""
+        within = self.index.find_within("A1", 25, has_trade=True)
+        self.assertEqual([node_id for node_id, _ in within], ["A2"])
+
+    def test_safest_neighbor_and_next_hop(self):
+        """Test neighbour and path queries."""
+        self.assertEqual(self.index.find_safest_neighbor("A3"), "A4")
+        self.assertEqual(self.index.find_next_hop("A1", "A4"), "A2")
+        self.assertEqual(self.index.find_nearest_safe_harbor("A1"), "A4")
+
+    def test_update_node_syncs_flags(self):
+        """Test that flag updates reach the columns."""
+        self.index.update_node("A2", discovered=True)
+        self.assertEqual(self.index.find_nearest("A1", discovered=True), "A2")
+
+    def test_generated_map(self):
+        """Test that generated maps index every node."""
+        star_map_data = generate_new_star_map()
+        index = StarMapIndex(StarMap.from_dict(star_map_data))
+        total_nodes = sum(len(r["nodes"]) for r in star_map_data["regions"].values())
+        self.assertEqual(len(index), total_nodes)
+
+
+class TestPodNavigation(unittest.TestCase):
+    """Test cases for steering an escape pod to the nearest safe harbor."""
+
+    def setUp(self):
+        """Destroy the ship of a session parked away from any repair station."""
+        random.seed(3)
+        self.processor = ActionProcessor()
+        self.session = GameSession("pod-navigation")
+        region = self.session.get_current_location()["region"]
+        self.session.current_node_id = next(
+            node.id for node in region.nodes if not node.has_repair)
+        self.session.player_stats["has_flight_pod"] = True
+        self.session.player_stats["ship_condition"] = 0
+
+    def activate_pod(self):
+        result = self.processor.process_action(self.session, "scan", autosave=False)
+        self.assertEqual(result["event_type"], "pod_activated")
+        self.assertEqual(self.session.available_choices[0],
+                         "Navigate to nearest planet/outpost")
+        _, hop = self.processor.find_safe_harbor_hop(self.session)
+        return hop
+
+    def test_choice_by_index(self):
+        """Test that the first pod choice, sent by position, flies towards a harbor."""
+        hop = self.activate_pod()
+        self.processor.process_action(self.session, "choice", {"choice": 1}, autosave=False)
+        self.assertEqual(self.session.current_node_id, hop)
+
+    def test_choice_by_text(self):
+        """Test that the pod choice sent as text flies towards a harbor."""
+        hop = self.activate_pod()
+        self.processor.process_action(self.session, "choice",
+                                      {"choice": "Navigate to nearest planet/outpost"},
+                                      autosave=False)
+        self.assertEqual(self.session.current_node_id, hop)
+
+    def test_distress_signal_rescue(self):
+        """Test that an answered distress signal tows the pod to the nearest harbor."""
+        self.activate_pod()
+        harbor_id, _ = self.processor.find_safe_harbor_hop(self.session)
+        with mock.patch("pod_system.PodManager.roll_distress_rescue", return_value=True):
+            result = self.processor.process_action(self.session, "choice", {"choice": 2},
+                                                   autosave=False)
+        self.assertEqual(result["event_type"], "success")
+        self.assertEqual(self.session.current_node_id, harbor_id)
+        self.assertTrue(self.session.at_repair_location)
+        self.assertEqual(self.session.turn_count, 1)
+
+    def test_distress_signal_unanswered(self):
+        """Test that an unanswered distress signal leaves the pod where it is."""
+        self.activate_pod()
+        node_id = self.session.current_node_id
+        with mock.patch("pod_system.PodManager.roll_distress_rescue", return_value=False):
+            result = self.processor.process_action(self.session, "choice",
+                                                   {"choice": "Try to send distress signal"},
+                                                   autosave=False)
+        self.assertEqual(result["event"], "Your distress signal goes unanswered.")
+        self.assertEqual(self.session.current_node_id, node_id)
+        self.assertEqual(self.session.available_choices, result["choices"])
+        self.assertIn("Try to send distress signal", result["choices"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Test cases for the typed star map model."""
+import json
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from regions import Node, Region, generate_new_star_map
+from star_map_model import StarMap
+
+
+class TestStarMapModel(unittest.TestCase):
+    """Test cases for conversion to and from the dict format."""
+
+    def setUp(self):
+        """Generate a map in the dict format and load it into the model."""
+        self.data = generate_new_star_map(seed=3)
+        self.star_map = StarMap.from_dict(self.data)
+
+    def test_round_trip_matches_dict_format(self):
+        """Test that to_dict reproduces the generated dict."""
+        self.assertEqual(
+            json.loads(json.dumps(self.star_map.to_dict())),
+            json.loads(json.dumps(self.data))
+        )
+
+    def test_round_trip_through_save_json(self):
+        """Test that a map loaded from save JSON serializes back unchanged."""
+        saved = json.loads(json.dumps(self.data))
+        self.assertEqual(json.loads(json.dumps(StarMap.from_dict(saved).to_dict())), saved)
+
+    def test_lookups_and_uids(self):
+        """Test id lookups and that uids are rows."""
+        for uid, node in enumerate(self.star_map.nodes):
+            self.assertEqual(node.uid, uid)
+            self.assertIs(self.star_map.get_node(node.id), node)
+            self.assertIs(node.region, self.star_map.get_region(node.region_id))
+        self.assertIsNone(self.star_map.get_node("NODE_MISSING"))
+
+    def test_connections_are_references(self):
+        """Test that connections point at model objects in both directions."""
+        for node in self.star_map.nodes:
+            for neighbor in node.connections:
+                self.assertIn(node, neighbor.connections)
+        for region in self.star_map.regions:
+            for other in region.connections:
+                self.assertIn(region, other.connections)
+
+    def test_configs_are_shared(self):
+        """Test that nodes and regions reference the shared config tables."""
+        saved = StarMap.from_dict(json.loads(json.dumps(self.data)))
+        node = saved.nodes[0]
+        self.assertIs(node.config, Node.NODE_CONFIGS[node.type])
+        self.assertIs(saved.regions[0].config, Region.REGION_CONFIGS[saved.regions[0].type])
+        self.assertFalse(hasattr(node, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Test cases for the state bundle endpoint."""
+import tempfile
+import unittest
+import sys
+import os
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from app import app, session_manager
+from config import config
+
+SEPARATE_ENDPOINTS = {
+    "nav": "navigation_options",
+    "inventory": "inventory",
+    "ship": "ship_info",
+    "mods": "available_mods"
+}
+
+
+class TestStateBundle(unittest.TestCase):
+    """Test cases for /api/game/bundle and navigation options in action responses."""
+
+    def setUp(self):
+        """Start a game to bundle, auto-saving to a scratch directory."""
+        self.save_dir = tempfile.TemporaryDirectory()
+        self.saved_dir_path = config.SAVE_DIR_PATH
+        config.SAVE_DIR_PATH = self.save_dir.name
+        self.client = app.test_client()
+        self.session_id = "state-bundle"
+        self.client.post('/api/game/new', json={"session_id": self.session_id, "force_new": True})
+        session_manager.get_session(self.session_id).player_stats["inventory"] = [
+            {"item_id": "rare_minerals", "quantity": 3}
+        ]
+
+    def tearDown(self):
+        session_manager.remove_session(self.session_id)
+        config.SAVE_DIR_PATH = self.saved_dir_path
+        self.save_dir.cleanup()
+
+    def get_json(self, url):
+        return self.client.get(url).get_json()
+
+    def test_parts_match_separate_endpoints(self):
+        """Test that each bundle part is what its own endpoint returns."""
+        bundle = self.get_json(f'/api/game/bundle/{self.session_id}')
+        self.assertEqual(set(bundle), {"state", "nav", "inventory", "ship", "mods"})
+        for part, endpoint in SEPARATE_ENDPOINTS.items():
+            self.assertEqual(bundle[part],
+                             self.get_json(f'/api/game/{endpoint}/{self.session_id}'))
+        state = self.get_json(f'/api/game/state/{self.session_id}')
+        self.assertEqual(bundle["state"]["player_stats"], state["player_stats"])
+
+    def test_include_selects_parts(self):
+        """Test that include limits the parts and rejects unknown ones."""
+        bundle = self.get_json(f'/api/game/bundle/{self.session_id}?include=ship,nav')
+        self.assertEqual(set(bundle), {"ship", "nav"})
+        response = self.client.get(f'/api/game/bundle/{self.session_id}?include=nav,radar')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/game/bundle/no-such-session')
+        self.assertEqual(response.status_code, 404)
+
+    def test_action_returns_navigation_options(self):
+        """Test that an action response carries the options for the next move."""
+        options = self.get_json(f'/api/game/navigation_options/{self.session_id}')["options"]
+        target = next(option for option in options if option["type"] == "node")
+        response = self.client.post(f'/api/game/action/{self.session_id}', json={
+            "action": "navigate", "target_node_id": target["id"]
+        }).get_json()
+        self.assertEqual(response["navigation_options"],
+                         self.get_json(f'/api/game/navigation_options/{self.session_id}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Test cases for request span tracing."""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from tracing import NULL_SPAN, SpanExporter, finish_trace, span, start_trace, traced
+
+
+@traced("double")
+def double(value):
+    return value * 2
+
+
+def get_spans(line):
+    """Get the spans of one exported trace line by name"""
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    return {entry["name"]: entry for entry in spans}
+
+
+class TestSpans(unittest.TestCase):
+    """Test cases for building span trees."""
+
+    def test_no_spans_outside_a_trace(self):
+        """Test that spans are no-ops when nothing is being traced."""
+        self.assertIs(span("idle"), NULL_SPAN)
+        self.assertEqual(double(2), 4)
+
+    def test_nested_spans(self):
+        """Test that spans nest under the span open when they start."""
+        root = start_trace("request")
+        with span("handler", action="scan"):
+            double(1)
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        trace = finish_trace(root)
+
+        spans = {entry.name: entry for entry in trace.spans}
+        self.assertIs(trace.spans[0], root)
+        self.assertEqual(spans["handler"].parent_id, root.span_id)
+        self.assertEqual(spans["double"].parent_id, spans["handler"].span_id)
+        self.assertEqual(spans["failing"].error, "ValueError: boom")
+        self.assertIs(span("after"), NULL_SPAN)
+
+        otlp = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        handler = next(entry for entry in otlp if entry["name"] == "handler")
+        self.assertEqual(handler["traceId"], trace.trace_id)
+        self.assertEqual(handler["attributes"],
+                         [{"key": "action", "value": {"stringValue": "scan"}}])
+
+
+class TestRequestTracing(unittest.TestCase):
+    """Test cases for traces of app requests."""
+
+    def setUp(self):
+        """Trace the app to a scratch file, with scratch saves."""
+        self.scratch = tempfile.TemporaryDirectory()
+        self.saved_dir_path = config.SAVE_DIR_PATH
+        config.SAVE_DIR_PATH = self.scratch.name
+        self.path = os.path.join(self.scratch.name, "spans.ndjson")
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        app_module.span_exporter.close()
+        app_module.span_exporter = None
+        app_module.session_manager.remove_session("tracing")
+        config.SAVE_DIR_PATH = self.saved_dir_path
+        self.scratch.cleanup()
+
+    def read_lines(self):
+        app_module.span_exporter.close()
+        with open(self.path) as f:
+            return f.readlines()
+
+    def test_action_request_trace(self):
+        """Test that an action request's trace covers the handler, auto-save and encoding."""
+        app_module.span_exporter = SpanExporter(self.path)
+        self.client.post('/api/game/new', json={"session_id": "tracing", "force_new": True})
+        self.client.post('/api/game/action/tracing', json={"action": "mine"})
+
+        lines = self.read_lines()
+        self.assertEqual(len(lines), 2)
+        spans = get_spans(lines[1])
+        root = spans["POST /api/game/action/<session_id>"]
+        self.assertEqual(root["parentSpanId"], "")
+        for name in ("handle_mine", "autosave", "GameSession.to_dict", "json.encode",
+                     "socketio.emit"):
+            self.assertEqual(spans[name]["parentSpanId"], root["spanId"], name)
+        self.assertEqual(spans["GameSession.to_save_dict"]["parentSpanId"],
+                         spans["autosave"]["spanId"])
+
+    def test_slow_mode_skips_fast_requests(self):
+        """Test that only requests over the slow threshold are written."""
+        app_module.span_exporter = SpanExporter(self.path, slow_ms=60000)
+        self.client.get('/api/game/state/missing')
+
+        self.assertEqual(self.read_lines(), [])
+        self.assertEqual(app_module.span_exporter.get_stats()["skipped"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
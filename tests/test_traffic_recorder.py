@@ -0,0 +1,83 @@
+"""Test cases for API traffic capture."""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent and api directories to path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import app as app_module
+from config import config
+from traffic_recorder import TrafficRecorder, read_trace
+
+
+class TestTrafficRecorder(unittest.TestCase):
+    """Test cases for writing and reading trace files."""
+
+    def setUp(self):
+        self.trace_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.trace_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that recorded requests read back in order, plain or compressed."""
+        for name in ("trace.ndjson", "trace.ndjson.gz"):
+            path = os.path.join(self.trace_dir.name, name)
+            recorder = TrafficRecorder(path)
+            recorder.record("s1", "perform_action", "POST", "/api/game/action/s1",
+                            b'{"action": "scan"}', 200, 0.002)
+            recorder.record(None, "list_saves", "GET", "/api/saves", None, 200, 0.001)
+            recorder.close()
+
+            records = read_trace(path)
+            self.assertEqual(recorder.get_stats()["recorded"], 2)
+            self.assertEqual([record["endpoint"] for record in records],
+                             ["perform_action", "list_saves"])
+            self.assertEqual(records[0]["body"], '{"action": "scan"}')
+            self.assertEqual(records[0]["ms"], 2.0)
+            self.assertIsNone(records[1]["body"])
+
+
+class TestAppRecording(unittest.TestCase):
+    """Test cases for the app's request hooks."""
+
+    def setUp(self):
+        """Record the app's traffic to a scratch trace, with scratch saves."""
+        self.scratch = tempfile.TemporaryDirectory()
+        self.saved_dir_path = config.SAVE_DIR_PATH
+        config.SAVE_DIR_PATH = self.scratch.name
+        self.path = os.path.join(self.scratch.name, "trace.ndjson")
+        app_module.traffic_recorder = TrafficRecorder(self.path)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        app_module.traffic_recorder.close()
+        app_module.traffic_recorder = None
+        app_module.session_manager.remove_session("traffic")
+        config.SAVE_DIR_PATH = self.saved_dir_path
+        self.scratch.cleanup()
+
+    def test_records_api_requests(self):
+        """Test that API requests are recorded with their session, body and status."""
+        self.client.post('/api/game/new', json={"session_id": "traffic"})
+        self.client.post('/api/game/action/traffic', json={"action": "scan"})
+        self.client.get('/api/game/state/missing')
+        self.client.get('/')
+        app_module.traffic_recorder.close()
+
+        records = read_trace(self.path)
+        self.assertEqual([(r["session"], r["endpoint"], r["status"]) for r in records], [
+            ("traffic", "new_game", 200),
+            ("traffic", "perform_action", 200),
+            ("missing", "get_game_state", 404)
+        ])
+        self.assertEqual(records[1]["path"], "/api/game/action/traffic")
+        self.assertIn('"scan"', records[1]["body"])
+
+
+if __name__ == '__main__':
+    unittest.main()
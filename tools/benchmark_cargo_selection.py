@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark cargo selection: knapsack versus the old greedy pick.
+
+The greedy pick is how escape pods used to choose preserved cargo: whole
+stacks, most valuable stack first, while they fit. Prints the value each
+keeps and the time each takes over random inventories.
+
+Usage:
+    python tools/benchmark_cargo_selection.py [runs] [seed]
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from cargo_planner import get_kept_quantities
+from inventory_system import ITEM_TYPES
+
+# (stacks, capacity) cases, from an escape pod to a hoarder's hold
+CASES = [(5, 10), (20, 10), (20, 300), (200, 1000), (2000, 5000), (20000, 20000)]
+
+
+def select_greedily(inventory, capacity):
+    """Get the value of whole stacks kept most valuable first while they fit"""
+    used_space = 0
+    kept_value = 0
+    for item in sorted(
+        inventory,
+        key=lambda x: ITEM_TYPES[x["item_id"]]["base_value"] * x["quantity"],
+        reverse=True
+    ):
+        item_info = ITEM_TYPES[item["item_id"]]
+        weight = item_info["weight"] * item["quantity"]
+        if used_space + weight <= capacity:
+            used_space += weight
+            kept_value += item_info["base_value"] * item["quantity"]
+    return kept_value
+
+
+def random_inventory(rng, stacks):
+    """Get an inventory of random stacks, repeating item ids when there are many"""
+    item_ids = [item_id for item_id, info in ITEM_TYPES.items() if info["category"] != "quest"]
+    return [
+        {"item_id": rng.choice(item_ids), "quantity": rng.randint(1, 30)}
+        for _ in range(stacks)
+    ]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+    rng = random.Random(seed)
+
+    print(f"Runs per case: {runs}")
+    print(f"{'Stacks':>8}{'Capacity':>10}{'Greedy value':>14}{'Knapsack value':>16}"
+          f"{'Greedy ms':>11}{'Knapsack ms':>13}")
+    for stacks, capacity in CASES:
+        greedy_value = knapsack_value = 0
+        greedy_time = knapsack_time = 0.0
+        for _ in range(runs):
+            inventory = random_inventory(rng, stacks)
+
+            start = time.perf_counter()
+            greedy_value += select_greedily(inventory, capacity)
+            greedy_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            knapsack_value += get_kept_quantities(inventory, capacity)[1]
+            knapsack_time += time.perf_counter() - start
+
+        print(f"{stacks:>8}{capacity:>10}{greedy_value / runs:>14,.0f}"
+              f"{knapsack_value / runs:>16,.0f}{greedy_time * 1000 / runs:>11.2f}"
+              f"{knapsack_time * 1000 / runs:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
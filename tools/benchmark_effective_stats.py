@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark effective stat calculation with and without the loadout memo.
+
+Builds sessions that share a pool of random loadouts, then times
+GameSession.get_effective_stats and ShipManager.calculate_effective_stats
+over them. The memo is disabled by shrinking it to zero entries.
+
+Usage:
+    python tools/benchmark_effective_stats.py [sessions] [loadouts] [seed]
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from catalog import CATALOG, SLOT_TYPES
+from loadout_memo import SHIP_STATS_MEMO, POD_EFFECTS_MEMO
+from pod_system import POD_AUGMENTATIONS
+from session_manager import GameSession
+from ship_system import SHIP_TYPES, ShipManager
+
+CALLS = 20000
+
+
+def random_loadout(rng):
+    """Get a random (ship type, mods, augmentations) that fits the ship's slots"""
+    ship_type = rng.choice(list(SHIP_TYPES))
+    mods = {}
+    for slot in SLOT_TYPES:
+        choices = list(CATALOG.mods_by_slot[slot])
+        count = rng.randint(0, SHIP_TYPES[ship_type]["slots"].get(slot, 0))
+        mods[slot] = rng.sample(choices, min(count, len(choices)))
+    augmentations = rng.sample(list(POD_AUGMENTATIONS), rng.randint(0, 2))
+    return ship_type, mods, augmentations
+
+
+def build_sessions(num_sessions, num_loadouts, seed):
+    """Create sessions that each use one of a shared pool of loadouts"""
+    rng = random.Random(seed)
+    loadouts = [random_loadout(rng) for _ in range(num_loadouts)]
+    sessions = []
+    for i in range(num_sessions):
+        ship_type, mods, augmentations = rng.choice(loadouts)
+        session = GameSession(f"bench-{i}")
+        session.player_stats["ship_type"] = ship_type
+        session.player_stats["ship_mods"] = {slot: list(ids) for slot, ids in mods.items()}
+        session.player_stats["has_flight_pod"] = True
+        session.player_stats["pod_augmentations"] = rng.sample(augmentations, len(augmentations))
+        sessions.append(session)
+    return sessions
+
+
+def calls_per_second(call, sessions):
+    """Call call(session) CALLS times, cycling through sessions"""
+    start = time.perf_counter()
+    for i in range(CALLS):
+        call(sessions[i % len(sessions)])
+    return CALLS / (time.perf_counter() - start)
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    num_loadouts = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    sessions = build_sessions(num_sessions, num_loadouts, seed)
+
+    benchmarks = [
+        ("get_effective_stats", lambda session: session.get_effective_stats()),
+        ("calculate_effective_stats", lambda session: ShipManager.calculate_effective_stats(
+            None, session.player_stats.ship_type, session.player_stats.ship_mods
+        ))
+    ]
+
+    print(f"Sessions: {num_sessions}, loadouts: {num_loadouts}, calls: {CALLS}")
+    print(f"{'Function':<28}{'No memo/s':>12}{'Memo/s':>12}{'Speedup':>10}")
+    for label, call in benchmarks:
+        sizes = SHIP_STATS_MEMO.max_entries, POD_EFFECTS_MEMO.max_entries
+        SHIP_STATS_MEMO.max_entries = POD_EFFECTS_MEMO.max_entries = 0
+        SHIP_STATS_MEMO.clear()
+        POD_EFFECTS_MEMO.clear()
+        uncached = calls_per_second(call, sessions)
+
+        SHIP_STATS_MEMO.max_entries, POD_EFFECTS_MEMO.max_entries = sizes
+        SHIP_STATS_MEMO.clear()
+        POD_EFFECTS_MEMO.clear()
+        cached = calls_per_second(call, sessions)
+        print(f"{label:<28}{uncached:>12,.0f}{cached:>12,.0f}{cached / uncached:>9.1f}x")
+
+    stats = SHIP_STATS_MEMO.get_stats()
+    print(f"Ship stats memo: {stats['entries']} entries, hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Load test a running server with many concurrent virtual players.
+
+Each player starts its own game, connects a Socket.IO client and joins
+its session's room, then loops game actions with random think time, like
+a browser would. For every action it measures the HTTP latency and the
+time until the matching `game_state` event arrives on the socket. An
+event is matched by the state's created_at and last_activity, which
+every action updates. Events that take more than --late seconds after
+the HTTP response are counted as late. Events that never arrive within
+--event-timeout are counted as dropped.
+
+Pass several player counts, e.g. --players 50,200,1000, to run one stage
+per count. The report shows where throughput stops growing with more
+players. Run the server with SAVE_DIR_PATH pointing at a scratch
+directory, since every action auto-saves. For thousands of players,
+raise the open file limit (each player holds two connections).
+
+Usage:
+    python tools/load_test.py [--url http://localhost:5000] [--players 10,100,1000]
+                              [--duration 30] [--ramp 10] [--think 1.0] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import aiohttp
+import numpy as np
+import socketio
+
+# Minimum throughput gain over the previous stage that counts as still scaling
+SATURATION_GAIN = 0.10
+
+# Weighted actions a player picks from outside combat
+EXPLORE_ACTIONS = [("navigate", 5), ("scan", 2), ("mine", 1), ("salvage", 1), ("event", 1)]
+
+
+def parse_players(text):
+    """Parse a comma-separated list of positive player counts"""
+    try:
+        counts = [int(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected counts like 10,100, got {text!r}")
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError("player counts must be positive")
+    return counts
+
+
+def get_state_key(game_state):
+    """Get what identifies a game state: its game, and the time of its last action"""
+    return game_state.get("created_at"), game_state.get("last_activity")
+
+
+def choose_action(game_state, navigation_options, rng):
+    """Pick the next action and its data from the last response, as a player would"""
+    if game_state["player_stats"].get("in_combat"):
+        if rng.random() < 0.8:
+            return "combat_action", {"combat_action": "attack"}
+        return "flee", {}
+
+    actions, weights = zip(*EXPLORE_ACTIONS)
+    action = rng.choices(actions, weights)[0]
+    if action == "navigate":
+        nodes = [option for option in navigation_options.get("options", [])
+                 if option["type"] == "node"]
+        if not nodes:
+            return "scan", {}
+        return "navigate", {"target_node_id": rng.choice(nodes)["id"]}
+    return action, {}
+
+
+class StageStats:
+    """Latencies and event counts of one stage, recorded from measure_from on"""
+
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.http_ms = {}
+        self.http_errors = {}
+        self.event_lag_ms = []
+        self.late_events = 0
+        self.dropped_events = 0
+        self.failed_players = 0
+
+    def is_measuring(self):
+        return time.perf_counter() >= self.measure_from
+
+    def record_http(self, endpoint, seconds, ok):
+        if not self.is_measuring():
+            return
+        self.http_ms.setdefault(endpoint, []).append(seconds * 1000)
+        if not ok:
+            self.http_errors[endpoint] = self.http_errors.get(endpoint, 0) + 1
+
+    def record_event(self, lag, late):
+        if not self.is_measuring():
+            return
+        self.event_lag_ms.append(lag * 1000)
+        self.late_events += late
+
+    def record_dropped_event(self):
+        if self.is_measuring():
+            self.dropped_events += 1
+
+
+class VirtualPlayer:
+    """One player: a game session, its socket and the action loop"""
+
+    def __init__(self, session_id, args, http, stats, rng):
+        self.session_id = session_id
+        self.args = args
+        self.http = http
+        self.stats = stats
+        self.rng = rng
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.arrivals = {}
+        self.waiters = {}
+        self.sio.on("game_state", self.on_game_state)
+
+    def on_game_state(self, game_state):
+        """Note when a state arrived, or hand it to the action waiting for it"""
+        key = get_state_key(game_state)
+        arrived = time.perf_counter()
+        waiter = self.waiters.pop(key, None)
+        if waiter and not waiter.done():
+            waiter.set_result(arrived)
+        else:
+            self.arrivals[key] = arrived
+
+    async def post(self, endpoint, path, body):
+        """POST JSON and get the response body, or None if the request failed"""
+        sent = time.perf_counter()
+        try:
+            async with self.http.post(self.args.url + path, json=body) as response:
+                data = await response.json()
+                ok = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            data, ok = None, False
+        self.stats.record_http(endpoint, time.perf_counter() - sent, ok)
+        return data if ok else None
+
+    async def new_game(self):
+        return await self.post("new_game", "/api/game/new",
+                               {"session_id": self.session_id, "force_new": True})
+
+    async def join(self):
+        """Connect the socket and wait until the server has put it in the session's room"""
+        joined = asyncio.get_running_loop().create_future()
+        self.sio.on("joined_session", lambda data: joined.done() or joined.set_result(True))
+        await self.sio.connect(self.args.url, transports=["websocket"])
+        await self.sio.emit("join_session", {"session_id": self.session_id})
+        await asyncio.wait_for(joined, self.args.event_timeout)
+
+    async def wait_for_state(self, key):
+        """Get when the game_state event for key arrived, or None if it never did"""
+        arrived = self.arrivals.pop(key, None)
+        if arrived is None:
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters[key] = waiter
+            try:
+                arrived = await asyncio.wait_for(waiter, self.args.event_timeout)
+            except asyncio.TimeoutError:
+                self.waiters.pop(key, None)
+        # Anything else that arrived meanwhile (e.g. a new game's state) matches nothing
+        self.arrivals.clear()
+        return arrived
+
+    async def run(self, stop_at):
+        try:
+            game = await self.new_game()
+            if game is None:
+                self.stats.failed_players += 1
+                return
+            await self.join()
+        except (socketio.exceptions.ConnectionError, asyncio.TimeoutError, OSError):
+            self.stats.failed_players += 1
+            return
+
+        try:
+            game_state, navigation_options = game["game_state"], {}
+            while time.perf_counter() < stop_at:
+                if game_state["game_over"]:
+                    game = await self.new_game()
+                    if game:
+                        game_state, navigation_options = game["game_state"], {}
+                else:
+                    action, data = choose_action(game_state, navigation_options, self.rng)
+                    sent = time.perf_counter()
+                    body = await self.post("action:" + action,
+                                           f"/api/game/action/{self.session_id}",
+                                           dict(data, action=action))
+                    if body is not None:
+                        responded = time.perf_counter()
+                        game_state = body["game_state"]
+                        navigation_options = body["navigation_options"]
+                        arrived = await self.wait_for_state(get_state_key(game_state))
+                        if arrived is None:
+                            self.stats.record_dropped_event()
+                        else:
+                            self.stats.record_event(arrived - sent,
+                                                    arrived - responded > self.args.late)
+                await asyncio.sleep(self.rng.expovariate(1 / self.args.think)
+                                    if self.args.think > 0 else 0)
+        finally:
+            await self.sio.disconnect()
+
+
+async def run_stage(players, args, run_id, seed):
+    """Run one stage with `players` players and get its stats and measured seconds"""
+    start = time.perf_counter()
+    stop_at = start + args.ramp + args.duration
+    stats = StageStats(measure_from=start + args.ramp)
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        async def start_player(index):
+            # Spread player arrivals over the ramp
+            await asyncio.sleep(args.ramp * index / players)
+            player = VirtualPlayer(f"load-{run_id}-{players}-{index}", args, http, stats,
+                                   random.Random(seed * 100003 + index))
+            await player.run(stop_at)
+
+        await asyncio.gather(*(start_player(index) for index in range(players)))
+    return stats, time.perf_counter() - stats.measure_from
+
+
+def get_percentiles(values_ms):
+    """Get p50, p95 and p99 of some millisecond timings"""
+    if not values_ms:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(values_ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2)}
+
+
+def summarize_stage(players, stats, elapsed):
+    """Get a stage's throughput, latency per endpoint and socket event delivery"""
+    actions = sum(len(values) for endpoint, values in stats.http_ms.items()
+                  if endpoint.startswith("action:"))
+    endpoints = {
+        endpoint: dict(requests=len(values), errors=stats.http_errors.get(endpoint, 0),
+                       **get_percentiles(values))
+        for endpoint, values in sorted(stats.http_ms.items())
+    }
+    all_ms = [ms for values in stats.http_ms.values() for ms in values]
+    return {
+        "players": players,
+        "failed_players": stats.failed_players,
+        "measured_seconds": round(elapsed, 2),
+        "actions": actions,
+        "actions_per_second": round(actions / elapsed, 1) if elapsed > 0 else None,
+        "http": dict(requests=len(all_ms), errors=sum(stats.http_errors.values()),
+                     **get_percentiles(all_ms)),
+        "events": dict(received=len(stats.event_lag_ms), late=stats.late_events,
+                       dropped=stats.dropped_events, **get_percentiles(stats.event_lag_ms)),
+        "endpoints": endpoints
+    }
+
+
+def find_saturation(stages):
+    """Get the stage after which more players stopped adding throughput, or None"""
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["actions_per_second"] < previous["actions_per_second"] * (1 + SATURATION_GAIN):
+            return previous
+    return None
+
+
+def print_report(report):
+    """Print the load test results as plain text"""
+    print(f"Target: {report['url']}  Think time: {report['think_seconds']}s  "
+          f"Ramp: {report['ramp_seconds']}s  Measured: {report['duration_seconds']}s per stage")
+    print(f"{'Players':>8}{'Failed':>8}{'Actions/s':>11}{'HTTP p50':>10}{'p95':>9}{'p99':>9}"
+          f"{'Errors':>8}{'Event p50':>11}{'p95':>9}{'p99':>9}{'Late':>7}{'Dropped':>9}")
+    for stage in report["stages"]:
+        http, events = stage["http"], stage["events"]
+        print(f"{stage['players']:>8}{stage['failed_players']:>8}"
+              f"{stage['actions_per_second']:>11}{http['p50_ms']!s:>10}{http['p95_ms']!s:>9}"
+              f"{http['p99_ms']!s:>9}{http['errors']:>8}{events['p50_ms']!s:>11}"
+              f"{events['p95_ms']!s:>9}{events['p99_ms']!s:>9}{events['late']:>7}"
+              f"{events['dropped']:>9}")
+
+    saturation = report["saturation"]
+    if saturation:
+        print(f"\nThroughput stopped scaling at {saturation['players']} players "
+              f"(~{saturation['actions_per_second']} actions/s)")
+    elif len(report["stages"]) > 1:
+        print("\nThroughput was still growing at the largest stage")
+
+    last = report["stages"][-1]
+    print(f"\nEndpoints at {last['players']} players (ms):")
+    print(f"{'Endpoint':<28}{'Reqs':>8}{'Errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for endpoint, row in last["endpoints"].items():
+        print(f"{endpoint:<28}{row['requests']:>8}{row['errors']:>8}{row['p50_ms']!s:>9}"
+              f"{row['p95_ms']!s:>9}{row['p99_ms']!s:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running server with virtual players")
+    parser.add_argument("--url", default="http://localhost:5000", help="server to load")
+    parser.add_argument("--players", type=parse_players, default=[10],
+                        help="comma-separated player counts, one stage each (default: 10)")
+    parser.add_argument("--duration", type=float, default=30,
+                        help="seconds measured per stage, after the ramp (default: 30)")
+    parser.add_argument("--ramp", type=float, default=10,
+                        help="seconds over which players join, not measured (default: 10)")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="mean think time between a player's actions (default: 1.0)")
+    parser.add_argument("--late", type=float, default=0.5,
+                        help="seconds after the HTTP response an event counts as late")
+    parser.add_argument("--event-timeout", type=float, default=5.0,
+                        help="seconds to wait for an event before counting it as dropped")
+    parser.add_argument("--request-timeout", type=float, default=30.0,
+                        help="seconds before an HTTP request counts as failed")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the players' choices")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    args.url = args.url.rstrip("/")
+
+    run_id = uuid.uuid4().hex[:8]
+    stages = []
+    for players in args.players:
+        stats, elapsed = asyncio.run(run_stage(players, args, run_id, args.seed))
+        stages.append(summarize_stage(players, stats, elapsed))
+
+    report = {
+        "url": args.url,
+        "think_seconds": args.think,
+        "ramp_seconds": args.ramp,
+        "duration_seconds": args.duration,
+        "stages": stages,
+        "saturation": find_saturation(stages)
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure the memory used per star map node with tracemalloc.
+
+Compares the nested dict format (as generated, and as loaded back from a
+save file) with the typed StarMap model held by game sessions.
+
+Usage:
+    python tools/measure_star_map_memory.py [num_regions] [seed]
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from regions import StarMapGenerator
+from star_map_model import StarMap
+
+
+def measure(build):
+    """Return (result, bytes still allocated after build() returns)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def main():
+    num_regions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+
+    generated, generated_size = measure(
+        lambda: StarMapGenerator(seed).generate_star_map(num_regions)
+    )
+    node_count = sum(len(region["nodes"]) for region in generated["regions"].values())
+    save_text = json.dumps(generated)
+
+    _, loaded_size = measure(lambda: json.loads(save_text))
+    _, model_size = measure(lambda: StarMap.from_dict(json.loads(save_text)))
+
+    print(f"Regions: {num_regions}, nodes: {node_count}")
+    print(f"{'Representation':<28}{'Total bytes':>14}{'Bytes/node':>12}")
+    for label, size in [
+        ("dict (generated)", generated_size),
+        ("dict (loaded from save)", loaded_size),
+        ("StarMap model", model_size)
+    ]:
+        print(f"{label:<28}{size:>14,}{size / node_count:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
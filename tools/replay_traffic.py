@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded traffic trace and report latency and error changes.
+
+Record a trace by starting the server with TRAFFIC_TRACE_PATH set, then
+replay it against a running server (--url) or, by default, the Flask app
+in this process with saves going to a scratch directory. Requests keep
+their recorded spacing divided by --speed; use --speed max to send them
+back to back. Requests for one session always run in recorded order, on
+one of --concurrency worker threads.
+
+Replayed latency is measured at the client, so it includes the HTTP (or
+test client) round trip; recorded latency is the server's own time
+between receiving the request and returning the response.
+
+Game outcomes are random, so a replayed request can fail where the
+recorded one succeeded (e.g. a move to a node the new map doesn't have);
+the report counts these status changes per endpoint.
+
+Usage:
+    python tools/replay_traffic.py TRACE [--url URL] [--speed 1|10|max]
+                                   [--concurrency N] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from traffic_recorder import read_trace
+
+
+def parse_speed(text):
+    """Parse a replay speed: a positive factor, or "max" for no pacing"""
+    if text == "max":
+        return None
+    try:
+        speed = float(text.rstrip("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'max', got {text!r}")
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+def make_http_sender(base_url):
+    """Get a send(method, path, body) -> status function for a running server"""
+    base_url = base_url.rstrip("/")
+
+    def send(method, path, body):
+        request = urllib.request.Request(
+            base_url + path,
+            data=body.encode("utf-8") if body is not None else None,
+            method=method,
+            headers={"Content-Type": "application/json"} if body is not None else {}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    return send
+
+
+def make_app_sender():
+    """Get a send(method, path, body) -> status function for the app in this process"""
+    from app import app
+    local = threading.local()
+
+    def send(method, path, body):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        response = local.client.open(path, method=method, data=body,
+                                     content_type="application/json")
+        return response.status_code
+
+    return send
+
+
+def replay(records, send, speed, concurrency):
+    """Send every record, paced by speed, and get (record, status, seconds) for each"""
+    lanes = [[] for _ in range(concurrency)]
+    for record in records:
+        key = (record["session"] or record["path"]).encode("utf-8")
+        lanes[zlib.crc32(key) % concurrency].append(record)
+
+    first_ts = records[0]["ts"]
+    results = []
+    results_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def run_lane(lane):
+        lane_results = []
+        for record in lane:
+            if speed is not None:
+                delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            sent = time.perf_counter()
+            try:
+                status = send(record["method"], record["path"], record["body"])
+            except OSError:
+                status = None
+            lane_results.append((record, status, time.perf_counter() - sent))
+        with results_lock:
+            results.extend(lane_results)
+
+    threads = [threading.Thread(target=run_lane, args=(lane,)) for lane in lanes if lane]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def get_percentiles(values_ms):
+    """Get p50 and p99 of some millisecond timings"""
+    if not values_ms:
+        return None, None
+    return (round(float(np.percentile(values_ms, 50)), 3),
+            round(float(np.percentile(values_ms, 99)), 3))
+
+
+def summarize(results, elapsed, speed, concurrency):
+    """Get throughput, replayed and recorded latency, and status changes per endpoint"""
+    by_endpoint = {}
+    for record, status, seconds in results:
+        by_endpoint.setdefault(record["endpoint"] or "unknown", []).append(
+            (record, status, seconds)
+        )
+
+    endpoints = {}
+    for endpoint, rows in sorted(by_endpoint.items()):
+        p50, p99 = get_percentiles([seconds * 1000 for _, _, seconds in rows])
+        recorded_p50, recorded_p99 = get_percentiles([record["ms"] for record, _, _ in rows])
+        endpoints[endpoint] = {
+            "requests": len(rows),
+            "p50_ms": p50,
+            "p99_ms": p99,
+            "recorded_p50_ms": recorded_p50,
+            "recorded_p99_ms": recorded_p99,
+            "recorded_errors": sum(1 for record, _, _ in rows if record["status"] >= 400),
+            "errors": sum(1 for _, status, _ in rows if status is None or status >= 400),
+            "status_changes": sum(1 for record, status, _ in rows if status != record["status"])
+        }
+
+    p50, p99 = get_percentiles([seconds * 1000 for _, _, seconds in results])
+    recorded_p50, recorded_p99 = get_percentiles([record["ms"] for record, _, _ in results])
+    return {
+        "requests": len(results),
+        "speed": "max" if speed is None else speed,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": p50,
+        "p99_ms": p99,
+        "recorded_p50_ms": recorded_p50,
+        "recorded_p99_ms": recorded_p99,
+        "recorded_errors": sum(row["recorded_errors"] for row in endpoints.values()),
+        "errors": sum(row["errors"] for row in endpoints.values()),
+        "status_changes": sum(row["status_changes"] for row in endpoints.values()),
+        "endpoints": endpoints
+    }
+
+
+def print_report(report):
+    """Print a replay summary as plain text"""
+    print(f"Replayed {report['requests']} requests at speed {report['speed']} "
+          f"with {report['concurrency']} worker(s) in {report['elapsed_seconds']:.2f}s "
+          f"({report['requests_per_second']:,.1f} req/s)")
+    print(f"Latency ms: p50 {report['p50_ms']} p99 {report['p99_ms']} (recorded server time "
+          f"p50 {report['recorded_p50_ms']} p99 {report['recorded_p99_ms']})")
+    print(f"Errors: {report['errors']} (recorded {report['recorded_errors']}), "
+          f"status changes: {report['status_changes']}")
+    print(f"{'Endpoint':<32}{'Reqs':>7}{'p50':>9}{'p99':>9}{'Rec p50':>9}{'Rec p99':>9}"
+          f"{'Errors':>8}{'Rec err':>8}{'Changed':>8}")
+    for endpoint, row in report["endpoints"].items():
+        print(f"{endpoint:<32}{row['requests']:>7}{row['p50_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+              f"{row['recorded_p50_ms']:>9.2f}{row['recorded_p99_ms']:>9.2f}"
+              f"{row['errors']:>8}{row['recorded_errors']:>8}{row['status_changes']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded traffic trace")
+    parser.add_argument("trace", help="trace file written with TRAFFIC_TRACE_PATH")
+    parser.add_argument("--url", help="server to replay against, e.g. http://localhost:5000 "
+                                      "(default: the app in this process)")
+    parser.add_argument("--speed", type=parse_speed, default=1.0,
+                        help="pace multiplier such as 1 or 10, or 'max' (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="worker threads; each session stays on one worker")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    records = read_trace(args.trace)
+    if not records:
+        parser.error(f"no requests in {args.trace}")
+    if args.concurrency < 1:
+        parser.error("concurrency must be positive")
+
+    if args.url:
+        send = make_http_sender(args.url)
+        results, elapsed = replay(records, send, args.speed, args.concurrency)
+    else:
+        # Keep the replay's auto-saves out of the real save directory, and don't record
+        # or trace the replayed requests (which would append them to the trace being read)
+        with tempfile.TemporaryDirectory() as save_dir:
+            from config import config
+            config.SAVE_DIR_PATH = save_dir
+            config.TRAFFIC_TRACE_PATH = ''
+            config.TRACE_SPANS_PATH = ''
+            send = make_app_sender()
+            results, elapsed = replay(records, send, args.speed, args.concurrency)
+
+    report = summarize(results, elapsed, args.speed, args.concurrency)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
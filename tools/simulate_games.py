@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Play thousands of games headlessly with a bot policy.
+
+Drives GameSession and ActionProcessor directly, without Flask or a
+browser, and fans the games out over a multiprocessing pool. Prints
+actions per second, the spread of game lengths, the victory rate, how
+games ended and how long each action's handler took. Use --set to try
+other balance settings, e.g. --set VICTORY_WEALTH_THRESHOLD=1500.
+
+Usage:
+    python tools/simulate_games.py [--games N] [--policy trader|random] [--workers N]
+                                   [--seed N] [--set NAME=VALUE ...] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+from game_simulator import MAX_GAME_ACTIONS, POLICIES, simulate
+
+
+def parse_setting(text):
+    """Parse a NAME=VALUE config override"""
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name, value
+
+
+def print_report(report):
+    """Print a simulation summary as plain text"""
+    length = report["game_length"]
+    print(f"Policy: {report['policy']}  Games: {report['games']}  Workers: {report['workers']}")
+    print("Settings: " + ", ".join(f"{name}={value}"
+                                   for name, value in report["settings"].items()))
+    print(f"Actions: {report['actions']:,} in {report['elapsed_seconds']:.2f}s "
+          f"({report['actions_per_second']:,.0f} actions/s)")
+    print(f"Victory rate: {report['victory_rate']:.1%}")
+    print("Endings: " + ", ".join(f"{reason} {count}"
+                                  for reason, count in report["end_reasons"].items()))
+    print(f"Game length (turns): mean {length['mean']:.1f}, p10 {length['p10']:.0f}, "
+          f"p50 {length['p50']:.0f}, p90 {length['p90']:.0f}, max {length['max']}")
+    for bucket, count in length["histogram"].items():
+        print(f"  {bucket:>9} {'#' * max(1, round(60 * count / report['games']))} {count}")
+
+    print(f"{'Action':<16}{'Count':>9}{'Mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    for action, timing in report["handlers"].items():
+        print(f"{action:<16}{timing['count']:>9}{timing['mean_us']:>10.1f}"
+              f"{timing['p50_us']:>10.1f}{timing['p99_us']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play games headlessly with a bot policy")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="trader")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-actions", type=int, default=MAX_GAME_ACTIONS,
+                        help="stop a game after this many actions")
+    parser.add_argument("--set", type=parse_setting, action="append", default=[],
+                        metavar="NAME=VALUE", help="override a config setting")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = simulate(args.games, args.policy, args.workers, args.seed,
+                          dict(args.set), args.max_actions)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()